@@ -14,6 +14,7 @@ with open('data/my_roster_full.json', 'r', encoding='utf-8') as f:
     roster_data = json.load(f)
 
 players = roster_data['players']
+players_by_name = {p['name']: p for p in players}
 
 print("📊 位置分布分析（考慮多位置）")
 print("-" * 80)
@@ -46,7 +47,7 @@ for pos in ['PG', 'SG', 'SF', 'PF', 'C']:
     print(f"  {pos} 位置可用球員:")
     for player_name in position_coverage[pos]:
         # 找到該球員的所有位置
-        player_info = next(p for p in players if p['name'] == player_name)
+        player_info = players_by_name[player_name]
         all_pos = ','.join(player_info['positions'])
         status = f" ({player_info['status']})" if player_info['status'] else ""
         print(f"    • {player_name} [{all_pos}]{status}")
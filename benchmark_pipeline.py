@@ -0,0 +1,153 @@
+"""
+離線端到端效能測試
+
+用錄製的 Yahoo 回應（data/fixtures/yahoo）重播完整抓取流程，
+再跑聯盟洞察與交易價值分析器，不需要網路或 Yahoo 額度。
+
+先錄製一次：
+    YAHOO_CLIENT_MODE=record python3 get_full_league_data.py
+
+再執行：
+    python3 benchmark_pipeline.py --iterations 3 --latency 0.05 --min-throughput 15
+
+低於 --min-throughput（每秒請求數）時以非零狀態結束，可在 CI 中偵測效能退化。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.api import YahooFantasyClient
+from src.api.replay import FixtureStore
+from src.automation.league_ingester import LeagueIngester
+
+PROJECT_ROOT = Path(__file__).parent
+
+# 讀取 data/full_league_data.json 的分析器
+ANALYZERS = [
+    'generate_league_insights.py',
+    'generate_advanced_trade_value.py',
+]
+
+
+def run_ingest(args) -> dict:
+    """重播一次完整抓取流程"""
+    client = YahooFantasyClient(
+        mode='replay',
+        fixture_dir=args.fixtures,
+        replay_options={
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'error_rate': args.error_rate,
+            'seed': args.seed
+        }
+    )
+    season = client.credentials.get('league', {}).get('season') or '2025'
+
+    start = time.perf_counter()
+    league_data = LeagueIngester(client, season=season, verbose=False).run()
+    elapsed = time.perf_counter() - start
+
+    stats = client.transport.stats()
+    return {
+        'seconds': elapsed,
+        'requests': stats['requests'],
+        'injected_errors': stats['injected_errors'],
+        'bytes': stats['bytes_served'],
+        'league_data': league_data
+    }
+
+
+def run_analyzers(league_data: dict) -> dict:
+    """在暫存目錄中執行分析器，回傳各分析器耗時"""
+    timings = {}
+    workdir = Path(tempfile.mkdtemp(prefix='fantasy_bench_'))
+    cwd = os.getcwd()
+    try:
+        (workdir / 'data').mkdir()
+        with open(workdir / 'data' / 'full_league_data.json', 'w', encoding='utf-8') as f:
+            json.dump(league_data, f, ensure_ascii=False)
+
+        os.chdir(workdir)
+        for script in ANALYZERS:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                runpy.run_path(str(PROJECT_ROOT / script), run_name='__main__')
+            timings[script] = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='離線端到端效能測試')
+    parser.add_argument('--fixtures', default=str(PROJECT_ROOT / 'data' / 'fixtures' / 'yahoo'),
+                        help='錄製檔目錄')
+    parser.add_argument('--iterations', type=int, default=3, help='重複次數')
+    parser.add_argument('--latency', type=float, default=0.0, help='每次請求的模擬延遲（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='額外隨機延遲上限（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='注入錯誤的機率 (0-1)')
+    parser.add_argument('--seed', type=int, default=42, help='隨機種子')
+    parser.add_argument('--skip-analyzers', action='store_true', help='只測抓取流程')
+    parser.add_argument('--min-throughput', type=float, default=None,
+                        help='最低每秒請求數，低於此值時回傳非零狀態')
+    args = parser.parse_args()
+
+    if len(FixtureStore(args.fixtures)) == 0:
+        print(f"❌ 找不到錄製檔: {args.fixtures}")
+        print("請先執行: YAHOO_CLIENT_MODE=record python3 get_full_league_data.py")
+        return 1
+
+    print("=" * 80)
+    print(" 離線端到端效能測試")
+    print("=" * 80)
+    print(f"錄製檔: {args.fixtures}")
+    print(f"延遲: {args.latency}s (+{args.jitter}s)  錯誤率: {args.error_rate:.0%}")
+    print()
+
+    results = []
+    for i in range(1, args.iterations + 1):
+        ingest = run_ingest(args)
+        throughput = ingest['requests'] / ingest['seconds'] if ingest['seconds'] > 0 else float('inf')
+
+        line = (
+            f"第 {i} 次: 抓取 {ingest['seconds']:.3f}s, {ingest['requests']} 次請求 "
+            f"({throughput:.1f} req/s, {ingest['bytes'] / 1024:.0f} KB), "
+            f"注入錯誤 {ingest['injected_errors']}"
+        )
+
+        analyzer_seconds = 0.0
+        if not args.skip_analyzers:
+            timings = run_analyzers(ingest['league_data'])
+            analyzer_seconds = sum(timings.values())
+            line += ", 分析 " + ", ".join(f"{Path(k).stem} {v:.3f}s" for k, v in timings.items())
+
+        print(line)
+        results.append({'throughput': throughput, 'total': ingest['seconds'] + analyzer_seconds})
+
+    best = max(r['throughput'] for r in results)
+    median_total = sorted(r['total'] for r in results)[len(results) // 2]
+    print()
+    print(f"最佳吞吐量: {best:.1f} req/s")
+    print(f"端到端中位數: {median_total:.3f}s")
+
+    if args.min_throughput is not None and best < args.min_throughput:
+        print(f"❌ 吞吐量低於門檻 {args.min_throughput:.1f} req/s")
+        return 1
+
+    print("✅ 完成")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+Google Sheets 同步效能測試
+
+以行程內的 Sheets API 替身（src/integrations/fake_sheets.py）執行每個同步腳本的工作表群組，
+不需要 Google 帳號或網路：
+1. 冷同步：空白 Spreadsheet，建立所有工作表並寫入
+2. 在備註等成員編輯欄位填入測試內容（直接改替身，模擬成員在表上編輯）
+3. 熱同步：數據不變再同步一次，應該只剩讀取中繼資料與讀回成員欄位
+4. 刪除影子副本再同步（清除後完整重寫），比對替身中的儲存格與渲染結果一致、備註仍在
+5. 檢查每個腳本的請求數與耗時門檻（BUDGETS），超過時以非零狀態結束
+
+門檻同時由 tests/test_sheets_sync_budgets.py 以相同的輔助函式檢查。
+
+執行：
+    python3 benchmark_sheets_sync.py
+    python3 benchmark_sheets_sync.py --latency 0.2 --error-rate 0.1 --no-budgets
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.integrations.fake_sheets import FakeSheetsService
+from src.integrations.google_sheets_sync import GSPREAD_AVAILABLE, GoogleSheetsSync, a1_to_grid_range
+from src.integrations.sheets_engine import SheetsEngine
+from src.integrations.sheets_quota import QuotaGovernor
+from src.integrations.sheets_views import VIEW_GROUPS, ViewContext, ViewDataError
+
+# 同步腳本 → 工作表群組（None = 全部）
+SCENARIOS = {
+    'sync_league_shared.py': ['league_shared'],
+    'sync_league_insights.py': ['league_insights'],
+    'sync_advanced_trade_value.py': ['advanced_trade_value'],
+    'sync_my_team.py': ['my_team'],
+    'sync_to_sheets.py': ['roster_summary'],
+    'sync_league_to_sheets.py': ['league_overview'],
+    'sync_sheets.py': None,
+}
+
+# 每個腳本的上限：冷同步請求數、熱同步請求數、冷同步秒數
+# 冷同步 = open_by_key + 讀中繼資料 + batchUpdate + values.batchUpdate；
+# 熱同步只有 open_by_key + 讀中繼資料（每個 Spreadsheet 兩次），
+# 有成員編輯欄位的 Spreadsheet 再加一次 values.batchGet
+BUDGETS = {
+    'sync_league_shared.py': {'cold_requests': 4, 'warm_requests': 3, 'seconds': 5.0},
+    'sync_league_insights.py': {'cold_requests': 4, 'warm_requests': 2, 'seconds': 5.0},
+    'sync_advanced_trade_value.py': {'cold_requests': 4, 'warm_requests': 2, 'seconds': 5.0},
+    'sync_my_team.py': {'cold_requests': 4, 'warm_requests': 3, 'seconds': 5.0},
+    'sync_to_sheets.py': {'cold_requests': 4, 'warm_requests': 2, 'seconds': 5.0},
+    'sync_league_to_sheets.py': {'cold_requests': 4, 'warm_requests': 2, 'seconds': 5.0},
+    'sync_sheets.py': {'cold_requests': 12, 'warm_requests': 8, 'seconds': 10.0},
+}
+
+# 固定的更新時間，讓熱同步的內容與冷同步完全相同
+BENCH_TIME = datetime(2025, 1, 1, 12, 0)
+
+TEST_NOTE = '成員備註'
+
+DEFAULT_CONFIG = 'config/sheets_engine.json'
+
+
+def _normalize(rows: List[List[Any]]) -> List[List[str]]:
+    """去掉尾端空白並統一成字串，方便比對渲染結果與替身中的數值"""
+    result = []
+    for row in rows:
+        line = ['' if value is None else str(value) for value in row]
+        while line and line[-1] == '':
+            line.pop()
+        result.append(line)
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+def _successful(stats: Dict) -> int:
+    """成功的請求數（不含注入錯誤與 429，這些由額度控管重試）"""
+    return sum(stats['endpoints'].values())
+
+
+def render_views(engine: SheetsEngine, groups: Optional[List[str]]) -> List[Tuple]:
+    """重新渲染要同步的工作表 [(Spreadsheet, 工作表定義, 渲染結果)]"""
+    views = []
+    ctx = ViewContext(now=BENCH_TIME)
+    try:
+        for target in engine.targets:
+            for group in target.groups:
+                if groups is not None and group not in groups:
+                    continue
+                try:
+                    views.extend((target, view, view.render(ctx)) for view in VIEW_GROUPS[group](target.config))
+                except ViewDataError:
+                    continue
+    finally:
+        ctx.close()
+    return views
+
+
+def leave_notes(engine: SheetsEngine, service: FakeSheetsService, groups: Optional[List[str]]) -> Dict:
+    """
+    在每張工作表的成員編輯欄位第一個有 ID 的列填入備註（直接改替身，不計入請求）
+
+    Returns:
+        {(spreadsheet_id, 工作表, 列, 欄): 備註}
+    """
+    notes = {}
+    for target, view, content in render_views(engine, groups):
+        row = next((i for i, key in enumerate(content.row_keys) if key is not None), None)
+        if row is None:
+            continue
+        sheet = service.worksheet(target.spreadsheet_id, view.title)
+        for letter in view.user_columns:
+            col = a1_to_grid_range(f'{letter}1', 0)['startColumnIndex']
+            sheet.cells.setdefault((row, col), {})['userEnteredValue'] = {'stringValue': TEST_NOTE}
+            notes[(target.spreadsheet_id, view.title, row, col)] = TEST_NOTE
+    return notes
+
+
+def verify(engine: SheetsEngine, service: FakeSheetsService, groups: Optional[List[str]],
+           notes: Dict) -> List[str]:
+    """比對替身中的工作表與重新渲染的結果（加上成員備註），回傳不一致的工作表"""
+    mismatches = []
+    for target, view, content in render_views(engine, groups):
+        expected = [list(row) for row in content.rows]
+        for (spreadsheet_id, title, row, col), note in notes.items():
+            if spreadsheet_id == target.spreadsheet_id and title == view.title:
+                expected[row].extend([''] * (col + 1 - len(expected[row])))
+                expected[row][col] = note
+        live = service.values(target.spreadsheet_id, view.title)
+        if _normalize(live) != _normalize(expected):
+            mismatches.append(f"{target.name}/{view.title}")
+    return mismatches
+
+
+def measure_sync(engine: SheetsEngine, service: FakeSheetsService, groups: Optional[List[str]]) -> Dict:
+    """同步一次並收集替身的統計"""
+    service.reset_stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = engine.run(groups, now=BENCH_TIME)
+    elapsed = time.perf_counter() - start
+    stats = service.stats_dict()
+    return {
+        'seconds': elapsed,
+        'requests': _successful(stats),
+        'attempts': stats['requests'],
+        'bytes_sent': stats['bytes_sent'],
+        'bytes_received': stats['bytes_received'],
+        'cells': sum(result.cells_written for result in results),
+        'retried': stats['injected_errors'] + stats['rate_limited'],
+        'errors': [f"{result.name}: {result.error}" for result in results if result.error],
+        'skipped': [f"{result.name}/{group}" for result in results for group in result.skipped],
+    }
+
+
+def build_engine(
+    service: FakeSheetsService,
+    workdir: Path,
+    config: str = DEFAULT_CONFIG,
+    reads_per_minute: int = QuotaGovernor.DEFAULT_READS_PER_MINUTE,
+    writes_per_minute: int = QuotaGovernor.DEFAULT_WRITES_PER_MINUTE
+) -> SheetsEngine:
+    """
+    建立連到替身的引擎，影子副本與成員欄位快取都放在 workdir 之下
+
+    Args:
+        service: Sheets API 替身，每個 Spreadsheet 會在其中建立空白副本
+        workdir: 暫存目錄（shadow/、user_columns/）
+        config: 引擎設定檔
+        reads_per_minute: 額度控管的每分鐘讀取上限
+        writes_per_minute: 額度控管的每分鐘寫入上限
+    """
+    engine = SheetsEngine(config, shadow_dir=str(workdir / 'shadow'),
+                          user_columns_dir=str(workdir / 'user_columns'))
+    engine.client = service.connect()
+    engine.governor = QuotaGovernor(reads_per_minute=reads_per_minute, writes_per_minute=writes_per_minute)
+    for target in engine.targets:
+        target.spreadsheet_id = f'bench-{target.name}'
+        service.create_spreadsheet(target.name, spreadsheet_id=target.spreadsheet_id)
+    return engine
+
+
+def run_scenario(engine: SheetsEngine, service: FakeSheetsService, groups: Optional[List[str]],
+                 workdir: Path) -> Dict:
+    """執行冷同步、熱同步與刪除影子副本後的重建同步（engine 由 build_engine(service, workdir) 建立）"""
+    runs = {'cold': measure_sync(engine, service, groups)}
+    notes = leave_notes(engine, service, groups)
+    runs['warm'] = measure_sync(engine, service, groups)
+
+    # 沒有影子副本時會清除整張工作表再寫入，備註要靠讀回快取保留
+    shutil.rmtree(workdir / 'shadow', ignore_errors=True)
+    runs['rebuild'] = measure_sync(engine, service, groups)
+
+    runs['notes'] = len(notes)
+    runs['mismatches'] = verify(engine, service, groups, notes)
+    return runs
+
+
+def check_runs(script: str, runs: Dict, budgets: bool = True, check_seconds: bool = True) -> List[str]:
+    """
+    檢查 run_scenario 的結果
+
+    Args:
+        script: 同步腳本名稱（BUDGETS 的鍵）
+        runs: run_scenario 的回傳值
+        budgets: 是否檢查請求數與耗時門檻
+        check_seconds: 是否檢查耗時（注入延遲或錯誤時耗時沒有參考價值）
+
+    Returns:
+        未通過的項目
+    """
+    cold, warm = runs['cold'], runs['warm']
+    problems = []
+    for phase in (cold, warm, runs['rebuild']):
+        problems += [f"錯誤 {error}" for error in phase['errors']]
+    if runs['mismatches']:
+        problems.append(f"內容不一致: {', '.join(runs['mismatches'])}")
+    if warm['cells']:
+        problems.append(f"熱同步仍寫入 {warm['cells']} 格")
+
+    budget = BUDGETS.get(script)
+    if budget and budgets:
+        if cold['requests'] > budget['cold_requests']:
+            problems.append(f"冷同步 {cold['requests']} 次請求，超過門檻 {budget['cold_requests']}")
+        if warm['requests'] > budget['warm_requests']:
+            problems.append(f"熱同步 {warm['requests']} 次請求，超過門檻 {budget['warm_requests']}")
+        if check_seconds and cold['seconds'] > budget['seconds']:
+            problems.append(f"冷同步 {cold['seconds']:.2f}s，超過門檻 {budget['seconds']:.1f}s")
+    return problems
+
+
+def run_legacy(args) -> Dict:
+    """GoogleSheetsSync（Roster / Matchup / Analysis 儀表板）的請求數，需要 gspread"""
+    service = FakeSheetsService(latency=args.latency, seed=args.seed)
+    service.create_spreadsheet('dashboard', spreadsheet_id='bench-dashboard')
+    shadow_dir = tempfile.mkdtemp(prefix='fantasy_sheets_shadow_')
+    try:
+        sync = GoogleSheetsSync(spreadsheet_id='bench-dashboard')
+        sync.client = service.connect()
+        sync.governor = QuotaGovernor()
+        sync.shadow_dir = shadow_dir
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync.connect_spreadsheet()
+            sync.create_dashboard()
+        elapsed = time.perf_counter() - start
+        stats = service.stats_dict()
+        return {'seconds': elapsed, 'requests': _successful(stats), 'bytes_sent': stats['bytes_sent']}
+    finally:
+        shutil.rmtree(shadow_dir, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Google Sheets 同步效能測試')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, help='引擎設定檔')
+    parser.add_argument('--only', nargs='+', choices=list(SCENARIOS), help='只測這些腳本')
+    parser.add_argument('--latency', type=float, default=0.0, help='每次請求的模擬延遲（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='額外隨機延遲上限（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='注入 503 錯誤的機率 (0-1)')
+    parser.add_argument('--reads-per-minute', type=int, default=QuotaGovernor.DEFAULT_READS_PER_MINUTE,
+                        help='替身與額度控管的每分鐘讀取上限')
+    parser.add_argument('--writes-per-minute', type=int, default=QuotaGovernor.DEFAULT_WRITES_PER_MINUTE,
+                        help='替身與額度控管的每分鐘寫入上限')
+    parser.add_argument('--seed', type=int, default=42, help='隨機種子')
+    parser.add_argument('--no-budgets', action='store_true', help='只輸出數據，不檢查門檻')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(" Google Sheets 同步效能測試（本機 API 替身）")
+    print("=" * 80)
+    print(f"延遲: {args.latency}s (+{args.jitter}s)  錯誤率: {args.error_rate:.0%}  "
+          f"額度: 讀 {args.reads_per_minute}/分 寫 {args.writes_per_minute}/分")
+    print()
+
+    # 注入延遲或錯誤時耗時沒有參考價值，只檢查請求數
+    check_seconds = args.latency == 0 and args.jitter == 0 and args.error_rate == 0
+    failures = []
+
+    for script in args.only or SCENARIOS:
+        service = FakeSheetsService(
+            reads_per_minute=args.reads_per_minute,
+            writes_per_minute=args.writes_per_minute,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed
+        )
+        workdir = Path(tempfile.mkdtemp(prefix='fantasy_sheets_bench_'))
+        try:
+            engine = build_engine(service, workdir, args.config,
+                                  args.reads_per_minute, args.writes_per_minute)
+            runs = run_scenario(engine, service, SCENARIOS[script], workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        cold, warm = runs['cold'], runs['warm']
+        print(f"{script}")
+        for phase, label in ((cold, '冷同步'), (warm, '熱同步')):
+            print(
+                f"  {label}: {phase['seconds']:.3f}s, {phase['requests']} 次請求"
+                + (f" (重試 {phase['retried']})" if phase['retried'] else "")
+                + f", 送出 {phase['bytes_sent'] / 1024:.1f} KB, 收到 {phase['bytes_received'] / 1024:.1f} KB"
+                + f", 寫入 {phase['cells']} 格"
+            )
+
+        if runs['notes']:
+            print(f"  重建: {runs['rebuild']['seconds']:.3f}s, {runs['rebuild']['requests']} 次請求, "
+                  f"成員備註 {runs['notes']} 則")
+
+        if cold['skipped']:
+            print(f"  ⚠️  數據缺失略過: {', '.join(cold['skipped'])}")
+
+        problems = check_runs(script, runs, budgets=not args.no_budgets, check_seconds=check_seconds)
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        failures += [f"{script}: {problem}" for problem in problems]
+        print()
+
+    if GSPREAD_AVAILABLE and not args.only:
+        legacy = run_legacy(args)
+        print("GoogleSheetsSync.create_dashboard")
+        print(f"  {legacy['seconds']:.3f}s, {legacy['requests']} 次請求, 送出 {legacy['bytes_sent'] / 1024:.1f} KB")
+        print()
+
+    if failures:
+        print(f"❌ {len(failures)} 項未通過")
+        return 1
+
+    print("✅ 完成")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
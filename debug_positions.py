@@ -2,30 +2,12 @@
 檢查 Yahoo API 返回的位置資料格式
 """
 
-import sys
-sys.path.insert(0, 'src')
-
-import json
-from pathlib import Path
-from yfpy.query import YahooFantasySportsQuery
-
-# 載入配置
-with open('config/credentials.json', 'r') as f:
-    config = json.load(f)
-
-yahoo_config = config['yahoo']
-league_config = config['league']
+from src.api import YahooFantasyClient
 
 print("連接 Yahoo API...")
 
-yahoo_query = YahooFantasySportsQuery(
-    auth_dir=str(Path.cwd() / "config"),
-    league_id=league_config['league_id'],
-    game_code=league_config['game_code'],
-    consumer_key=yahoo_config['client_id'],
-    consumer_secret=yahoo_config['client_secret'],
-    browser_callback=True
-)
+client = YahooFantasyClient('config/credentials.json')
+yahoo_query = client.scheduled_query()
 
 team_id = 1
 roster_stats = yahoo_query.get_team_roster_player_stats_by_week(team_id, 1)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+匯出 Excel 檔（與 Google Sheets 同步相同的工作表，不需要 Google 帳號）
+
+    python3 export_xlsx.py                                       # 匯出全部工作表到 data/exports/fantasy_league.xlsx
+    python3 export_xlsx.py --only league_shared,league_insights  # 只匯出指定群組
+    python3 export_xlsx.py --output 聯盟.xlsx
+
+工作表群組: league_shared, league_insights, advanced_trade_value, my_team,
+            roster_summary, league_overview（定義於 src/integrations/sheets_views.py）
+"""
+
+import argparse
+import sys
+
+from src.integrations.sheets_engine import DEFAULT_ENGINE_CONFIG
+from src.integrations.sheets_views import VIEW_GROUPS
+from src.integrations.xlsx_export import DEFAULT_EXPORT_PATH, run_export
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='匯出 Excel 檔')
+    parser.add_argument('--only', help=f"逗號分隔的工作表群組（{', '.join(VIEW_GROUPS)}）")
+    parser.add_argument('--output', default=DEFAULT_EXPORT_PATH, help='輸出路徑')
+    parser.add_argument('--config', default=DEFAULT_ENGINE_CONFIG, help='引擎設定檔')
+    args = parser.parse_args()
+
+    groups = None
+    if args.only:
+        groups = [group.strip() for group in args.only.split(',') if group.strip()]
+        unknown = [group for group in groups if group not in VIEW_GROUPS]
+        if unknown:
+            parser.error(f"未知的工作表群組: {', '.join(unknown)}")
+
+    return run_export(args.output, groups, config_path=args.config)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,45 +2,28 @@
 直接用 yfpy 獲取真實的 Yahoo Fantasy 數據
 """
 
-import sys
-sys.path.insert(0, 'src')
-
 import json
-from pathlib import Path
-from yfpy.query import YahooFantasySportsQuery
+
+from src.api import YahooFantasyClient
 
 print("=" * 70)
 print(" 獲取 Yahoo Fantasy 真實數據")
 print("=" * 70)
 print()
 
-# 載入配置
-with open('config/credentials.json', 'r') as f:
-    config = json.load(f)
-
-yahoo_config = config['yahoo']
-league_config = config['league']
-
 print("步驟 1: 連接 Yahoo API...")
 print()
 
 try:
-    # 初始化 Yahoo Query
-    yahoo_query = YahooFantasySportsQuery(
-        auth_dir=str(Path.cwd() / "config"),
-        league_id=league_config['league_id'],
-        game_code=league_config['game_code'],
-        consumer_key=yahoo_config['client_id'],
-        consumer_secret=yahoo_config['client_secret'],
-        browser_callback=True
-    )
+    # 所有請求都經過客戶端的排程器，與 run_all_sync.py 共用 Yahoo 額度
+    client = YahooFantasyClient('config/credentials.json')
 
     print("✅ API 連接成功")
     print()
 
     # 獲取聯盟資訊
     print("步驟 2: 獲取聯盟資訊...")
-    league = yahoo_query.get_league_info()
+    league = client.get_league_info()
 
     print(f"聯盟名稱: {league.name}")
     print(f"聯盟 ID: {league.league_id}")
@@ -50,7 +33,7 @@ try:
 
     # 獲取所有隊伍
     print("步驟 3: 獲取所有隊伍...")
-    teams = yahoo_query.get_league_teams()
+    teams = client.get_league_teams()
 
     print(f"找到 {len(teams)} 支隊伍:")
     decoded_teams = []
@@ -77,7 +60,7 @@ try:
 
         # 獲取陣容
         print("步驟 5: 獲取陣容數據...")
-        roster = yahoo_query.get_team_roster_by_week(my_team.team_id)
+        roster = client.get_team_roster(my_team.team_id)
 
         print(f"陣容球員數: {len(roster)}")
         print()
@@ -104,7 +87,7 @@ try:
         for player in roster[:5]:  # 先測試前 5 個球員
             try:
                 print(f"正在獲取 {player.name.full} 的數據...")
-                player_stats = yahoo_query.get_player_stats_by_week(player.player_id, week=1)
+                player_stats = client.get_player_stats_by_week(player.player_id, week=1)
 
                 if player_stats:
                     stats_data.append({
@@ -144,6 +127,8 @@ try:
 
         print()
         print(f"數據已儲存至: {output_file}")
+        print()
+        print(client.scheduler.summary())
 
     else:
         print("❌ 找不到隊伍 '霍格格'")
@@ -3,9 +3,12 @@
 計算每位球員的綜合交易價值，考慮位置稀缺性、健康狀態、球隊實力
 """
 
-import json
 from datetime import datetime
-from pathlib import Path
+from itertools import islice
+
+from src.storage import LeagueStore
+from src.storage.artifacts import RecordSpool, open_json_artifact
+from src.storage.binary_snapshot import write_snapshot
 
 print("=" * 80)
 print("  進階交易價值評估系統")
@@ -14,13 +17,13 @@ print()
 
 # 載入聯盟數據
 print("步驟 1: 載入聯盟數據...")
-with open('data/full_league_data.json', 'r', encoding='utf-8') as f:
-    league_data = json.load(f)
+store = LeagueStore.open()
+league_meta = store.get_meta()
 
-teams = league_data['teams']
-rosters = league_data['rosters']
+teams = store.get_teams()
+rosters = store.get_rosters()
 
-print(f"聯盟: {league_data['league_name']}")
+print(f"聯盟: {league_meta['league_name']}")
 print(f"隊伍數: {len(teams)}")
 print()
 
@@ -68,15 +71,9 @@ print()
 print("步驟 3: 計算位置稀缺性...")
 
 # 統計所有位置的球員數量
-position_counts = {pos: 0 for pos in POSITION_SCARCITY.keys()}
-total_players = 0
-
-for team_id, roster in rosters.items():
-    for player in roster:
-        total_players += 1
-        for pos in player.get('positions', []):
-            if pos in position_counts:
-                position_counts[pos] += 1
+league_position_counts = store.count_positions()
+position_counts = {pos: league_position_counts.get(pos, 0) for pos in POSITION_SCARCITY.keys()}
+total_players = store.count_players()
 
 # 計算實際百分比
 position_percentages = {}
@@ -89,7 +86,9 @@ print()
 
 print("步驟 4: 評估所有球員交易價值...")
 
-all_players_value = []
+# 評分後直接寫入暫存檔，記憶體只保留排序用的總分
+all_players_value = RecordSpool()
+tier_counts = {}
 
 for team in teams:
     team_id = str(team['team_id'])
@@ -177,27 +176,22 @@ for team in teams:
             'win_rate': round(team_win_rate, 3)
         }
 
-        all_players_value.append(player_value)
-
-# 依總分排序
-all_players_value.sort(key=lambda x: x['scores']['total'], reverse=True)
+        all_players_value.add(player_value, key=player_value['scores']['total'])
+        tier_counts[tier] = tier_counts.get(tier, 0) + 1
 
 print(f"已評估 {len(all_players_value)} 名球員")
 print()
 
-# 顯示前10名
+# 顯示前10名（依總分排序）
 print("Top 10 交易價值球員:")
-for i, player in enumerate(all_players_value[:10], 1):
+for i, player in enumerate(islice(all_players_value.sorted(reverse=True), 10), 1):
     positions_str = ','.join(player['positions'])
     print(f"  {i}. [{player['tier']}] {player['player_name']} ({positions_str}) - {player['scores']['total']:.1f} 分")
 
 print()
 
-# 統計各分級數量
-tier_counts = {}
-for player in all_players_value:
-    tier = player['tier']
-    tier_counts[tier] = tier_counts.get(tier, 0) + 1
+# 統計各分級數量（依分級高低排列）
+tier_counts = {tier: tier_counts[tier] for tier in ['S', 'A', 'B', 'C', 'D'] if tier in tier_counts}
 
 print("分級統計:")
 for tier in ['S', 'A', 'B', 'C', 'D']:
@@ -206,35 +200,40 @@ for tier in ['S', 'A', 'B', 'C', 'D']:
 
 print()
 
-# 儲存結果
-output_data = {
-    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    'league_name': league_data['league_name'],
-    'current_week': league_data['current_week'],
-    'total_players': len(all_players_value),
-    'tier_distribution': tier_counts,
-    'position_scarcity': position_percentages,
-    'methodology': {
+# 儲存結果（球員依總分逐筆寫出）
+generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+output_file = 'data/advanced_trade_value.json'
+
+with open_json_artifact(output_file) as output:
+    output.field('generated_at', generated_at)
+    output.field('league_name', league_meta['league_name'])
+    output.field('current_week', league_meta['current_week'])
+    output.field('total_players', len(all_players_value))
+    output.field('tier_distribution', tier_counts)
+    output.field('position_scarcity', position_percentages)
+    output.field('methodology', {
         'base_score': 50,
         'position_value_range': '0-30 (multi-position: 0-15, scarcity: 0-15)',
         'health_value_range': '-15 to +25',
         'team_strength_range': '0-20 (based on win rate)',
         'special_bonus_range': '0-10 (pure C: +10, multi-pos C: +5)'
-    },
-    'players': all_players_value
-}
+    })
+    with output.array('players') as players:
+        players.extend(all_players_value.sorted(reverse=True))
 
-output_file = 'data/advanced_trade_value.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(output_data, f, indent=2, ensure_ascii=False)
+# 更新二進位快照，加入交易價值與等級
+snapshot_file = write_snapshot(store.to_league_data(), {'players': all_players_value.records()})
 
 print("=" * 80)
 print("  交易價值評估完成！")
 print("=" * 80)
 print()
 print(f"輸出檔案: {output_file}")
-print(f"評估時間: {output_data['generated_at']}")
+print(f"二進位快照: {snapshot_file}")
+print(f"評估時間: {generated_at}")
 print(f"球員總數: {len(all_players_value)}")
 print()
 print("下一步: 執行 python3 sync_advanced_trade_value.py 同步到 Google Sheets")
 print()
+
+all_players_value.close()
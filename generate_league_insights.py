@@ -3,10 +3,12 @@
 包含：賽程分析、位置深度、交易價值參考、每週戰報
 """
 
-import json
 from datetime import datetime
 from collections import defaultdict
 
+from src.storage import LeagueStore
+from src.storage.artifacts import RecordSpool, open_json_artifact
+
 print("=" * 80)
 print("  聯盟洞察數據生成系統")
 print("=" * 80)
@@ -14,17 +16,16 @@ print()
 
 # 載入聯盟數據
 print("步驟 1: 載入聯盟數據...")
-with open('data/full_league_data.json', 'r', encoding='utf-8') as f:
-    league_data = json.load(f)
+store = LeagueStore.open()
+league_meta = store.get_meta()
 
-teams = league_data['teams']
-rosters = league_data['rosters']
-team_schedules = league_data['team_schedules']
-matchups_by_week = league_data['matchups_by_week']
-current_week = league_data['current_week']
-total_weeks = league_data['total_weeks']
+teams = store.get_teams()
+rosters = store.get_rosters()
+team_schedules = store.get_team_schedules()
+current_week = league_meta['current_week']
+total_weeks = league_meta['total_weeks']
 
-print(f"聯盟: {league_data['league_name']}")
+print(f"聯盟: {league_meta['league_name']}")
 print(f"當前週次: Week {current_week}")
 print()
 
@@ -185,7 +186,8 @@ print()
 # ============================================================================
 print("步驟 4: 生成交易價值參考...")
 
-trade_reference = []
+# 逐筆暫存，輸出時再依交易價值排序
+trade_reference = RecordSpool()
 
 for team in teams:
     team_id = str(team['team_id'])
@@ -221,7 +223,7 @@ for team in teams:
 
         final_score = versatility_score + health_adjustment
 
-        trade_reference.append({
+        trade_reference.add({
             'player_name': player['name'],
             'team_name': team_name,
             'positions': positions,
@@ -230,10 +232,7 @@ for team in teams:
             'versatility_score': versatility_score,
             'health_adjustment': health_adjustment,
             'trade_value': final_score
-        })
-
-# 依交易價值排序
-trade_reference.sort(key=lambda x: x['trade_value'], reverse=True)
+        }, key=final_score)
 
 print(f"交易價值參考完成 ({len(trade_reference)} 名球員)")
 print()
@@ -244,7 +243,7 @@ print()
 print("步驟 5: 生成每週戰報...")
 
 # 本週對戰
-current_matchups = matchups_by_week.get(f'week_{current_week}', [])
+current_matchups = store.get_matchups(current_week)
 
 # 找出最強 vs 最強、最弱 vs 最弱
 matchup_analysis = []
@@ -300,29 +299,28 @@ print()
 # 儲存所有洞察
 # ============================================================================
 
-insights_data = {
-    'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    'league_name': league_data['league_name'],
-    'current_week': current_week,
-    'total_weeks': total_weeks,
-    'insights': {
-        'schedule_difficulty': schedule_analysis,
-        'position_depth': position_depth,
-        'trade_reference': trade_reference,
-        'weekly_report': weekly_report
-    }
-}
-
+generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 output_file = 'data/league_insights.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(insights_data, f, indent=2, ensure_ascii=False)
+
+with open_json_artifact(output_file) as output:
+    output.field('generated_at', generated_at)
+    output.field('league_name', league_meta['league_name'])
+    output.field('current_week', current_week)
+    output.field('total_weeks', total_weeks)
+    with output.object('insights') as insights:
+        insights.field('schedule_difficulty', schedule_analysis)
+        insights.field('position_depth', position_depth)
+        with insights.array('trade_reference') as players:
+            # 依交易價值排序逐筆寫出
+            players.extend(trade_reference.sorted(reverse=True))
+        insights.field('weekly_report', weekly_report)
 
 print("=" * 80)
 print("  聯盟洞察生成完成！")
 print("=" * 80)
 print()
 print(f"輸出檔案: {output_file}")
-print(f"生成時間: {insights_data['generated_at']}")
+print(f"生成時間: {generated_at}")
 print()
 print("洞察內容:")
 print(f"  1. 賽程難度分析 - {len(schedule_analysis)} 支隊伍")
@@ -332,3 +330,5 @@ print(f"  4. 每週戰報 - Week {current_week} ({len(current_matchups)} 場)")
 print()
 print("下一步: 執行 python3 sync_league_insights.py 同步到 Google Sheets")
 print()
+
+trade_reference.close()
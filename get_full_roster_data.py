@@ -2,36 +2,20 @@
 獲取完整的陣容數據和統計
 """
 
-import sys
-sys.path.insert(0, 'src')
-
 import json
-from pathlib import Path
-from yfpy.query import YahooFantasySportsQuery
+
+from src.api import YahooFantasyClient
 
 print("=" * 70)
 print(" 默絲佛陀攝影掃地伯 - 完整陣容數據")
 print("=" * 70)
 print()
 
-# 載入配置
-with open('config/credentials.json', 'r') as f:
-    config = json.load(f)
-
-yahoo_config = config['yahoo']
-league_config = config['league']
-
 print("步驟 1: 連接 Yahoo API...")
 
 try:
-    yahoo_query = YahooFantasySportsQuery(
-        auth_dir=str(Path.cwd() / "config"),
-        league_id=league_config['league_id'],
-        game_code=league_config['game_code'],
-        consumer_key=yahoo_config['client_id'],
-        consumer_secret=yahoo_config['client_secret'],
-        browser_callback=True
-    )
+    client = YahooFantasyClient('config/credentials.json')
+    yahoo_query = client.scheduled_query()
 
     print("✅ 連接成功")
     print()
@@ -3,12 +3,9 @@
 作為盟主提供給大家的服務
 """
 
-import sys
-sys.path.insert(0, 'src')
-
 import json
-from pathlib import Path
-from yfpy.query import YahooFantasySportsQuery
+
+from src.api import YahooFantasyClient
 
 print("=" * 80)
 print(" 大亂鬥聯盟 - 完整數據獲取")
@@ -19,20 +16,13 @@ print()
 with open('config/credentials.json', 'r') as f:
     config = json.load(f)
 
-yahoo_config = config['yahoo']
 league_config = config['league']
 
 print("步驟 1: 連接 Yahoo API...")
 
 try:
-    yahoo_query = YahooFantasySportsQuery(
-        auth_dir=str(Path.cwd() / "config"),
-        league_id=league_config['league_id'],
-        game_code=league_config['game_code'],
-        consumer_key=yahoo_config['client_id'],
-        consumer_secret=yahoo_config['client_secret'],
-        browser_callback=True
-    )
+    client = YahooFantasyClient('config/credentials.json')
+    yahoo_query = client.scheduled_query()
 
     print("✅ 連接成功")
     print()
@@ -2,37 +2,21 @@
 簡化版 - 獲取你的陣容資料
 """
 
-import sys
-sys.path.insert(0, 'src')
-
 import json
-from pathlib import Path
-from yfpy.query import YahooFantasySportsQuery
+
+from src.api import YahooFantasyClient
 
 print("=" * 70)
 print(" 獲取「默絲佛陀攝影掃地伯」陣容")
 print("=" * 70)
 print()
 
-# 載入配置
-with open('config/credentials.json', 'r') as f:
-    config = json.load(f)
-
-yahoo_config = config['yahoo']
-league_config = config['league']
-
 print("連接 Yahoo API...")
 
 try:
     # 初始化
-    yahoo_query = YahooFantasySportsQuery(
-        auth_dir=str(Path.cwd() / "config"),
-        league_id=league_config['league_id'],
-        game_code=league_config['game_code'],
-        consumer_key=yahoo_config['client_id'],
-        consumer_secret=yahoo_config['client_secret'],
-        browser_callback=True
-    )
+    client = YahooFantasyClient('config/credentials.json')
+    yahoo_query = client.scheduled_query()
 
     print("✅ 連接成功")
     print()
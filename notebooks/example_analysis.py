@@ -21,10 +21,11 @@ sys.path.append('..')
 from src.api.yahoo_client import YahooFantasyClient
 from src.models.player import Player
 from src.models.roster import Roster
-from src.models.stats import PlayerStats
+from src.models.stats import PlayerStats, PlayerStatsColumns
 from src.analysis.roster_analyzer import RosterAnalyzer
 from src.analysis.trade_analyzer import TradeAnalyzer
 from src.analysis.category_scorer import CategoryScorer
+from src.storage.stats_dataset import PYARROW_AVAILABLE, PlayerStatsDataset
 
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -50,44 +51,40 @@ print(f"當前週次: {league_info.current_week}")
 # %% [markdown]
 # ## 步驟 2: 獲取你的陣容數據
 
-# %% 獲取陣容
-my_team_roster = client.get_team_roster()
+# %% 獲取陣容（直接解析為球員資料列與欄式統計）
+import json
+
+with open('../config/my_team_config.json', 'r', encoding='utf-8') as f:
+    my_team_id = json.load(f)['team_id']
+
+my_team_roster, my_team_stats = client.get_team_roster_with_stats(my_team_id)
 
 print(f"\n你的陣容:")
 for player in my_team_roster:
-    print(f"  {player.name} ({player.display_position})")
+    print(f"  {player['name']} ({','.join(player['positions'])})")
 
 # %% [markdown]
 # ## 步驟 3: 分析陣容優劣勢
 
 # %% 建立陣容分析器
-# 注意: 這裡需要先將 Yahoo API 的數據轉換為我們的 Player 和 PlayerStats 模型
-# 實際使用時需要寫一個轉換函數
-
-def convert_yahoo_player_to_model(yahoo_player):
-    """將 Yahoo API 的球員數據轉換為我們的模型"""
-    # 這是示例，實際實作需要根據 Yahoo API 的數據結構調整
-    stats = PlayerStats(
-        player_id=yahoo_player.player_id,
-        player_name=yahoo_player.name.full,
-        team=yahoo_player.editorial_team_abbr,
-        position=yahoo_player.display_position,
-        games_played=yahoo_player.player_stats.stats.get('GP', 0),
-        # ... 其他統計數據
-    )
+# yahoo_adapter 已經把 Yahoo 的 stat_id -> value 轉成 PlayerStats 欄位，
+# 這裡只需要把每一列配上對應的統計
 
+def to_player_model(record, stats):
+    """將球員資料列與統計組成 Player 模型"""
     return Player(
-        player_id=yahoo_player.player_id,
-        name=yahoo_player.name.full,
-        team=yahoo_player.editorial_team_abbr,
-        positions=yahoo_player.eligible_positions,
+        player_id=str(record['player_id']),
+        name=record['name'],
+        team=record['team'],
+        positions=record['positions'],
+        injury_status=record['status'] or None,
         stats=stats
     )
 
 # 轉換陣容
 my_roster = Roster(
     team_name="我的隊伍",
-    players=[convert_yahoo_player_to_model(p) for p in my_team_roster]
+    players=[to_player_model(record, my_team_stats.row(i)) for i, record in enumerate(my_team_roster)]
 )
 
 # 分析陣容
@@ -190,11 +187,14 @@ plt.show()
 # 假設你想補強 FG% 和 REB
 target_categories = ['FG%', 'REB', 'BLK']
 
-# 獲取所有自由球員
-free_agents = client.get_free_agents()
+# 分頁獲取自由球員統計，抓到足夠人數就提前停止（不需等整個球員池下載完）
+free_agent_stats = PlayerStatsColumns()
+for records, columns in client.iter_player_stats(status='FA'):
+    free_agent_stats.extend(columns)
+    if len(free_agent_stats) >= 100:
+        break
 
-# 轉換為 PlayerStats 模型
-all_players_stats = [convert_yahoo_player_to_model(p).stats for p in free_agents]
+all_players_stats = free_agent_stats.to_player_stats()
 
 # 找出目標球員
 suggestions = trade_analyzer.suggest_trade_targets(
@@ -221,6 +221,26 @@ df_report = pd.DataFrame({
 df_report.to_csv('../data/exports/roster_analysis.csv', index=False, encoding='utf-8-sig')
 print("\n報告已匯出至 data/exports/roster_analysis.csv")
 
+# %% [markdown]
+# ## 步驟 8: 整季球員歷史
+#
+# 每次執行 get_full_league_data.py 都會把各隊球員的當週統計寫入
+# data/exports/player_stats（Arrow IPC，需要 pyarrow）。以 memory-map
+# 讀取後直接交給 CategoryScorer 做整欄運算，不需建立 PlayerStats 物件。
+
+# %% 讀取整季統計並排名
+if PYARROW_AVAILABLE:
+    dataset = PlayerStatsDataset('../data/exports/player_stats')
+    print("已有分區:", dataset.partitions())
+
+    season_totals = dataset.player_totals(season='2025')
+    if season_totals.num_rows > 0:
+        season_scorer = CategoryScorer()
+        for player in season_scorer.rank_columnar(season_totals, top=20):
+            print(f"#{player['rank']} {player['player_name']} ({player['team']}): {player['total_value']:.2f}")
+else:
+    print("未安裝 pyarrow，略過整季歷史分析 (pip install pyarrow)")
+
 # %% [markdown]
 # ## 完成！
 #
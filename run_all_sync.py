@@ -4,90 +4,46 @@
 每小時執行一次，更新數據並部署到 Zeabur
 """
 
+import argparse
+import signal
 import subprocess
 import sys
 import os
 from datetime import datetime
 
-# 設定工作目錄
-os.chdir('/Users/murs/Documents/fantasy-basketball-snakestar')
+from src.automation.pipeline import DEFAULT_MAX_WORKERS, FAILED, Pipeline, Stage
+from src.storage import LeagueStore
+from src.storage.artifacts import copy_artifact
 
-def run_command(cmd, description):
-    """執行命令並記錄結果"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}] {description}...")
+# 設定工作目錄（腳本所在的專案目錄）
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 分鐘超時
-        )
-
-        if result.returncode == 0:
-            print(f"[{timestamp}] ✅ {description} 成功")
-            return True
-        else:
-            print(f"[{timestamp}] ⚠️ {description} 失敗: {result.stderr[:200]}")
-            return False
-    except subprocess.TimeoutExpired:
-        print(f"[{timestamp}] ⏱️ {description} 超時")
-        return False
-    except Exception as e:
-        print(f"[{timestamp}] ❌ {description} 錯誤: {str(e)[:200]}")
-        return False
+def league_fingerprint():
+    """聯盟數據內容的 hash（不含更新時間，重新抓取但內容沒變時不變）"""
+    with LeagueStore.open() as store:
+        return store.content_hash() or ''
 
-def main():
-    print("=" * 80)
-    print(" 蛇星刁手 Fantasy Basketball - 自動同步")
-    print("=" * 80)
-    print()
 
-    # 步驟 1: 獲取 Yahoo 數據
-    if not run_command('python3 get_full_league_data.py', '獲取 Yahoo 聯盟數據'):
-        print("❌ Yahoo 數據獲取失敗，中止")
-        sys.exit(1)
+def deploy_to_web():
+    """複製數據到 web 目錄並推送，觸發 Zeabur 部署"""
+    # 複製數據到 web 目錄（原子替換並更新 web/data/manifest.json）
+    for artifact in ('full_league_data.json', 'advanced_trade_value.json', 'league_insights.json'):
+        try:
+            copy_artifact(f'data/{artifact}', 'web/data')
+        except OSError as e:
+            print(f"⚠️  複製 {artifact} 失敗: {e}")
 
-    # 步驟 2: 生成聯盟洞察
-    run_command('python3 generate_league_insights.py', '生成聯盟洞察')
-
-    # 步驟 3: 生成進階交易價值
-    run_command('python3 generate_advanced_trade_value.py', '生成進階交易價值')
-
-    # 步驟 4: 同步到聯盟共享 Sheets
-    run_command('python3 sync_league_shared.py', '同步聯盟共享 Sheets')
-
-    # 步驟 5: 同步聯盟洞察
-    run_command('python3 sync_league_insights.py', '同步聯盟洞察')
-
-    # 步驟 6: 同步進階交易價值
-    run_command('python3 sync_advanced_trade_value.py', '同步進階交易價值')
-
-    # 步驟 7: 同步個人球隊數據
-    run_command('python3 sync_my_team.py', '同步個人球隊數據（默斯佛陀）')
-
-    # 步驟 8: 部署到 Zeabur
-    print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 部署到 Zeabur...")
-
-    # 複製數據到 web 目錄
-    os.system('cp data/full_league_data.json web/data/ 2>/dev/null')
-    os.system('cp data/advanced_trade_value.json web/data/ 2>/dev/null')
-    os.system('cp data/league_insights.json web/data/ 2>/dev/null')
-
-    # Git 操作
-    os.chdir('web')
+    # Git 操作（在 web 目錄內執行，不切換整個行程的工作目錄，其他階段可同時執行）
+    def git(cmd, shell=True):
+        return subprocess.run(cmd, shell=shell, cwd='web').returncode
 
     # Pull 最新代碼
-    os.system('git pull origin main > /dev/null 2>&1')
+    git('git pull origin main > /dev/null 2>&1')
 
     # 檢查是否有變更
-    result = subprocess.run('git diff --quiet data/*.json', shell=True)
-
-    if result.returncode != 0:  # 有變更
+    if git('git diff --quiet data/*.json') != 0:  # 有變更
         # Commit and push
-        os.system('git add data/*.json')
+        git('git add data/*.json')
         commit_msg = f"""auto: 更新聯盟數據 {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
 📊 自動更新：
@@ -99,19 +55,106 @@ def main():
 🤖 Generated with Claude Code
 Co-Authored-By: Claude <noreply@anthropic.com>"""
 
-        os.system(f'git commit -m "{commit_msg}"')
-        push_result = os.system('git push origin main')
+        git(['git', 'commit', '-m', commit_msg], shell=False)
+        push_result = git('git push origin main')
 
         if push_result == 0:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ✅ Zeabur 部署觸發成功")
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🌐 網頁將在 1-2 分鐘內自動更新")
         else:
             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⚠️ GitHub 推送失敗")
+            return False
     else:
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ℹ️ 數據無變更，跳過部署")
 
-    # 返回主目錄
-    os.chdir('..')
+
+# 流程內同步的工作表群組（數據都由前面的階段產生）
+PIPELINE_SHEET_GROUPS = ['league_shared', 'league_insights', 'advanced_trade_value', 'my_team']
+
+
+def build_stages(include_fetch=True):
+    """
+    同步流程的所有階段
+
+    Args:
+        include_fetch: 包含抓取 Yahoo 數據的階段；常駐排程（sync_daemon.py）
+            在行程內自行抓取，只需要下游階段
+    """
+    stages = [
+        # Yahoo 限流時會排隊等待，給較長的逾時
+        Stage('fetch', '獲取 Yahoo 聯盟數據', 'python3 get_full_league_data.py',
+              always_run=True, outputs=['data/full_league_data.json'], timeout=600),
+        Stage('insights', '生成聯盟洞察', 'python3 generate_league_insights.py',
+              depends_on=['fetch'],
+              inputs=[league_fingerprint, 'generate_league_insights.py'],
+              outputs=['data/league_insights.json'], timeout=120),
+        Stage('trade_value', '生成進階交易價值', 'python3 generate_advanced_trade_value.py',
+              depends_on=['fetch'],
+              inputs=[league_fingerprint, 'generate_advanced_trade_value.py'],
+              outputs=['data/advanced_trade_value.json'], timeout=120),
+        # 所有 Spreadsheet 一次認證、一次載入數據、同時送出（src/integrations/sheets_engine.py）
+        Stage('sync_sheets', '同步 Google Sheets',
+              f'python3 sync_sheets.py --only {",".join(PIPELINE_SHEET_GROUPS)}',
+              depends_on=['fetch', 'insights', 'trade_value'],
+              inputs=[league_fingerprint, 'data/league_insights.json', 'data/advanced_trade_value.json',
+                      'sync_sheets.py', 'src/integrations/sheets_views.py', 'src/integrations/sheets_engine.py',
+                      'config/sheets_engine.json', 'config/league_sheets_config.json',
+                      'config/my_team_config.json']),
+        Stage('deploy', '部署到 Zeabur', deploy_to_web,
+              depends_on=['fetch', 'insights', 'trade_value'],
+              inputs=['data/full_league_data.json', 'data/league_insights.json', 'data/advanced_trade_value.json']),
+    ]
+    if include_fetch:
+        return stages
+
+    downstream = [stage for stage in stages if stage.name != 'fetch']
+    for stage in downstream:
+        stage.depends_on = [dep for dep in stage.depends_on if dep != 'fetch']
+    return downstream
+
+
+def _interrupt(signum, frame):
+    """SIGTERM 與 Ctrl-C 一樣處理，讓流程終止子行程並寫出報告"""
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description='自動同步並部署')
+    parser.add_argument('--force', action='store_true', help='忽略輸入 hash，所有階段都重跑')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('SYNC_MAX_WORKERS', DEFAULT_MAX_WORKERS)),
+                        help=f'同時執行的階段數（預設 {DEFAULT_MAX_WORKERS}，或環境變數 SYNC_MAX_WORKERS）')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='沒有指定逾時的階段使用的逾時秒數（預設 300）')
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _interrupt)
+
+    print("=" * 80)
+    print(" 蛇星刁手 Fantasy Basketball - 自動同步")
+    print("=" * 80)
+    print()
+
+    options = {'max_workers': args.workers}
+    if args.timeout is not None:
+        options['default_timeout'] = args.timeout
+    pipeline = Pipeline(build_stages(), **options)
+
+    try:
+        results = pipeline.run(force=args.force)
+    except KeyboardInterrupt:
+        print()
+        pipeline.print_report()
+        print("🛑 同步已中斷")
+        sys.exit(130)
+
+    print()
+    pipeline.print_report()
+    print(f"執行報告: {pipeline.report_file}")
+
+    if results['fetch'].status == FAILED:
+        print("❌ Yahoo 數據獲取失敗，中止")
+        sys.exit(1)
 
     print()
     print("=" * 80)
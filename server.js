@@ -17,6 +17,47 @@ app.use(express.json());
 app.use(express.static(path.join(__dirname, 'web')));
 app.use('/data', express.static(path.join(__dirname, 'data')));
 
+// 產出檔快取：依 data/manifest.json 的 sha256 判斷是否需要重新讀取
+// （沒有 manifest 時退回比對修改時間與大小）
+const artifactCache = {};
+
+function artifactVersion(fileName) {
+    const dataDir = path.join(__dirname, 'data');
+    try {
+        const manifest = JSON.parse(fs.readFileSync(path.join(dataDir, 'manifest.json'), 'utf8'));
+        const entry = manifest.artifacts && manifest.artifacts[fileName];
+        if (entry && entry.sha256) {
+            return entry.sha256;
+        }
+    } catch (error) {
+        // manifest 不存在或讀取失敗
+    }
+    const stat = fs.statSync(path.join(dataDir, fileName));
+    return `${stat.mtimeMs}:${stat.size}`;
+}
+
+function loadArtifact(fileName) {
+    const version = artifactVersion(fileName);
+    const cached = artifactCache[fileName];
+    if (cached && cached.version === version) {
+        return cached.data;
+    }
+
+    const data = JSON.parse(fs.readFileSync(path.join(__dirname, 'data', fileName), 'utf8'));
+    artifactCache[fileName] = { version: version, data: data };
+    return data;
+}
+
+// 依 full_league_data.json 內的索引取得隊伍（舊檔沒有索引時退回線性搜尋）
+function findTeam(leagueData, teamId) {
+    const indexes = leagueData.indexes;
+    if (indexes && indexes.teams) {
+        const row = indexes.teams[String(teamId)];
+        return row === undefined ? undefined : leagueData.teams[row];
+    }
+    return leagueData.teams.find(t => t.team_id == teamId);
+}
+
 // 健康檢查
 app.get('/health', (req, res) => {
     res.json({
@@ -39,8 +80,7 @@ app.get('/api/league-data', (req, res) => {
             });
         }
 
-        const data = fs.readFileSync(dataPath, 'utf8');
-        const leagueData = JSON.parse(data);
+        const leagueData = loadArtifact('full_league_data.json');
 
         res.json({
             success: true,
@@ -60,13 +100,10 @@ app.get('/api/league-data', (req, res) => {
 app.get('/api/roster/:teamId', (req, res) => {
     try {
         const { teamId } = req.params;
-        const dataPath = path.join(__dirname, 'data', 'full_league_data.json');
-
-        const data = fs.readFileSync(dataPath, 'utf8');
-        const leagueData = JSON.parse(data);
+        const leagueData = loadArtifact('full_league_data.json');
 
         const roster = leagueData.rosters[teamId];
-        const team = leagueData.teams.find(t => t.team_id == teamId);
+        const team = findTeam(leagueData, teamId);
 
         if (!roster || !team) {
             return res.status(404).json({
@@ -6,7 +6,7 @@
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import Any, List, Dict
 from ..models.stats import PlayerStats, CategoryStats
 
 
@@ -33,6 +33,19 @@ class CategoryScorer:
         'TO': -1.0  # 失誤是負面影響
     }
 
+    # 類別對應的欄位名稱（PlayerStats / PlayerStatsColumns / 球員統計資料集）
+    CATEGORY_FIELDS = {
+        'FG%': 'fg_pct',
+        'FT%': 'ft_pct',
+        '3PM': 'three_pm',
+        'PTS': 'pts',
+        'REB': 'reb',
+        'AST': 'ast',
+        'ST': 'st',
+        'BLK': 'blk',
+        'TO': 'to'
+    }
+
     def __init__(self, weights: Dict[str, float] = None):
         """
         初始化評分器
@@ -56,7 +69,7 @@ class CategoryScorer:
         # 轉換為 DataFrame 以便計算
         data = []
         for stats in players_stats:
-            if stats.games_played == 0:
+            if not stats.has_played():
                 continue
 
             data.append({
@@ -168,7 +181,7 @@ class CategoryScorer:
 
         rankings = []
         for stats in players_stats:
-            if stats.games_played == 0:
+            if not stats.has_played():
                 continue
 
             z_scores = self.calculate_player_value(stats)
@@ -215,3 +228,114 @@ class CategoryScorer:
             }
 
         return comparison
+
+    # ------------------------------------------------------------------
+    # 欄式計算：直接對整欄數值運算，不建立 PlayerStats 物件
+    # 可傳入 pyarrow Table（PlayerStatsDataset.scan / player_totals）、
+    # PlayerStatsColumns 或 {欄位名稱: 列表} 字典
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _numeric_column(columns: Any, name: str) -> np.ndarray:
+        """取出一個數值欄位"""
+        if hasattr(columns, 'num_rows'):
+            return np.asarray(columns.column(name).to_numpy(), dtype=float)
+        if isinstance(columns, dict):
+            return np.asarray(columns[name], dtype=float)
+        return np.asarray(getattr(columns, name), dtype=float)
+
+    @staticmethod
+    def _text_column(columns: Any, name: str) -> List:
+        """取出一個文字欄位"""
+        if hasattr(columns, 'num_rows'):
+            return columns.column(name).to_pylist()
+        if isinstance(columns, dict):
+            return list(columns[name])
+        return list(getattr(columns, name))
+
+    def calculate_league_averages_columnar(self, columns: Any) -> None:
+        """
+        以欄式數據計算聯盟平均值和標準差（結果與 calculate_league_averages 相同）
+
+        Args:
+            columns: 欄式球員統計
+        """
+        # 出賽數未知 (GAMES_PLAYED_UNKNOWN) 視為有出賽，與 PlayerStats.has_played 相同
+        played = self._numeric_column(columns, 'games_played') != 0
+        if not played.any():
+            raise ValueError("球員數據不能為空")
+
+        self.league_stats = {}
+        for cat, field_name in self.CATEGORY_FIELDS.items():
+            values = self._numeric_column(columns, field_name)[played]
+            self.league_stats[cat] = {
+                'mean': float(np.nanmean(values)),
+                'std': float(np.nanstd(values, ddof=1)) if len(values) > 1 else float('nan')
+            }
+
+    def score_columnar(self, columns: Any) -> Dict[str, np.ndarray]:
+        """
+        整欄計算各類別 Z-Score 與總價值
+
+        Args:
+            columns: 欄式球員統計
+
+        Returns:
+            {類別: Z-Score 陣列, 'total': 總價值陣列}；未出賽球員為 nan
+        """
+        if not self.league_stats:
+            self.calculate_league_averages_columnar(columns)
+
+        played = self._numeric_column(columns, 'games_played') != 0
+        scores = {}
+        total = np.zeros(len(played))
+
+        for cat, field_name in self.CATEGORY_FIELDS.items():
+            mean = self.league_stats[cat]['mean']
+            std = self.league_stats[cat]['std']
+            values = self._numeric_column(columns, field_name)
+
+            z = (values - mean) / std if std != 0 else np.zeros(len(values))
+            if cat == 'TO':
+                z = -z
+
+            z[~played] = np.nan
+            scores[cat] = z
+            total += z * self.weights.get(cat, 1.0)
+
+        scores['total'] = total
+        return scores
+
+    def rank_columnar(self, columns: Any, top: int = None) -> List[Dict]:
+        """
+        以欄式數據對球員排名（輸出格式同 rank_players）
+
+        Args:
+            columns: 欄式球員統計
+            top: 只回傳前幾名
+
+        Returns:
+            排名列表
+        """
+        scores = self.score_columnar(columns)
+        total = scores['total']
+
+        played = np.flatnonzero(~np.isnan(total))
+        order = played[np.argsort(-total[played], kind='stable')]
+        if top is not None:
+            order = order[:top]
+
+        names = self._text_column(columns, 'player_name')
+        teams = self._text_column(columns, 'team')
+
+        rankings = []
+        for rank, i in enumerate(order, 1):
+            rankings.append({
+                'player_name': names[i],
+                'team': teams[i],
+                'total_value': float(total[i]),
+                **{cat: float(scores[cat][i]) for cat in self.CATEGORIES},
+                'rank': rank
+            })
+
+        return rankings
@@ -138,7 +138,7 @@ class TradeAnalyzer:
         # 計算送出球員的總價值
         give_values = []
         for player in give_players:
-            if player.stats and player.stats.games_played > 0:
+            if player.stats and player.stats.has_played():
                 value = self.scorer.calculate_total_value(player.stats)
                 give_values.append({'player': player.name, 'value': round(value, 2)})
 
@@ -147,7 +147,7 @@ class TradeAnalyzer:
         # 計算換來球員的總價值
         receive_values = []
         for player in receive_players:
-            if player.stats and player.stats.games_played > 0:
+            if player.stats and player.stats.has_played():
                 value = self.scorer.calculate_total_value(player.stats)
                 receive_values.append({'player': player.name, 'value': round(value, 2)})
 
@@ -220,7 +220,7 @@ class TradeAnalyzer:
         # 對所有球員在目標類別進行排名
         rankings = []
         for stats in self.league_players:
-            if stats.games_played == 0:
+            if not stats.has_played():
                 continue
 
             z_scores = self.scorer.calculate_player_value(stats)
@@ -63,7 +63,7 @@ class TradeTargetRecommender:
         recommendations = []
 
         for stats in self.available_players:
-            if stats.games_played == 0:
+            if not stats.has_played():
                 continue
 
             # 排除自己的球員
@@ -173,7 +173,7 @@ class TradeTargetRecommender:
         strong_cats = self.analyzer.identify_strong_categories()
 
         for player in self.my_roster.players:
-            if not player.stats or player.stats.games_played == 0:
+            if not player.stats or not player.stats.has_played():
                 # 傷兵
                 if player.injury_status == 'INJ':
                     expendable.append(player.name)
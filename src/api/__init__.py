@@ -2,6 +2,15 @@
 Yahoo Fantasy Sports API 連接模組
 """
 
-from .yahoo_client import YahooFantasyClient
+from .request_scheduler import Lane, RequestScheduler
 
-__all__ = ['YahooFantasyClient']
+# Sheets 同步只用到 rate_limit，沒有安裝 yfpy 時也要能匯入本套件
+try:
+    from .yahoo_client import YahooFantasyClient
+    YFPY_AVAILABLE = True
+except ImportError:
+    YFPY_AVAILABLE = False
+
+__all__ = ['Lane', 'RequestScheduler', 'YFPY_AVAILABLE']
+if YFPY_AVAILABLE:
+    __all__.append('YahooFantasyClient')
@@ -0,0 +1,109 @@
+"""
+斷路器
+
+連續失敗達到門檻後暫停呼叫一段時間，讓剩下的請求直接失敗改用舊資料，
+不必每一個都等到逾時。冷卻後放行一次試探請求，成功即恢復。
+"""
+
+import threading
+import time
+from typing import Any, Callable
+
+
+class CircuitOpenError(Exception):
+    """斷路器開啟中，請求未送出"""
+
+
+class CircuitBreaker:
+    """
+    斷路器
+
+    狀態：
+    - closed: 正常呼叫
+    - open: 直接拋出 CircuitOpenError
+    - half_open: 冷卻結束，放行一次試探請求
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0, name: str = 'yahoo'):
+        """
+        初始化斷路器
+
+        Args:
+            failure_threshold: 連續失敗幾次後開啟
+            reset_timeout: 開啟後多久（秒）放行試探請求
+            name: 名稱（用於訊息）
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """目前狀態（需持有 self._lock）"""
+        if self._state == self.OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        透過斷路器呼叫
+
+        Raises:
+            CircuitOpenError: 斷路器開啟中
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN or (state == self.HALF_OPEN and self._probing):
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} 斷路器開啟中（連續失敗 {self._failures} 次）")
+            if state == self.HALF_OPEN:
+                self._probing = True
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._record_failure()
+            raise
+
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.time()
+            self._probing = False
+
+    def summary(self) -> str:
+        """產生可列印的狀態摘要"""
+        return (
+            f"{self.name} 斷路器: {self.state}, 開啟 {self.trips} 次, "
+            f"略過 {self.rejected} 次請求"
+        )
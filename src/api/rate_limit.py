@@ -0,0 +1,179 @@
+"""
+跨行程共用的限流器
+
+Yahoo API 的 TokenBucket（src/api/request_scheduler.py）與 Sheets API 的
+SlidingWindow（src/integrations/sheets_quota.py）共用同一套機制：
+
+1. 狀態存在 JSON 檔並以 file_lock 保護，同一台機器上接連或同時執行的
+   腳本共用額度；沒有狀態檔（或沒有 fcntl 的平台）時只在本行程內限流
+2. penalize() 設定 blocked_until，收到限流回應時所有共用者一起暫停
+3. acquire() 反覆嘗試，直到取得額度為止
+
+子類別只需實作 _initial_state() 與 _take()。
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ..storage.artifacts import FCNTL_AVAILABLE, file_lock
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """
+    取得例外所附的 HTTP 狀態碼，沒有時回傳 None
+
+    依序查看 response.status_code（requests / gspread）、status_code 與 code
+    （gspread.exceptions.APIError、urllib 的 HTTPError）。
+    """
+    response = getattr(error, 'response', None)
+    for status in (getattr(response, 'status_code', None),
+                   getattr(error, 'status_code', None),
+                   getattr(error, 'code', None)):
+        if isinstance(status, int) and not isinstance(status, bool):
+            return status
+    return None
+
+
+class SharedRateLimiter:
+    """跨行程共用狀態的限流器基底"""
+
+    # 每次等待的上限（秒），讓 penalize() 或其他行程釋出的額度能及時生效
+    MAX_SLEEP_SECONDS = 1.0
+
+    def __init__(self, state_file: Optional[Path] = None):
+        """
+        Args:
+            state_file: 共用狀態檔路徑，None 表示只在本行程內限流
+        """
+        self.state_file = Path(state_file) if state_file else None
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> Dict:
+        """狀態檔不存在或無法解析時的初始狀態"""
+        return {'blocked_until': 0.0}
+
+    def _take(self, state: Dict, now: float, kind: Optional[str]) -> float:
+        """在狀態中記錄一次請求，成功回傳 0，否則回傳建議等待秒數"""
+        raise NotImplementedError
+
+    def _on_penalize(self, state: Dict) -> None:
+        """penalize() 時額外清除的狀態"""
+
+    def try_acquire(self, kind: Optional[str] = None) -> float:
+        """嘗試取得一次額度，成功回傳 0，否則回傳建議等待秒數"""
+        def update(state: Dict) -> float:
+            now = time.time()
+            blocked_until = state.get('blocked_until', 0.0)
+            if now < blocked_until:
+                return blocked_until - now
+            return self._take(state, now, kind)
+
+        return self._with_state(update)
+
+    def acquire(self, kind: Optional[str] = None) -> float:
+        """
+        取得一次額度，必要時等待
+
+        Returns:
+            等待的秒數
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(kind)
+            if wait <= 0:
+                return waited
+            wait = min(wait, self.MAX_SLEEP_SECONDS)
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float) -> None:
+        """收到限流回應時，讓所有共用此額度的行程暫停一段時間"""
+        def update(state: Dict) -> float:
+            state['blocked_until'] = max(state.get('blocked_until', 0.0), time.time() + seconds)
+            self._on_penalize(state)
+            return 0.0
+
+        self._with_state(update)
+
+    def _with_state(self, update: Callable[[Dict], float]) -> float:
+        """在鎖定狀態下讀取、更新並寫回狀態"""
+        with self._lock:
+            if self.state_file is None or not FCNTL_AVAILABLE:
+                return update(self._state)
+
+            with file_lock(str(self.state_file)):
+                state = self._initial_state()
+                try:
+                    with open(self.state_file, 'r', encoding='utf-8') as f:
+                        state.update(json.load(f))
+                except (FileNotFoundError, json.JSONDecodeError):
+                    pass
+
+                result = update(state)
+
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                return result
+
+
+class TokenBucket(SharedRateLimiter):
+    """Token bucket：平均每小時 rate_per_hour 次，最多累積 burst 次"""
+
+    def __init__(self, rate_per_hour: float, burst: int, state_file: Optional[Path] = None):
+        """
+        Args:
+            rate_per_hour: 每小時可用的請求數
+            burst: 最多可累積的 token 數
+            state_file: 共用狀態檔路徑，None 表示只在本行程內限流
+        """
+        self.rate = rate_per_hour / 3600.0
+        self.burst = burst
+        super().__init__(state_file)
+
+    def _initial_state(self) -> Dict:
+        return {'tokens': float(self.burst), 'updated_at': time.time(), 'blocked_until': 0.0}
+
+    def _take(self, state: Dict, now: float, kind: Optional[str]) -> float:
+        elapsed = max(0.0, now - state.get('updated_at', now))
+        state['tokens'] = min(self.burst, state.get('tokens', self.burst) + elapsed * self.rate)
+        state['updated_at'] = now
+
+        if state['tokens'] >= 1:
+            state['tokens'] -= 1
+            return 0.0
+        return (1 - state['tokens']) / self.rate
+
+    def _on_penalize(self, state: Dict) -> None:
+        state['tokens'] = 0.0
+
+
+class SlidingWindow(SharedRateLimiter):
+    """滑動視窗：任何 window_seconds 秒內每一類請求最多 limits[kind] 次"""
+
+    def __init__(self, limits: Dict[str, int], state_file: Optional[Path] = None,
+                 window_seconds: float = 60.0):
+        """
+        Args:
+            limits: {請求類別: 視窗內請求數}
+            state_file: 共用狀態檔路徑，None 表示只在本行程內限流
+            window_seconds: 視窗長度（秒）
+        """
+        self.limits = limits
+        self.window_seconds = window_seconds
+        super().__init__(state_file)
+
+    def _initial_state(self) -> Dict:
+        return {'calls': {kind: [] for kind in self.limits}, 'blocked_until': 0.0}
+
+    def _take(self, state: Dict, now: float, kind: Optional[str]) -> float:
+        calls = [t for t in state['calls'].get(kind, []) if t > now - self.window_seconds]
+        state['calls'][kind] = calls
+        if len(calls) < self.limits[kind]:
+            calls.append(now)
+            return 0.0
+        # 最早的一筆滑出視窗時才有空位
+        return calls[0] + self.window_seconds - now
@@ -0,0 +1,197 @@
+"""
+Yahoo API 錄製 / 重播
+
+- record: 正常呼叫 Yahoo，並把每個原始回應存進 fixture 目錄
+- replay: 不連網，直接從 fixture 目錄回傳回應，可設定延遲與錯誤注入
+
+讓抓取流程與分析器可以在沒有網路的機器上做端到端的效能測試。
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+class FixtureNotFoundError(Exception):
+    """重播時找不到對應 URL 的錄製回應"""
+
+
+class InjectedError(Exception):
+    """
+    重播時刻意注入（或錄製下來）的 HTTP 錯誤
+
+    與 requests.HTTPError 相同帶有 response，排程器依 response.status_code
+    判斷是否為限流（999 / 429）並退避重試。
+    """
+
+    def __init__(self, message: str, response: Optional['RecordedResponse'] = None):
+        super().__init__(message)
+        self.response = response
+
+
+class RecordedResponse:
+    """錄製下來的回應，提供 yfpy 會用到的 requests.Response 介面"""
+
+    def __init__(self, url: str, status_code: int, text: str):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode('utf-8')
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise InjectedError(f"HTTP {self.status_code}: {self.url}", response=self)
+
+
+class FixtureStore:
+    """
+    錄製回應的檔案儲存
+
+    每個 URL 存成一個 JSON 檔（檔名為 URL 的 sha1），另有 meta.json
+    記錄錄製時的聯盟設定，重播時不需要 credentials.json。
+    """
+
+    META_FILE = 'meta.json'
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.root / f"{digest}.json"
+
+    def save(self, url: str, status_code: int, text: str) -> None:
+        """儲存一筆回應"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = {
+            'url': url,
+            'status_code': status_code,
+            'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'body': text
+        }
+        with open(self._path(url), 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+
+    def load(self, url: str) -> RecordedResponse:
+        """讀取一筆回應"""
+        path = self._path(url)
+        if not path.exists():
+            raise FixtureNotFoundError(f"沒有錄製的回應: {url}")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        return RecordedResponse(record['url'], record['status_code'], record['body'])
+
+    def save_meta(self, meta: Dict) -> None:
+        """儲存錄製時的聯盟設定"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / self.META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    def load_meta(self) -> Dict:
+        """讀取錄製時的聯盟設定"""
+        path = self.root / self.META_FILE
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def __len__(self) -> int:
+        if not self.root.exists():
+            return 0
+        return sum(1 for p in self.root.glob('*.json') if p.name != self.META_FILE)
+
+
+class RecordingTransport:
+    """包住 yfpy 的 get_response，回應照常回傳並同時存檔"""
+
+    def __init__(self, get_response: Callable[[str], Any], store: FixtureStore):
+        self._get_response = get_response
+        self.store = store
+        self.recorded = 0
+
+    def __call__(self, url: str) -> Any:
+        response = self._get_response(url)
+        self.store.save(url, response.status_code, response.text)
+        self.recorded += 1
+        return response
+
+
+class ReplayTransport:
+    """
+    從 fixture 目錄回傳回應，取代 yfpy 的 get_response
+
+    Args:
+        store: 錄製回應的儲存
+        latency: 每次請求的固定延遲（秒）
+        jitter: 額外的隨機延遲上限（秒）
+        error_rate: 注入錯誤的機率 (0-1)
+        error_status: 注入錯誤時模擬的 HTTP 狀態碼（999 為 Yahoo 限流）
+        seed: 隨機種子，讓延遲與錯誤可以重現
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None
+    ):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.injected_errors = 0
+        self.bytes_served = 0
+
+    def __call__(self, url: str) -> RecordedResponse:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if fail:
+            raise InjectedError(
+                f"HTTP {self.error_status}: 注入錯誤 {url}",
+                response=RecordedResponse(url, self.error_status, '')
+            )
+
+        response = self.store.load(url)
+        with self._lock:
+            self.bytes_served += len(response.text)
+        return response
+
+    def stats(self) -> Dict:
+        """重播統計"""
+        return {
+            'requests': self.requests,
+            'injected_errors': self.injected_errors,
+            'bytes_served': self.bytes_served
+        }
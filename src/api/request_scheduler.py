@@ -0,0 +1,281 @@
+"""
+Yahoo API 請求排程器
+
+所有 Yahoo Fantasy API 呼叫都經過這裡：
+1. Token bucket 限流（src/api/rate_limit.py），狀態存在檔案中，同一台機器上的多個腳本共用額度
+2. 優先順序通道：即時計分板 > 陣容 > 歷史週次
+3. 相同的請求同時進行時合併為一次呼叫
+4. 記錄排隊深度、限流次數等指標
+"""
+
+import heapq
+import itertools
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .rate_limit import TokenBucket, http_status
+
+
+class Lane(IntEnum):
+    """請求優先順序通道（數字越小越優先）"""
+
+    LIVE = 0        # 即時計分板、當週對戰
+    ROSTER = 1      # 聯盟資訊、排名、陣容、球員
+    HISTORICAL = 2  # 其他週次的對戰
+
+
+class RateLimitError(Exception):
+    """Yahoo 回傳限流錯誤 (HTTP 999 / 429) 且重試後仍失敗"""
+
+
+# Yahoo 限流時回傳的 HTTP 狀態碼
+RATE_LIMIT_STATUS_CODES = {429, 999}
+
+# 拿不到 response 時只比對完整的狀態列與 Yahoo / yfpy 的限流訊息，
+# 不比對訊息中任意位置的數字（球員 key、URL、聯盟 ID 都可能含有 999 / 429）
+_RATE_LIMIT_MESSAGE = re.compile(
+    r'^(?:429|999) [A-Za-z ]*Error\b'
+    r'|Request denied'
+    r'|unavailable due to rate limiting'
+)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """判斷例外是否為 Yahoo 的限流回應"""
+    status = http_status(error)
+    if status is not None:
+        return status in RATE_LIMIT_STATUS_CODES
+    return _RATE_LIMIT_MESSAGE.search(str(error)) is not None
+
+
+@dataclass
+class LaneMetrics:
+    """單一通道的統計"""
+
+    requests: int = 0
+    coalesced: int = 0
+    throttled: int = 0
+    throttle_seconds: float = 0.0
+    rate_limited: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class SchedulerMetrics:
+    """排程器統計"""
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    lanes: Dict[str, LaneMetrics] = field(
+        default_factory=lambda: {lane.name.lower(): LaneMetrics() for lane in Lane}
+    )
+
+    def to_dict(self) -> Dict:
+        """轉換為字典格式"""
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight': self.in_flight,
+            'lanes': {
+                name: {
+                    'requests': m.requests,
+                    'coalesced': m.coalesced,
+                    'throttled': m.throttled,
+                    'throttle_seconds': round(m.throttle_seconds, 2),
+                    'rate_limited': m.rate_limited,
+                    'errors': m.errors,
+                    'last_error': m.last_error
+                }
+                for name, m in self.lanes.items()
+            }
+        }
+
+
+class RequestScheduler:
+    """
+    Yahoo API 請求排程器
+
+    多個執行緒同時送出請求時，依通道優先順序輪流取得 token；
+    相同 key 的請求若已在進行中，直接等待並共用同一份結果。
+    """
+
+    # Yahoo 沒有公開額度，實測約每小時數千次；預設保守一些
+    DEFAULT_RATE_PER_HOUR = 3600
+    DEFAULT_BURST = 30
+
+    # 收到限流回應後的重試次數與等待秒數
+    MAX_RATE_LIMIT_RETRIES = 2
+    RATE_LIMIT_PENALTY_SECONDS = 30.0
+
+    def __init__(
+        self,
+        rate_per_hour: float = DEFAULT_RATE_PER_HOUR,
+        burst: int = DEFAULT_BURST,
+        state_file: Optional[Path] = None
+    ):
+        """
+        初始化排程器
+
+        Args:
+            rate_per_hour: 每小時可用的請求數
+            burst: 最多可累積的 token 數
+            state_file: 跨行程共用的 bucket 狀態檔
+        """
+        self.bucket = TokenBucket(rate_per_hour, burst, state_file)
+        self.metrics = SchedulerMetrics()
+
+        self._cond = threading.Condition()
+        self._waiting = []  # (lane, seq) heap
+        self._seq = itertools.count()
+        self._acquiring = False
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        lane: Lane = Lane.ROSTER,
+        key: Optional[Hashable] = None,
+        **kwargs
+    ) -> Any:
+        """
+        排程並執行一次 API 呼叫
+
+        Args:
+            fn: 實際發出請求的函式
+            lane: 優先順序通道
+            key: 合併用的請求識別，相同 key 同時只會發出一次
+
+        Returns:
+            fn 的回傳值
+        """
+        lane_metrics = self.metrics.lanes[lane.name.lower()]
+
+        with self._cond:
+            lane_metrics.requests += 1
+            if key is not None and key in self._in_flight:
+                lane_metrics.coalesced += 1
+                future = self._in_flight[key]
+                leader = False
+            else:
+                future = Future()
+                if key is not None:
+                    self._in_flight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run(fn, args, kwargs, lane, lane_metrics)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            with self._cond:
+                lane_metrics.errors += 1
+                lane_metrics.last_error = str(e)[:200]
+            raise
+        finally:
+            if key is not None:
+                with self._cond:
+                    self._in_flight.pop(key, None)
+
+    def _run(self, fn, args, kwargs, lane: Lane, lane_metrics: LaneMetrics) -> Any:
+        """等待輪到自己後執行請求，遇到限流回應時退避重試"""
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self._wait_for_turn(lane, lane_metrics)
+
+            with self._cond:
+                self.metrics.in_flight += 1
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                with self._cond:
+                    lane_metrics.rate_limited += 1
+                self.bucket.penalize(self.RATE_LIMIT_PENALTY_SECONDS * (attempt + 1))
+                if attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    raise RateLimitError(f"Yahoo API 限流，重試 {attempt} 次後仍失敗: {e}") from e
+            finally:
+                with self._cond:
+                    self.metrics.in_flight -= 1
+
+    def _wait_for_turn(self, lane: Lane, lane_metrics: LaneMetrics) -> None:
+        """排隊直到自己是最高優先的等待者，再向 bucket 取 token"""
+        ticket = (int(lane), next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            self._update_queue_depth()
+            while self._acquiring or self._waiting[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._acquiring = True
+            self._update_queue_depth()
+
+        waited = 0.0
+        try:
+            waited = self.bucket.acquire()
+        finally:
+            with self._cond:
+                self._acquiring = False
+                if waited > 0:
+                    lane_metrics.throttled += 1
+                    lane_metrics.throttle_seconds += waited
+                self._cond.notify_all()
+
+    def _update_queue_depth(self) -> None:
+        """更新排隊深度（需持有 self._cond）"""
+        self.metrics.queue_depth = len(self._waiting)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+
+    def summary(self) -> str:
+        """產生可列印的統計摘要"""
+        lines = [f"Yahoo API 請求統計 (最大排隊 {self.metrics.max_queue_depth})"]
+        for name, m in self.metrics.lanes.items():
+            if m.requests == 0:
+                continue
+            line = (
+                f"  {name}: {m.requests} 次請求, 合併 {m.coalesced}, "
+                f"限流等待 {m.throttled} 次 ({m.throttle_seconds:.1f}s), 錯誤 {m.errors}"
+            )
+            if m.rate_limited:
+                line += f", Yahoo 限流回應 {m.rate_limited}"
+            lines.append(line)
+            if m.last_error:
+                lines.append(f"    最後錯誤: {m.last_error}")
+        return '\n'.join(lines)
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler(
+    rate_per_hour: float = RequestScheduler.DEFAULT_RATE_PER_HOUR,
+    burst: int = RequestScheduler.DEFAULT_BURST
+) -> RequestScheduler:
+    """
+    取得行程內共用的排程器
+
+    bucket 狀態存在 data/cache/yahoo_rate_limit.json，與其他行程共用。
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            project_root = Path(__file__).parent.parent.parent
+            _default_scheduler = RequestScheduler(
+                rate_per_hour=rate_per_hour,
+                burst=burst,
+                state_file=project_root / "data" / "cache" / "yahoo_rate_limit.json"
+            )
+        return _default_scheduler
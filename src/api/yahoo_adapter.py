@@ -0,0 +1,412 @@
+"""
+Yahoo Fantasy API 原始回應轉換器
+
+直接解析 Yahoo 回傳的 JSON（stat_id -> value），轉換為專案使用的
+球員資料列與欄式統計 (PlayerStatsColumns)，不經過 yfpy 的模型物件，
+也不需要在每個腳本重複 hasattr / bytes.decode 的解析邏輯。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.stats import GAMES_PLAYED_UNKNOWN, PlayerStats, PlayerStatsColumns
+
+
+# Yahoo NBA stat_id -> PlayerStats 欄位
+# stat_id 0 (GP) 只有聯盟把出賽數設為顯示統計時才會出現，見 _infer_games_played
+NBA_STAT_FIELDS = {
+    '0': 'games_played',
+    '3': 'fga',
+    '4': 'fgm',
+    '5': 'fg_pct',
+    '6': 'fta',
+    '7': 'ftm',
+    '8': 'ft_pct',
+    '10': 'three_pm',
+    '12': 'pts',
+    '15': 'reb',
+    '16': 'ast',
+    '17': 'st',
+    '18': 'blk',
+    '19': 'to',
+    '27': 'dd',
+}
+
+# 複合統計 "made/attempted"（例如 FGM/FGA = "45/98"）
+NBA_COMPOSITE_STAT_FIELDS = {
+    '9004003': ('fgm', 'fga'),
+    '9007006': ('ftm', 'fta'),
+}
+
+# 百分比欄位使用 float，其他為 int
+PERCENT_FIELDS = {'fg_pct', 'ft_pct'}
+
+# 不代表實際位置的陣容格
+NON_PLAYING_POSITIONS = {'Util', 'BN', 'IL', 'IR', 'IR+'}
+
+# 用來判斷是否有出賽的統計欄位
+_COUNTING_FIELDS = ('fga', 'fta', 'three_pm', 'pts', 'reb', 'ast', 'st', 'blk', 'to')
+
+# 每位球員統計的預設值
+_EMPTY_STAT_VALUES = {
+    name: 0.0 if name in PERCENT_FIELDS else 0
+    for name in PlayerStatsColumns.column_names()
+}
+
+
+def decode_text(value: Any) -> str:
+    """把 Yahoo 回傳的文字（可能是 bytes）轉成 str"""
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return str(value)
+
+
+def _parse_number(value: Any, as_float: bool) -> Any:
+    """解析統計數值，'-' 或空值視為 0"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0 if as_float else 0
+    if number != number:  # NaN
+        return 0.0 if as_float else 0
+    return number if as_float else int(number)
+
+
+def _infer_games_played(stat_values: Dict[str, Any], has_games_played: bool) -> int:
+    """
+    推斷出賽數
+
+    回應含 stat_id 0 時直接使用；否則有任何非零統計代表有出賽但場次未知
+    (GAMES_PLAYED_UNKNOWN)，整行都是 0 / '-' 才視為沒有出賽。
+    """
+    if has_games_played:
+        return stat_values['games_played']
+    if any(stat_values.get(name) for name in _COUNTING_FIELDS):
+        return GAMES_PLAYED_UNKNOWN
+    return 0
+
+
+def _find_key(node: Any, key: str) -> Any:
+    """在巢狀的 dict / list 中找出第一個指定 key 的值"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key in current:
+                return current[key]
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def _iter_collection(collection: Any, item_key: str):
+    """
+    走訪 Yahoo 的 collection 結構
+
+    Yahoo JSON 的列表以 {"0": {...}, "1": {...}, "count": N} 表示
+    """
+    if isinstance(collection, list):
+        for entry in collection:
+            if isinstance(entry, dict) and item_key in entry:
+                yield entry[item_key]
+        return
+
+    if not isinstance(collection, dict):
+        return
+
+    for index, entry in collection.items():
+        if index == 'count' or not isinstance(entry, dict):
+            continue
+        if item_key in entry:
+            yield entry[item_key]
+
+
+def _flatten_player(player_node: List[Any]) -> Dict[str, Any]:
+    """
+    把 Yahoo 的 player 節點攤平成單一 dict
+
+    player 節點為 [[基本資料片段...], {player_stats}, {selected_position} ...]
+    """
+    info: Dict[str, Any] = {}
+    for part in player_node:
+        if isinstance(part, list):
+            for item in part:
+                if isinstance(item, dict):
+                    info.update(item)
+        elif isinstance(part, dict):
+            info.update(part)
+    return info
+
+
+def _parse_positions(info: Dict[str, Any]) -> List[str]:
+    """解析位置，優先使用 display_position"""
+    display_position = decode_text(info.get('display_position'))
+    if display_position:
+        return [p.strip() for p in display_position.split(',') if p.strip()]
+
+    positions = []
+    for entry in info.get('eligible_positions') or []:
+        position = entry.get('position') if isinstance(entry, dict) else entry
+        position = decode_text(position)
+        if position and position not in NON_PLAYING_POSITIONS:
+            positions.append(position)
+
+    return positions or ['N/A']
+
+
+def parse_player(
+    player_node: List[Any],
+    columns: Optional[PlayerStatsColumns] = None
+) -> Dict[str, Any]:
+    """
+    解析單一球員
+
+    Args:
+        player_node: Yahoo JSON 的 player 節點
+        columns: 若提供，會把球員統計附加到此欄式統計中
+
+    Returns:
+        球員資料列 (player_id, name, positions, status, team)
+    """
+    column_lists = columns.column_lists() if columns is not None else None
+    return _parse_player(player_node, column_lists)
+
+
+def _parse_player(player_node: List[Any], column_lists: Optional[List[tuple]]) -> Dict[str, Any]:
+    """parse_player 的實作，column_lists 由呼叫端預先取好以免每位球員重複查找"""
+    info = _flatten_player(player_node)
+
+    name = info.get('name')
+    if isinstance(name, dict):
+        name = name.get('full')
+    name = decode_text(name) or 'Unknown'
+
+    player_id = info.get('player_id')
+    try:
+        player_id = int(player_id)
+    except (TypeError, ValueError):
+        player_id = decode_text(player_id)
+
+    positions = _parse_positions(info)
+    status = decode_text(info.get('status'))
+    nba_team = decode_text(info.get('editorial_team_abbr'))
+
+    record = {
+        'player_id': player_id,
+        'name': name,
+        'positions': positions,
+        'status': status,
+        'team': nba_team
+    }
+
+    if column_lists is None:
+        return record
+
+    stat_values = _EMPTY_STAT_VALUES.copy()
+    stat_values['player_id'] = str(player_id)
+    stat_values['player_name'] = name
+    stat_values['team'] = nba_team
+    stat_values['position'] = ','.join(positions)
+    stat_values['injury_status'] = status or None
+
+    has_games_played = False
+    player_stats = info.get('player_stats') or {}
+    for entry in player_stats.get('stats') or ():
+        stat = entry.get('stat', entry)
+        stat_id = stat.get('stat_id')
+        if not isinstance(stat_id, str):
+            stat_id = str(stat_id)
+        value = stat.get('value')
+
+        field_name = NBA_STAT_FIELDS.get(stat_id)
+        if field_name is not None:
+            stat_values[field_name] = _parse_number(value, field_name in PERCENT_FIELDS)
+            has_games_played = has_games_played or field_name == 'games_played'
+            continue
+
+        composite = NBA_COMPOSITE_STAT_FIELDS.get(stat_id)
+        if composite is not None and isinstance(value, str) and '/' in value:
+            made, attempted = value.split('/', 1)
+            stat_values[composite[0]] = _parse_number(made, False)
+            stat_values[composite[1]] = _parse_number(attempted, False)
+
+    stat_values['games_played'] = _infer_games_played(stat_values, has_games_played)
+    for column_name, values in column_lists:
+        values.append(stat_values[column_name])
+
+    return record
+
+
+def parse_players_payload(payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], PlayerStatsColumns]:
+    """
+    解析含有 players collection 的 Yahoo 回應
+
+    適用於 league/.../players、team/.../roster/players 等端點
+
+    Args:
+        payload: Yahoo API 回傳的 JSON（format=json）
+
+    Returns:
+        (球員資料列列表, 欄式統計)
+    """
+    columns = PlayerStatsColumns()
+    column_lists = columns.column_lists()
+    players = _find_key(payload, 'players')
+
+    records = [
+        _parse_player(player_node, column_lists)
+        for player_node in _iter_collection(players, 'player')
+    ]
+    return records, columns
+
+
+# ============================================================================
+# Micro-benchmark：原始 JSON 轉換 vs. 走訪 yfpy 物件屬性
+# ============================================================================
+
+def _build_benchmark_payload(num_players: int) -> Dict[str, Any]:
+    """建立模擬的 Yahoo roster 回應"""
+    players = {'count': num_players}
+    for i in range(num_players):
+        players[str(i)] = {
+            'player': [
+                [
+                    {'player_key': f'454.p.{1000 + i}'},
+                    {'player_id': str(1000 + i)},
+                    {'name': {'full': f'Player {i}', 'first': 'Player', 'last': str(i)}},
+                    {'status': 'GTD' if i % 7 == 0 else ''},
+                    {'editorial_team_abbr': 'LAL'},
+                    [],
+                    {'display_position': 'PG,SG'},
+                    {'eligible_positions': [{'position': 'PG'}, {'position': 'SG'}, {'position': 'Util'}]},
+                ],
+                {'selected_position': [{'coverage_type': 'week'}, {'position': 'PG'}]},
+                {'player_stats': {
+                    'coverage_type': 'week',
+                    'stats': [
+                        {'stat': {'stat_id': '9004003', 'value': '45/98'}},
+                        {'stat': {'stat_id': '5', 'value': '.459'}},
+                        {'stat': {'stat_id': '9007006', 'value': '20/24'}},
+                        {'stat': {'stat_id': '8', 'value': '.833'}},
+                        {'stat': {'stat_id': '10', 'value': '12'}},
+                        {'stat': {'stat_id': '12', 'value': '122'}},
+                        {'stat': {'stat_id': '15', 'value': '30'}},
+                        {'stat': {'stat_id': '16', 'value': '25'}},
+                        {'stat': {'stat_id': '17', 'value': '6'}},
+                        {'stat': {'stat_id': '18', 'value': '2'}},
+                        {'stat': {'stat_id': '19', 'value': '9'}},
+                    ]
+                }}
+            ]
+        }
+    return {'fantasy_content': {'team': [[{'team_key': '454.l.1.t.1'}], {'roster': {'0': {'players': players}}}]}}
+
+
+def _build_attribute_objects(payload: Dict[str, Any]) -> List[Any]:
+    """把模擬回應轉成類似 yfpy 模型的屬性物件（不計入計時）"""
+    from types import SimpleNamespace
+
+    objects = []
+    for player_node in _iter_collection(_find_key(payload, 'players'), 'player'):
+        info = _flatten_player(player_node)
+        stats = [
+            SimpleNamespace(stat_id=int(s['stat']['stat_id']), value=s['stat']['value'])
+            for s in info['player_stats']['stats']
+        ]
+        objects.append(SimpleNamespace(
+            player_id=int(info['player_id']),
+            name=SimpleNamespace(full=info['name']['full'].encode('utf-8')),
+            status=info['status'],
+            editorial_team_abbr=info['editorial_team_abbr'].encode('utf-8'),
+            display_position=info['display_position'],
+            eligible_positions=[p['position'] for p in info['eligible_positions']],
+            player_stats=SimpleNamespace(stats=stats)
+        ))
+    return objects
+
+
+def _walk_attributes(players: List[Any]) -> Tuple[List[Dict[str, Any]], List[PlayerStats]]:
+    """目前 fetch 腳本使用的 hasattr 解析方式，再逐筆建立 PlayerStats"""
+    rows = []
+    stats_list = []
+    for player in players:
+        if hasattr(player, 'name'):
+            if hasattr(player.name, 'full'):
+                player_name = player.name.full
+            else:
+                player_name = str(player.name)
+        else:
+            player_name = 'Unknown'
+        if isinstance(player_name, bytes):
+            player_name = player_name.decode('utf-8')
+
+        positions = []
+        if hasattr(player, 'display_position'):
+            display_pos = player.display_position
+            if display_pos and isinstance(display_pos, str):
+                positions = [p.strip() for p in display_pos.split(',')]
+
+        status = ''
+        if hasattr(player, 'status'):
+            status = player.status if player.status else ''
+
+        nba_team = ''
+        if hasattr(player, 'editorial_team_abbr'):
+            nba_team = player.editorial_team_abbr
+            if isinstance(nba_team, bytes):
+                nba_team = nba_team.decode('utf-8')
+
+        stat_values = {}
+        if hasattr(player, 'player_stats') and hasattr(player.player_stats, 'stats'):
+            for stat in player.player_stats.stats:
+                stat_id = str(stat.stat_id)
+                if stat_id in NBA_STAT_FIELDS:
+                    field_name = NBA_STAT_FIELDS[stat_id]
+                    stat_values[field_name] = _parse_number(stat.value, field_name in PERCENT_FIELDS)
+                elif stat_id in NBA_COMPOSITE_STAT_FIELDS and '/' in str(stat.value):
+                    made, attempted = str(stat.value).split('/', 1)
+                    stat_values[NBA_COMPOSITE_STAT_FIELDS[stat_id][0]] = _parse_number(made, False)
+                    stat_values[NBA_COMPOSITE_STAT_FIELDS[stat_id][1]] = _parse_number(attempted, False)
+
+        stat_values['games_played'] = _infer_games_played(stat_values, 'games_played' in stat_values)
+
+        rows.append({
+            'player_id': player.player_id,
+            'name': player_name,
+            'positions': positions,
+            'status': status,
+            'team': nba_team
+        })
+        stats_list.append(PlayerStats(
+            player_id=str(player.player_id),
+            player_name=player_name,
+            team=nba_team,
+            position=','.join(positions),
+            injury_status=status or None,
+            **stat_values
+        ))
+    return rows, stats_list
+
+
+if __name__ == "__main__":
+    import timeit
+
+    num_players = 500
+    repeat = 20
+
+    payload = _build_benchmark_payload(num_players)
+    objects = _build_attribute_objects(payload)
+
+    adapter_time = min(timeit.repeat(lambda: parse_players_payload(payload), number=1, repeat=repeat))
+    walk_time = min(timeit.repeat(lambda: _walk_attributes(objects), number=1, repeat=repeat))
+    build_and_walk_time = min(timeit.repeat(
+        lambda: _walk_attributes(_build_attribute_objects(payload)), number=1, repeat=repeat
+    ))
+
+    print(f"球員數: {num_players}（取 {repeat} 次最佳）")
+    print(f"  原始 JSON → 欄式統計:              {adapter_time * 1000:.2f} ms")
+    print(f"  走訪物件屬性 → PlayerStats:         {walk_time * 1000:.2f} ms")
+    print(f"  建立屬性物件 + 走訪 → PlayerStats:  {build_and_walk_time * 1000:.2f} ms")
+    print("  註: 建立屬性物件只是 yfpy 建模的下限估計，實際 yfpy 解析更慢")
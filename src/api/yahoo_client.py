@@ -7,30 +7,86 @@ Yahoo Fantasy Basketball API 客戶端
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 
 from yfpy.query import YahooFantasySportsQuery
 
+from .replay import FixtureStore, RecordingTransport, ReplayTransport
+from .request_scheduler import Lane, RequestScheduler, get_default_scheduler
+from .yahoo_adapter import parse_players_payload
+from ..models.stats import PlayerStatsColumns
+
 
 class YahooFantasyClient:
     """Yahoo Fantasy Basketball API 客戶端"""
 
-    def __init__(self, credentials_path: Optional[str] = None):
+    # Yahoo Fantasy API 根網址
+    BASE_URL = "https://fantasysports.yahooapis.com/fantasy/v2"
+
+    # Yahoo players collection 每次請求最多回傳 25 名球員
+    MAX_PLAYERS_PAGE_SIZE = 25
+
+    # 連線模式：live 直接呼叫、record 呼叫並錄製、replay 從錄製檔重播
+    MODES = ('live', 'record', 'replay')
+
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        mode: Optional[str] = None,
+        fixture_dir: Optional[str] = None,
+        replay_options: Optional[Dict] = None
+    ):
         """
         初始化 Yahoo Fantasy API 客戶端
 
         Args:
             credentials_path: 認證檔案路徑，預設為 config/credentials.json
+            scheduler: 請求排程器，預設使用行程內共用的排程器
+                （額度可在 credentials.json 的 rate_limit 區塊設定）
+            mode: live / record / replay，預設讀取環境變數 YAHOO_CLIENT_MODE
+            fixture_dir: 錄製檔目錄，預設讀取環境變數 YAHOO_FIXTURE_DIR
+                或 data/fixtures/yahoo
+            replay_options: 傳給 ReplayTransport 的參數（latency、jitter、error_rate 等）
         """
+        project_root = Path(__file__).parent.parent.parent
+
+        self.mode = mode or os.environ.get('YAHOO_CLIENT_MODE', 'live')
+        if self.mode not in self.MODES:
+            raise ValueError(f"未知的連線模式: {self.mode}（可用: {', '.join(self.MODES)}）")
+
+        if fixture_dir is None:
+            fixture_dir = os.environ.get('YAHOO_FIXTURE_DIR', project_root / "data" / "fixtures" / "yahoo")
+        self.fixtures = FixtureStore(fixture_dir)
+
         if credentials_path is None:
-            project_root = Path(__file__).parent.parent.parent
             credentials_path = project_root / "config" / "credentials.json"
 
         self.credentials_path = Path(credentials_path)
-        self.credentials = self._load_credentials()
+        if self.mode == 'replay' and not self.credentials_path.exists():
+            # 重播不需要 Yahoo 認證，聯盟設定取自錄製時的 meta.json
+            self.credentials = {'league': self.fixtures.load_meta()}
+        else:
+            self.credentials = self._load_credentials()
+
+        if scheduler is None and self.mode == 'replay':
+            # 重播不受 Yahoo 額度限制，使用獨立且不限流的排程器
+            scheduler = RequestScheduler(rate_per_hour=1e12, burst=10 ** 6)
+        elif scheduler is None:
+            rate_limit = self.credentials.get('rate_limit', {})
+            scheduler = get_default_scheduler(
+                rate_per_hour=rate_limit.get('requests_per_hour', RequestScheduler.DEFAULT_RATE_PER_HOUR),
+                burst=rate_limit.get('burst', RequestScheduler.DEFAULT_BURST)
+            )
+        self.scheduler = scheduler
+
+        # 當週週次，用來判斷對戰請求屬於即時或歷史通道
+        self.current_week: Optional[int] = None
+        self._cached_league_key: Optional[str] = None
 
         # 初始化 Yahoo Fantasy Query 物件
         self.yahoo_query = self._init_yahoo_query()
+        self.transport = self._install_transport(replay_options or {})
 
     def _load_credentials(self) -> Dict:
         """載入認證資訊"""
@@ -50,17 +106,85 @@ class YahooFantasyClient:
         yahoo_config = self.credentials.get('yahoo', {})
         league_config = self.credentials.get('league', {})
 
-        # 建立 yfpy 查詢物件
+        # 建立 yfpy 查詢物件（重播時以 offline 建立，跳過 OAuth 認證）
         yahoo_query = YahooFantasySportsQuery(
             auth_dir=str(project_root / "config"),
             league_id=league_config.get('league_id'),
             game_code=league_config.get('game_code', 'nba'),
+            offline=self.mode == 'replay',
             consumer_key=yahoo_config.get('client_id'),
             consumer_secret=yahoo_config.get('client_secret')
         )
 
         return yahoo_query
 
+    def _install_transport(self, replay_options: Dict) -> Optional[Any]:
+        """
+        依連線模式替換 yfpy 的 get_response
+
+        yfpy 所有查詢最後都經過 get_response(url)，替換它即可錄製或重播
+        所有請求，上層的 yfpy 解析與排程器行為完全不變。
+
+        Returns:
+            RecordingTransport / ReplayTransport，live 模式為 None
+        """
+        if self.mode == 'record':
+            transport = RecordingTransport(self.yahoo_query.get_response, self.fixtures)
+            league_config = self.credentials.get('league', {})
+            self.fixtures.save_meta({
+                'league_id': league_config.get('league_id'),
+                'game_code': league_config.get('game_code', 'nba'),
+                'season': league_config.get('season')
+            })
+        elif self.mode == 'replay':
+            transport = ReplayTransport(self.fixtures, **replay_options)
+            # offline 只用來跳過認證；查詢本身要照常送到被替換的 get_response
+            self.yahoo_query.offline = False
+        else:
+            return None
+
+        self.yahoo_query.get_response = transport
+        return transport
+
+    def _request(self, lane: Lane, method: str, *args, **kwargs) -> Any:
+        """
+        透過排程器呼叫 yfpy 查詢方法
+
+        Args:
+            lane: 優先順序通道
+            method: YahooFantasySportsQuery 的方法名稱
+            *args, **kwargs: 方法參數（同時作為合併請求的 key）
+        """
+        return self.scheduler.submit(
+            getattr(self.yahoo_query, method), *args,
+            lane=lane, key=(method,) + args + tuple(sorted(kwargs.items())),
+            **kwargs
+        )
+
+    def scheduled_query(self, lane: Lane = Lane.ROSTER) -> 'ScheduledQuery':
+        """
+        取得經過排程器的 yfpy 查詢物件
+
+        用法與 YahooFantasySportsQuery 相同，讓直接呼叫 yfpy 的腳本
+        也能共用限流額度與請求合併。
+
+        Args:
+            lane: 所有呼叫使用的優先順序通道
+        """
+        return ScheduledQuery(self, lane)
+
+    def _league_key(self) -> str:
+        """聯盟 key（首次查詢後快取）"""
+        if self._cached_league_key is None:
+            self._cached_league_key = self._request(Lane.ROSTER, 'get_league_key')
+        return self._cached_league_key
+
+    def _week_lane(self, week: Optional[int]) -> Lane:
+        """當週（或未指定週次）走即時通道，其他週次走歷史通道"""
+        if week is None or self.current_week is None or int(week) == int(self.current_week):
+            return Lane.LIVE
+        return Lane.HISTORICAL
+
     def get_league_info(self) -> Any:
         """
         獲取聯盟基本資訊
@@ -68,7 +192,11 @@ class YahooFantasyClient:
         Returns:
             聯盟資訊物件
         """
-        return self.yahoo_query.get_league_info()
+        league = self._request(Lane.ROSTER, 'get_league_info')
+        current_week = getattr(league, 'current_week', None)
+        if current_week:
+            self.current_week = int(current_week)
+        return league
 
     def get_league_standings(self) -> Any:
         """
@@ -77,7 +205,7 @@ class YahooFantasyClient:
         Returns:
             排名資訊
         """
-        return self.yahoo_query.get_league_standings()
+        return self._request(Lane.ROSTER, 'get_league_standings')
 
     def get_league_teams(self) -> List[Any]:
         """
@@ -86,7 +214,7 @@ class YahooFantasyClient:
         Returns:
             隊伍列表
         """
-        return self.yahoo_query.get_league_teams()
+        return self._request(Lane.ROSTER, 'get_league_teams')
 
     def get_team_roster(self, team_id: Optional[str] = None) -> List[Any]:
         """
@@ -99,10 +227,49 @@ class YahooFantasyClient:
             球員列表
         """
         if team_id:
-            return self.yahoo_query.get_team_roster_by_week(team_id)
+            return self._request(Lane.ROSTER, 'get_team_roster_by_week', team_id)
         else:
             # 獲取當前用戶的隊伍
-            return self.yahoo_query.get_current_user_roster()
+            return self._request(Lane.ROSTER, 'get_current_user_roster')
+
+    def get_team_roster_with_stats(
+        self,
+        team_id: str,
+        week: Optional[int] = None
+    ) -> Tuple[List[Dict], PlayerStatsColumns]:
+        """
+        獲取隊伍陣容與球員統計，直接解析原始回應（不建立 yfpy 物件）
+
+        Args:
+            team_id: 隊伍 ID
+            week: 週次，若不指定則為當前週與賽季統計
+
+        Returns:
+            (球員資料列列表, 欄式統計)
+        """
+        team_key = f"{self._league_key()}.t.{team_id}"
+        if week:
+            path = f"team/{team_key}/roster;week={week}/players/stats;type=week;week={week}"
+        else:
+            path = f"team/{team_key}/roster/players/stats"
+        return parse_players_payload(self.get_raw(path, lane=Lane.ROSTER))
+
+    def get_raw(self, path: str, lane: Lane = Lane.ROSTER) -> Dict:
+        """
+        直接請求 Yahoo Fantasy API 並回傳原始 JSON
+
+        Args:
+            path: BASE_URL 之後的資源路徑（例如 league/{league_key}/players）
+            lane: 優先順序通道
+
+        Returns:
+            Yahoo 回傳的 JSON
+        """
+        url = f"{self.BASE_URL}/{path}"
+        return self.scheduler.submit(
+            lambda: self.yahoo_query.get_response(url).json(),
+            lane=lane, key=('get_raw', url)
+        )
 
     def get_player_stats(self, player_key: str, stat_type: str = 'season') -> Any:
         """
@@ -115,12 +282,119 @@ class YahooFantasyClient:
         Returns:
             球員統計數據
         """
-        return self.yahoo_query.get_player_stats_for_season(player_key)
+        return self._request(Lane.ROSTER, 'get_player_stats_for_season', player_key)
+
+    def iter_players(
+        self,
+        status: str = 'A',
+        position: Optional[str] = None,
+        page_size: int = MAX_PLAYERS_PAGE_SIZE
+    ) -> Iterator[List[Any]]:
+        """
+        分頁逐批獲取球員（generator）
+
+        每抓完並解析一頁就立即 yield，呼叫端可以在找到足夠的球員後
+        直接停止迭代，剩下的頁面不會被請求，記憶體用量也只跟單頁大小有關。
+
+        Args:
+            status: 球員狀態 ('A' = All, 'FA' = Free Agent, 'W' = Waivers, 'T' = Taken)
+            position: 位置篩選 (PG, SG, G, SF, PF, F, C, Util)
+            page_size: 每頁球員數，上限為 25（Yahoo API 限制）
+
+        Yields:
+            每一頁的球員列表
+        """
+        page_size = max(1, min(page_size, self.MAX_PLAYERS_PAGE_SIZE))
+        start = 0
+
+        while True:
+            page = self._get_players_page(status, position, start, page_size)
+            if not page:
+                return
+
+            yield page
+
+            # 不足一頁代表已經是最後一頁
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    def iter_player_stats(
+        self,
+        status: str = 'A',
+        position: Optional[str] = None,
+        page_size: int = MAX_PLAYERS_PAGE_SIZE
+    ) -> Iterator[Tuple[List[Dict], PlayerStatsColumns]]:
+        """
+        分頁逐批獲取球員與賽季統計，直接解析原始回應
+
+        與 iter_players() 相同的分頁方式，但不建立 yfpy 物件，
+        每頁回傳球員資料列與欄式統計。
+
+        Args:
+            status: 球員狀態 ('A' = All, 'FA' = Free Agent, 'W' = Waivers, 'T' = Taken)
+            position: 位置篩選
+            page_size: 每頁球員數，上限為 25
+
+        Yields:
+            (球員資料列列表, 欄式統計)
+        """
+        page_size = max(1, min(page_size, self.MAX_PLAYERS_PAGE_SIZE))
+        start = 0
+
+        while True:
+            path = self._players_page_path(status, position, start, page_size) + "/stats"
+            records, columns = parse_players_payload(self.get_raw(path))
+            if not records:
+                return
+
+            yield records, columns
+
+            if len(records) < page_size:
+                return
+            start += page_size
+
+    def _players_page_path(
+        self,
+        status: str,
+        position: Optional[str],
+        start: int,
+        count: int
+    ) -> str:
+        """單頁球員的 API 路徑"""
+        filters = f";status={status}"
+        if position:
+            filters += f";position={position}"
+        filters += f";start={start};count={count}"
+        return f"league/{self._league_key()}/players{filters}"
+
+    def _get_players_page(
+        self,
+        status: str,
+        position: Optional[str],
+        start: int,
+        count: int
+    ) -> List[Any]:
+        """獲取單頁球員"""
+        url = f"{self.BASE_URL}/{self._players_page_path(status, position, start, count)}"
+        page = self.scheduler.submit(
+            self.yahoo_query.query, url, ["league", "players"],
+            lane=Lane.ROSTER, key=('query', url)
+        )
+
+        if not page:
+            return []
+        # 只有一名球員時 yfpy 會直接回傳物件而不是列表
+        if not isinstance(page, list):
+            page = [page]
+        return page
 
     def get_all_players(self, status: str = 'A', position: Optional[str] = None) -> List[Any]:
         """
         獲取所有可用球員
 
+        需要全部球員時才使用；只要前幾名的話請改用 iter_players() 提前停止。
+
         Args:
             status: 球員狀態 ('A' = All, 'FA' = Free Agent, 'W' = Waivers, 'T' = Taken)
             position: 位置篩選 (PG, SG, G, SF, PF, F, C, Util)
@@ -128,11 +402,10 @@ class YahooFantasyClient:
         Returns:
             球員列表
         """
-        return self.yahoo_query.get_league_players(
-            player_count=None,  # 獲取所有球員
-            status=status,
-            position=position
-        )
+        players = []
+        for page in self.iter_players(status=status, position=position):
+            players.extend(page)
+        return players
 
     def get_free_agents(self, position: Optional[str] = None) -> List[Any]:
         """
@@ -146,6 +419,23 @@ class YahooFantasyClient:
         """
         return self.get_all_players(status='FA', position=position)
 
+    def iter_free_agents(
+        self,
+        position: Optional[str] = None,
+        page_size: int = MAX_PLAYERS_PAGE_SIZE
+    ) -> Iterator[List[Any]]:
+        """
+        分頁逐批獲取自由球員
+
+        Args:
+            position: 位置篩選
+            page_size: 每頁球員數
+
+        Yields:
+            每一頁的自由球員列表
+        """
+        return self.iter_players(status='FA', position=position, page_size=page_size)
+
     def get_matchup(self, team_id: str, week: Optional[int] = None) -> Any:
         """
         獲取對戰資訊
@@ -158,9 +448,9 @@ class YahooFantasyClient:
             對戰資訊
         """
         if week:
-            return self.yahoo_query.get_team_matchup(team_id, week)
+            return self._request(self._week_lane(week), 'get_team_matchup', team_id, week)
         else:
-            return self.yahoo_query.get_team_matchup(team_id)
+            return self._request(Lane.LIVE, 'get_team_matchup', team_id)
 
     def get_league_scoreboard(self, week: Optional[int] = None) -> Any:
         """
@@ -172,7 +462,52 @@ class YahooFantasyClient:
         Returns:
             計分板資訊
         """
-        return self.yahoo_query.get_league_scoreboard_by_week(week)
+        return self._request(self._week_lane(week), 'get_league_scoreboard_by_week', week)
+
+    def get_league_matchups_by_week(self, week: int) -> List[Any]:
+        """
+        獲取指定週次的所有對戰
+
+        Args:
+            week: 週次
+
+        Returns:
+            對戰列表
+        """
+        return self._request(self._week_lane(week), 'get_league_matchups_by_week', week)
+
+    def get_player_stats_by_week(self, player_key: str, week: Optional[int] = None) -> Any:
+        """
+        獲取球員單週統計數據
+
+        Args:
+            player_key: 球員 key 或 ID
+            week: 週次，若不指定則為當週
+
+        Returns:
+            球員統計數據
+        """
+        # yfpy 以 "current" 表示當週
+        chosen_week = week if week is not None else 'current'
+        return self._request(self._week_lane(week), 'get_player_stats_by_week', player_key, chosen_week)
+
+
+class ScheduledQuery:
+    """YahooFantasySportsQuery 的代理，每個查詢方法都透過排程器呼叫"""
+
+    def __init__(self, client: YahooFantasyClient, lane: Lane):
+        self._client = client
+        self._lane = lane
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client.yahoo_query, name)
+        if not callable(attr) or not name.startswith('get_'):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._client._request(self._lane, name, *args, **kwargs)
+
+        return call
 
 
 if __name__ == "__main__":
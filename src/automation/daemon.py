@@ -0,0 +1,409 @@
+"""
+常駐同步排程
+
+取代 cron + shell 腳本每小時冷啟動 Python 的做法。行程常駐，保留：
+- Yahoo 客戶端（OAuth session、限流狀態、斷路器）
+- 最新的聯盟數據與 LeagueSnapshot 查詢索引
+- CategoryScorer 的聯盟平均值 / 標準差（每次陣容更新後重算，寫入狀態檔的 baselines）
+
+依 config/daemon_config.json 的頻率執行：
+- scoreboard: 比賽時段內每幾分鐘更新本週計分板（data/live_scoreboard.json）
+- rosters: 每小時更新戰績與陣容，之後執行下游流程（產生器、Sheets、部署）
+- schedules: 每天更新所有週次的對戰與賽程，之後執行下游流程
+
+每個工作都有 jitter；同一工作不會重疊（max_instances=1、錯過的合併為一次），
+抓取 Yahoo 的工作彼此互斥，前一個還在執行時直接略過，下一輪再補上。
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..analysis.category_scorer import CategoryScorer
+from ..api.circuit_breaker import CircuitBreaker
+from ..storage import LeagueSnapshot, LeagueStore
+from ..storage.artifacts import write_json_artifact
+from ..storage.stats_dataset import PYARROW_AVAILABLE, PlayerStatsDataset
+from .league_ingester import LeagueIngester
+from .pipeline import Pipeline, Stage
+
+try:
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+    APSCHEDULER_AVAILABLE = True
+except ImportError:
+    APSCHEDULER_AVAILABLE = False
+
+DEFAULT_CONFIG_FILE = 'config/daemon_config.json'
+DEFAULT_STATUS_FILE = 'data/cache/daemon_status.json'
+DEFAULT_PIPELINE_REPORT = 'data/cache/daemon_pipeline_report.json'
+LIVE_SCOREBOARD_FILE = 'data/live_scoreboard.json'
+LEAGUE_JSON_FILE = 'data/full_league_data.json'
+
+SUCCESS = 'success'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+# 沒有設定檔時的預設頻率
+DEFAULT_CONFIG: Dict[str, Any] = {
+    'credentials_file': 'config/credentials.json',
+    'timezone': 'Asia/Taipei',
+    'misfire_grace_seconds': 300,
+    'pipeline': {'enabled': True, 'max_workers': 4},
+    'jobs': {
+        'scoreboard': {'enabled': True, 'trigger': 'cron', 'minute': '*/5', 'hour': '7-14', 'jitter': 30},
+        'rosters': {'enabled': True, 'trigger': 'interval', 'minutes': 60, 'jitter': 120, 'run_pipeline': True},
+        'schedules': {'enabled': True, 'trigger': 'cron', 'hour': 6, 'minute': 15, 'jitter': 300,
+                      'run_pipeline': True}
+    }
+}
+
+
+def load_config(path: str = DEFAULT_CONFIG_FILE) -> Dict:
+    """
+    讀取排程設定（缺少的欄位使用 DEFAULT_CONFIG）
+
+    Args:
+        path: 設定檔路徑，不存在時全部使用預設值
+    """
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            user_config = json.load(f)
+    except FileNotFoundError:
+        return config
+
+    for key, value in user_config.items():
+        if key == 'jobs':
+            for job, options in value.items():
+                config['jobs'].setdefault(job, {}).update(options)
+        elif isinstance(value, dict) and isinstance(config.get(key), dict):
+            config[key].update(value)
+        else:
+            config[key] = value
+    return config
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _log(message: str) -> None:
+    print(f"[{_now()}] {message}", flush=True)
+
+
+def _attr(obj: Any, *names: str) -> Any:
+    """依序取巢狀屬性，任一層不存在時回傳 None"""
+    for name in names:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+class SyncDaemon:
+    """常駐同步排程"""
+
+    JOBS = ('scoreboard', 'rosters', 'schedules')
+
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        analysis_stages: Optional[List[Stage]] = None,
+        client_factory: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Args:
+            config: load_config() 的結果，None 使用預設值
+            analysis_stages: 抓取後執行的下游階段（run_all_sync.build_stages(include_fetch=False)）
+            client_factory: 以憑證路徑建立 Yahoo 客戶端的函式，預設 YahooFantasyClient
+        """
+        self.config = config or load_config()
+        self.client_factory = client_factory
+        self.client = None
+        self.season = '2025'
+        self.breaker = CircuitBreaker()
+
+        self.league_data: Optional[Dict] = None
+        self.snapshot: Optional[LeagueSnapshot] = None
+        self.live_scoreboard: Optional[Dict] = None
+        self.scorer = CategoryScorer()
+        self.baselines_updated_at: Optional[str] = None
+
+        self.pipeline = None
+        pipeline_config = self.config.get('pipeline', {})
+        if analysis_stages and pipeline_config.get('enabled', True):
+            self.pipeline = Pipeline(
+                analysis_stages,
+                report_file=DEFAULT_PIPELINE_REPORT,
+                max_workers=pipeline_config.get('max_workers', 4)
+            )
+
+        self.status: Dict[str, Dict] = {}
+        self._yahoo_lock = threading.Lock()
+        self._pipeline_lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self.scheduler = None
+
+    # ------------------------------------------------------------------
+    # 暖機
+    # ------------------------------------------------------------------
+
+    def warm_up(self) -> None:
+        """建立 Yahoo 客戶端並載入最新的聯盟數據"""
+        if self.client is None:
+            if self.client_factory is None:
+                from ..api import YahooFantasyClient
+                self.client_factory = YahooFantasyClient
+            self.client = self.client_factory(self.config['credentials_file'])
+            self.season = self.client.credentials.get('league', {}).get('season', self.season)
+            _log(f"✅ Yahoo 客戶端已連接（模式: {self.client.mode}）")
+
+        if self.league_data is None:
+            with LeagueStore.open(json_path=LEAGUE_JSON_FILE) as store:
+                self.league_data = store.to_league_data()
+            if self.league_data:
+                self.snapshot = LeagueSnapshot(self.league_data)
+                self.client.current_week = self.league_data.get('current_week')
+                _log(f"✅ 已載入聯盟數據（{self.league_data.get('last_updated')}）")
+
+    def _ingester(self) -> LeagueIngester:
+        return LeagueIngester(
+            self.client, season=self.season, verbose=False,
+            previous=self.league_data, breaker=self.breaker
+        )
+
+    def _commit(self, league_data: Dict) -> bool:
+        """
+        寫入資料庫、匯出 JSON，並更新記憶體中的數據
+
+        Returns:
+            聯盟內容是否有變更（不含更新時間）
+        """
+        with LeagueStore.open(json_path=LEAGUE_JSON_FILE) as store:
+            before = store.content_hash()
+            store.save_league_data(league_data)
+            store.export_json(LEAGUE_JSON_FILE)
+            changed = store.content_hash() != before
+
+        self.league_data = league_data
+        self.snapshot = LeagueSnapshot(league_data)
+        return changed
+
+    # ------------------------------------------------------------------
+    # 工作
+    # ------------------------------------------------------------------
+
+    def job_scoreboard(self) -> str:
+        """更新本週計分板（data/live_scoreboard.json）"""
+        week = (self.league_data or {}).get('current_week')
+        scoreboard = self.breaker.call(self.client.get_league_scoreboard, week)
+
+        matchups = []
+        for matchup in _attr(scoreboard, 'matchups') or []:
+            teams = _attr(matchup, 'teams') or []
+            if len(teams) < 2:
+                continue
+            entry = {'status': _attr(matchup, 'status'), 'winner_team_key': _attr(matchup, 'winner_team_key')}
+            for i, team in enumerate(teams[:2], 1):
+                entry[f'team{i}_id'] = _attr(team, 'team_id')
+                entry[f'team{i}_name'] = self._team_name(_attr(team, 'team_id'), _attr(team, 'name'))
+                entry[f'team{i}_points'] = _attr(team, 'team_points', 'total')
+                entry[f'team{i}_projected'] = _attr(team, 'team_projected_points', 'total')
+            matchups.append(entry)
+
+        self.live_scoreboard = {'week': week, 'updated_at': _now(), 'matchups': matchups}
+        write_json_artifact(LIVE_SCOREBOARD_FILE, self.live_scoreboard)
+        return f"Week {week}: {len(matchups)} 場對戰"
+
+    def _team_name(self, team_id: Any, raw_name: Any) -> Optional[str]:
+        """優先使用快照中的隊名（已處理編碼）"""
+        team = self.snapshot.team(team_id) if self.snapshot and team_id is not None else None
+        if team:
+            return team['team_name']
+        if isinstance(raw_name, bytes):
+            return raw_name.decode('utf-8', errors='replace')
+        return raw_name
+
+    def job_rosters(self) -> str:
+        """更新聯盟資訊、戰績與陣容，並重算評分基準"""
+        ingester = self._ingester()
+        league_data = ingester.refresh_rosters()
+        changed = self._commit(league_data)
+
+        stats, team_ids = ingester.collected_stats()
+        if len(stats) > 0:
+            if PYARROW_AVAILABLE:
+                PlayerStatsDataset().write(
+                    stats, league_data['season'], league_data['current_week'], fantasy_team_ids=team_ids
+                )
+            try:
+                self.scorer.calculate_league_averages_columnar(stats)
+                self.baselines_updated_at = _now()
+            except Exception as e:
+                # 例如賽季初還沒有球員出賽；不影響陣容更新，沿用上次的基準
+                _log(f"⚠️  評分基準未更新，沿用上次的基準: {type(e).__name__}: {e}")
+
+        players = sum(len(roster) for roster in league_data['rosters'].values())
+        fallbacks = f"，沿用 {len(ingester.fallbacks)} 項舊資料" if ingester.fallbacks else ''
+        return f"{len(league_data['teams'])} 隊 / {players} 名球員{'（有變更）' if changed else ''}{fallbacks}"
+
+    def job_schedules(self) -> str:
+        """更新所有週次的對戰與賽程"""
+        ingester = self._ingester()
+        league_data = ingester.refresh_schedules()
+        changed = self._commit(league_data)
+
+        games = sum(len(m) for m in league_data['matchups_by_week'].values())
+        fallbacks = f"，沿用 {len(ingester.fallbacks)} 項舊資料" if ingester.fallbacks else ''
+        return f"{len(league_data['matchups_by_week'])} 週 / {games} 場對戰{'（有變更）' if changed else ''}{fallbacks}"
+
+    def run_pipeline(self) -> None:
+        """執行下游流程（產生器、Sheets、部署），輸入未變更的階段會自動略過"""
+        if self.pipeline is None:
+            return
+        if not self._pipeline_lock.acquire(blocking=False):
+            _log("⏭️ 下游流程仍在執行，本次略過")
+            return
+        try:
+            results = self.pipeline.run()
+            summary: Dict[str, int] = {}
+            for result in results.values():
+                summary[result.status] = summary.get(result.status, 0) + 1
+            _log(f"下游流程完成: {summary}（{self.pipeline.last_report['duration']:.1f} 秒）")
+        finally:
+            self._pipeline_lock.release()
+
+    def run_job(self, name: str) -> str:
+        """
+        執行單一工作（抓取 Yahoo 的工作彼此互斥，前一個還在執行時略過）
+
+        Returns:
+            SUCCESS / FAILED / SKIPPED
+        """
+        options = self.config['jobs'].get(name, {})
+        if not self._yahoo_lock.acquire(blocking=False):
+            _log(f"⏭️ {name}: 另一個抓取工作執行中，本次略過")
+            self._record(name, SKIPPED, 0.0, '另一個抓取工作執行中')
+            return SKIPPED
+
+        started = time.perf_counter()
+        try:
+            self.warm_up()
+            message = getattr(self, f'job_{name}')()
+            status, detail = SUCCESS, message
+            _log(f"✅ {name}: {message}")
+        except Exception as e:
+            status, detail = FAILED, str(e)[:200]
+            _log(f"⚠️ {name} 失敗: {detail}")
+        finally:
+            self._yahoo_lock.release()
+        self._record(name, status, time.perf_counter() - started, detail)
+
+        if status == SUCCESS and options.get('run_pipeline'):
+            self.run_pipeline()
+        return status
+
+    def baselines(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """目前的評分基準 {類別: {'mean', 'std'}}，尚未計算時為空"""
+        def clean(value: float) -> Optional[float]:
+            return round(value, 4) if value == value else None  # NaN -> null
+
+        return {
+            cat: {'mean': clean(stats['mean']), 'std': clean(stats['std'])}
+            for cat, stats in self.scorer.league_stats.items()
+        }
+
+    def _record(self, name: str, status: str, duration: float, detail: str) -> None:
+        with self._status_lock:
+            self.status[name] = {
+                'status': status,
+                'finished_at': _now(),
+                'duration': round(duration, 2),
+                'detail': detail
+            }
+            write_json_artifact(DEFAULT_STATUS_FILE, {
+                'updated_at': _now(),
+                'league_last_updated': (self.league_data or {}).get('last_updated'),
+                'baselines_updated_at': self.baselines_updated_at,
+                'baselines': self.baselines(),
+                'breaker': self.breaker.state,
+                'jobs': self.status
+            }, compact=False, manifest=False)
+
+    # ------------------------------------------------------------------
+    # 排程
+    # ------------------------------------------------------------------
+
+    def _trigger(self, options: Dict) -> Any:
+        timezone = self.config.get('timezone')
+        jitter = options.get('jitter')
+        if options.get('trigger', 'interval') == 'cron':
+            fields = {
+                key: options[key]
+                for key in ('year', 'month', 'day', 'week', 'day_of_week', 'hour', 'minute', 'second')
+                if key in options
+            }
+            return CronTrigger(timezone=timezone, jitter=jitter, **fields)
+        fields = {key: options[key] for key in ('weeks', 'days', 'hours', 'minutes', 'seconds') if key in options}
+        return IntervalTrigger(timezone=timezone, jitter=jitter, **fields)
+
+    def build_scheduler(self) -> 'BlockingScheduler':
+        """
+        依設定建立排程器
+
+        Raises:
+            ImportError: 未安裝 apscheduler
+        """
+        if not APSCHEDULER_AVAILABLE:
+            raise ImportError("apscheduler 未安裝，無法啟動常駐排程\n執行: pip install apscheduler")
+
+        scheduler = BlockingScheduler(timezone=self.config.get('timezone'))
+        for name, options in self.config['jobs'].items():
+            if name not in self.JOBS:
+                _log(f"⚠️ 未知的工作 {name}，略過")
+                continue
+            if not options.get('enabled', True):
+                continue
+            scheduler.add_job(
+                self.run_job, self._trigger(options), args=[name], id=name, name=name,
+                max_instances=1, coalesce=True,
+                misfire_grace_time=self.config.get('misfire_grace_seconds')
+            )
+        self.scheduler = scheduler
+        return scheduler
+
+    def start(self, run_now: bool = True) -> None:
+        """
+        啟動排程（阻塞直到收到中斷）
+
+        Args:
+            run_now: 啟動時先執行一次陣容與賽程更新，不必等第一個排程時間
+        """
+        scheduler = self.build_scheduler()
+        self.warm_up()
+
+        if run_now:
+            for name in ('schedules', 'rosters'):
+                if self.config['jobs'].get(name, {}).get('enabled', True):
+                    self.run_job(name)
+
+        for job in scheduler.get_jobs():
+            _log(f"排程: {job.name} - {job.trigger}")
+        _log("常駐排程已啟動（Ctrl-C 結束）")
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.cancel()
+            _log("常駐排程已停止")
+
+    def stop(self) -> None:
+        """停止排程（由訊號處理呼叫）"""
+        if self.scheduler is not None and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
@@ -0,0 +1,472 @@
+"""
+聯盟完整數據抓取
+
+從 Yahoo API 抓取聯盟資訊、排名、所有週次對戰與各隊陣容，
+組成 data/full_league_data.json 的格式。
+get_full_league_data.py 與 benchmark_pipeline.py 共用這份流程。
+
+單一資源抓取失敗（或斷路器開啟）時沿用上一次成功的快照，
+並在輸出的 freshness 區塊記錄每個資源實際的更新時間。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ..api.yahoo_adapter import decode_text
+from ..models.stats import PlayerStatsColumns
+from ..storage.artifacts import write_json_artifact
+
+# 沒有上一次快照可沿用時的標記
+_NO_FALLBACK = object()
+
+
+class LeagueIngester:
+    """聯盟完整數據抓取流程"""
+
+    # Yahoo Fantasy 通常是 22 週
+    DEFAULT_NUM_WEEKS = 22
+
+    # fetch_league 回傳的欄位，聯盟資訊抓取失敗時從上次快照取回
+    LEAGUE_INFO_KEYS = ('league_name', 'league_id', 'num_teams', 'current_week', 'total_weeks')
+
+    def __init__(
+        self,
+        client,
+        season: str = '2025',
+        verbose: bool = True,
+        previous: Optional[Dict] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        初始化抓取流程
+
+        Args:
+            client: YahooFantasyClient
+            season: 賽季（寫入輸出檔）
+            verbose: 是否列印進度
+            previous: 上一次成功的聯盟數據，抓取失敗時沿用
+            breaker: 斷路器，預設連續失敗 3 次後開啟
+        """
+        self.client = client
+        self.season = season
+        self.verbose = verbose
+        self.previous = previous or {}
+        self.breaker = breaker or CircuitBreaker()
+
+        # 每個資源的實際更新時間；沿用舊資料時保留舊時間
+        self.freshness: Dict[str, Any] = {'league': None, 'teams': None, 'matchups': {}, 'rosters': {}}
+        # 沿用舊資料的資源（'matchups/week_3'、'rosters/5' 等）
+        self.fallbacks: List[str] = []
+        # 本次成功抓取的陣容球員統計 {team_id: PlayerStatsColumns}
+        self.roster_stats: Dict[str, PlayerStatsColumns] = {}
+
+    def _log(self, message: str = '', end: str = '\n') -> None:
+        if self.verbose:
+            print(message, end=end)
+
+    @staticmethod
+    def load_previous(path: str) -> Optional[Dict]:
+        """
+        讀取上一次的聯盟數據
+
+        Returns:
+            聯盟數據，檔案不存在或損壞時為 None
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _previous_timestamp(self, section: str, key: Optional[str] = None) -> Optional[str]:
+        """上一次快照中某資源的更新時間（舊格式沒有 freshness 時用 last_updated）"""
+        fresh = self.previous.get('freshness', {}).get(section)
+        if key is not None:
+            fresh = (fresh or {}).get(key)
+        return fresh or self.previous.get('last_updated')
+
+    def _fetch(
+        self,
+        section: str,
+        key: Optional[str],
+        fetch: Callable[[], Any],
+        fallback: Any = _NO_FALLBACK
+    ) -> Tuple[Any, bool]:
+        """
+        透過斷路器抓取單一資源，失敗時改用上一次快照的值
+
+        Args:
+            section: freshness 區塊名稱（league / teams / matchups / rosters）
+            key: 區塊內的 key（週次或隊伍 ID），league / teams 為 None
+            fetch: 實際抓取的函式
+            fallback: 上一次快照中的值（None 表示沒有舊資料，以空列表代替）；
+                _NO_FALLBACK 表示此資源無法沿用，失敗時直接拋出
+
+        Returns:
+            (值, 是否為本次抓取的新資料)
+        """
+        try:
+            value = self.breaker.call(fetch)
+            fresh = True
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        except Exception as e:
+            if fallback is _NO_FALLBACK:
+                raise
+            fresh = False
+            reason = "斷路器開啟" if isinstance(e, CircuitOpenError) else f"無法獲取: {e}"
+            if fallback is None:
+                value, timestamp = [], None
+                self._log(f"⚠️ {reason}")
+            else:
+                value, timestamp = fallback, self._previous_timestamp(section, key)
+                self.fallbacks.append(section if key is None else f"{section}/{key}")
+                self._log(f"⚠️ {reason}，沿用 {timestamp} 的資料")
+
+        if key is None:
+            self.freshness[section] = timestamp
+        else:
+            self.freshness[section][key] = timestamp
+        return value, fresh
+
+    def fetch_league(self) -> Dict:
+        """
+        獲取聯盟基本資訊
+
+        Returns:
+            {'league_name', 'league_id', 'num_teams', 'current_week', 'total_weeks'}
+        """
+        league = self.client.get_league_info()
+        info = {
+            'league_name': decode_text(league.name),
+            'league_id': league.league_id,
+            'num_teams': league.num_teams,
+            'current_week': league.current_week,
+            'total_weeks': getattr(league, 'end_week', self.DEFAULT_NUM_WEEKS)
+        }
+
+        self._log(f"聯盟名稱: {info['league_name']}")
+        self._log(f"聯盟 ID: {info['league_id']}")
+        self._log(f"隊伍數: {info['num_teams']}")
+        self._log(f"當前週次: Week {info['current_week']}")
+        self._log(f"總週數: Week {info['total_weeks']}")
+        return info
+
+    def fetch_teams(self) -> List[Dict]:
+        """
+        獲取所有隊伍（使用 standings 以獲得戰績）
+
+        Returns:
+            隊伍列表
+        """
+        standings = self.client.get_league_standings()
+        teams = standings.teams if hasattr(standings, 'teams') else []
+
+        teams_data = []
+        for i, team in enumerate(teams, 1):
+            team_name = decode_text(team.name)
+
+            # 獲取經理名稱
+            manager_name = 'Unknown'
+            if hasattr(team, 'managers') and team.managers:
+                try:
+                    first_manager = team.managers[0]
+                    if hasattr(first_manager, 'nickname'):
+                        manager_name = decode_text(first_manager.nickname)
+                except (IndexError, TypeError, AttributeError):
+                    pass
+
+            # 獲取戰績（從 team_standings）
+            wins = 0
+            losses = 0
+            ties = 0
+            rank = i
+
+            if hasattr(team, 'team_standings'):
+                standings_obj = team.team_standings
+
+                if hasattr(standings_obj, 'rank'):
+                    rank = int(standings_obj.rank) if standings_obj.rank else i
+
+                if hasattr(standings_obj, 'outcome_totals'):
+                    outcome = standings_obj.outcome_totals
+                    wins = int(outcome.wins) if hasattr(outcome, 'wins') and outcome.wins else 0
+                    losses = int(outcome.losses) if hasattr(outcome, 'losses') and outcome.losses else 0
+                    ties = int(outcome.ties) if hasattr(outcome, 'ties') and outcome.ties else 0
+
+            teams_data.append({
+                'rank': rank,
+                'team_id': team.team_id,
+                'team_name': team_name,
+                'manager': manager_name,
+                'wins': wins,
+                'losses': losses,
+                'ties': ties
+            })
+            self._log(f"  {rank}. {team_name} (ID: {team.team_id}) - {wins}勝-{losses}敗-{ties}和")
+
+        return teams_data
+
+    def fetch_week_matchups(self, week: int) -> List[Dict]:
+        """
+        獲取單一週次的對戰
+
+        Args:
+            week: 週次
+
+        Returns:
+            對戰列表
+        """
+        matchups = self.client.get_league_matchups_by_week(week)
+
+        week_matchups = []
+        for matchup in matchups:
+            if hasattr(matchup, 'teams'):
+                teams_in_matchup = matchup.teams
+                if len(teams_in_matchup) >= 2:
+                    team1 = teams_in_matchup[0]
+                    team2 = teams_in_matchup[1]
+
+                    week_matchups.append({
+                        'team1_id': team1.team_id,
+                        'team1_name': decode_text(team1.name),
+                        'team2_id': team2.team_id,
+                        'team2_name': decode_text(team2.name)
+                    })
+
+        return week_matchups
+
+    def fetch_matchups(self, num_weeks: int) -> Dict[str, List[Dict]]:
+        """
+        獲取所有週次的對戰，失敗的週次以空列表表示
+
+        Args:
+            num_weeks: 總週數
+
+        Returns:
+            {'week_N': [...]}
+        """
+        previous_matchups = self.previous.get('matchups_by_week', {})
+        all_matchups = {}
+
+        for week in range(1, num_weeks + 1):
+            week_key = f'week_{week}'
+            self._log(f"  獲取 Week {week}...", end=" ")
+            all_matchups[week_key], fresh = self._fetch(
+                'matchups', week_key,
+                lambda week=week: self.fetch_week_matchups(week),
+                fallback=previous_matchups.get(week_key)
+            )
+            if fresh:
+                self._log(f"✅ {len(all_matchups[week_key])} 場")
+
+        return all_matchups
+
+    @staticmethod
+    def build_team_schedules(teams_data: List[Dict], all_matchups: Dict[str, List[Dict]]) -> Dict:
+        """
+        建立對戰矩陣（每支隊伍的對手）
+
+        Args:
+            teams_data: 隊伍列表
+            all_matchups: 所有週次的對戰
+
+        Returns:
+            {team_id: {week_num: {'opponent_id', 'opponent_name'}}}
+        """
+        team_schedule = {}
+        for team in teams_data:
+            team_schedule[team['team_id']] = {}
+
+        for week, matchups in all_matchups.items():
+            week_num = int(week.split('_')[1])
+            for matchup in matchups:
+                team1_id = matchup['team1_id']
+                team2_id = matchup['team2_id']
+
+                team_schedule[team1_id][week_num] = {
+                    'opponent_id': team2_id,
+                    'opponent_name': matchup['team2_name']
+                }
+                team_schedule[team2_id][week_num] = {
+                    'opponent_id': team1_id,
+                    'opponent_name': matchup['team1_name']
+                }
+
+        return team_schedule
+
+    def fetch_rosters(self, teams_data: List[Dict], week: Optional[int]) -> Dict[str, List[Dict]]:
+        """
+        獲取所有隊伍的球員陣容，失敗的隊伍以空列表表示
+
+        Args:
+            teams_data: 隊伍列表
+            week: 數據週次
+
+        Returns:
+            {team_id_str: [球員]}
+        """
+        previous_rosters = self.previous.get('rosters', {})
+        all_rosters = {}
+        for team in teams_data:
+            team_id = str(team['team_id'])
+            self._log(f"  獲取 {team['team_name']}...", end=" ")
+            all_rosters[team_id], fresh = self._fetch(
+                'rosters', team_id,
+                lambda team_id=team['team_id']: self._fetch_roster(team_id, week),
+                fallback=previous_rosters.get(team_id)
+            )
+            if fresh:
+                self._log(f"✅ {len(all_rosters[team_id])} 名球員")
+
+        return all_rosters
+
+    def _fetch_roster(self, team_id: Any, week: Optional[int]) -> List[Dict]:
+        """抓取單隊陣容，球員統計另存在 roster_stats"""
+        players_data, stats = self.client.get_team_roster_with_stats(team_id, week)
+        self.roster_stats[str(team_id)] = stats
+        return players_data
+
+    def collected_stats(self) -> Tuple[PlayerStatsColumns, List[str]]:
+        """
+        合併本次抓到的所有球員統計
+
+        Returns:
+            (欄式統計, 每名球員所屬的聯盟隊伍 ID)
+        """
+        stats = PlayerStatsColumns()
+        team_ids: List[str] = []
+        for team_id, columns in self.roster_stats.items():
+            stats.extend(columns)
+            team_ids.extend([team_id] * len(columns))
+        return stats, team_ids
+
+    def _league_info(self) -> Dict:
+        """聯盟資訊（失敗時沿用上次快照）"""
+        previous_league = None
+        if 'league_name' in self.previous:
+            previous_league = {key: self.previous.get(key) for key in self.LEAGUE_INFO_KEYS}
+        league_info, _ = self._fetch(
+            'league', None, self.fetch_league,
+            fallback=previous_league if previous_league else _NO_FALLBACK
+        )
+        return league_info
+
+    def _teams(self) -> List[Dict]:
+        """隊伍與戰績（失敗時沿用上次快照）"""
+        teams_data, _ = self._fetch(
+            'teams', None, self.fetch_teams,
+            fallback=self.previous['teams'] if self.previous.get('teams') else _NO_FALLBACK
+        )
+        return teams_data
+
+    def _result(self, league_info: Dict, teams_data: List[Dict], **sections: Any) -> Dict:
+        """
+        組成 full_league_data.json 格式；沒有重新抓取的區塊沿用上次快照
+
+        Args:
+            league_info: 聯盟資訊
+            teams_data: 隊伍列表
+            **sections: 本次抓取的 matchups_by_week / team_schedules / rosters
+        """
+        previous_freshness = self.previous.get('freshness') or {}
+        freshness = {
+            'league': self.freshness['league'],
+            'teams': self.freshness['teams'],
+            'matchups': dict(
+                self.freshness['matchups'] if 'matchups_by_week' in sections
+                else previous_freshness.get('matchups', {})
+            ),
+            'rosters': dict(
+                self.freshness['rosters'] if 'rosters' in sections
+                else previous_freshness.get('rosters', {})
+            )
+        }
+
+        return {
+            **league_info,
+            'season': self.season,
+            'teams': teams_data,
+            'matchups_by_week': sections.get('matchups_by_week', self.previous.get('matchups_by_week', {})),
+            'team_schedules': sections.get('team_schedules', self.previous.get('team_schedules', {})),
+            'rosters': sections.get('rosters', self.previous.get('rosters', {})),
+            'freshness': freshness,
+            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def run(self) -> Dict:
+        """
+        執行完整抓取流程
+
+        Returns:
+            full_league_data.json 格式的聯盟數據
+        """
+        self._log("步驟 2: 獲取聯盟資訊...")
+        league_info = self._league_info()
+        self._log()
+
+        self._log("步驟 3: 獲取所有隊伍資訊...")
+        teams_data = self._teams()
+        self._log()
+
+        num_weeks = league_info['total_weeks']
+        self._log(f"步驟 4: 獲取所有週次對戰（Week 1 - {num_weeks}）...")
+        all_matchups = self.fetch_matchups(num_weeks)
+        self._log()
+
+        self._log("步驟 5: 建立對戰矩陣...")
+        team_schedule = self.build_team_schedules(teams_data, all_matchups)
+        self._log(f"✅ 已建立 {len(teams_data)} 支隊伍的完整賽程")
+        self._log()
+
+        self._log("步驟 6: 獲取所有隊伍的球員陣容...")
+        all_rosters = self.fetch_rosters(teams_data, league_info['current_week'])
+        self._log()
+
+        self._log_fallbacks()
+        return self._result(
+            league_info, teams_data,
+            matchups_by_week=all_matchups, team_schedules=team_schedule, rosters=all_rosters
+        )
+
+    def refresh_rosters(self) -> Dict:
+        """
+        只更新聯盟資訊、戰績與陣容（對戰與賽程沿用上次快照）
+
+        Returns:
+            full_league_data.json 格式的聯盟數據
+        """
+        league_info = self._league_info()
+        teams_data = self._teams()
+        all_rosters = self.fetch_rosters(teams_data, league_info['current_week'])
+        self._log_fallbacks()
+        return self._result(league_info, teams_data, rosters=all_rosters)
+
+    def refresh_schedules(self) -> Dict:
+        """
+        只更新聯盟資訊、戰績與所有週次對戰 / 賽程（陣容沿用上次快照）
+
+        Returns:
+            full_league_data.json 格式的聯盟數據
+        """
+        league_info = self._league_info()
+        teams_data = self._teams()
+        all_matchups = self.fetch_matchups(league_info['total_weeks'])
+        team_schedule = self.build_team_schedules(teams_data, all_matchups)
+        self._log_fallbacks()
+        return self._result(league_info, teams_data, matchups_by_week=all_matchups, team_schedules=team_schedule)
+
+    def _log_fallbacks(self) -> None:
+        if self.fallbacks:
+            self._log(f"⚠️ {len(self.fallbacks)} 項資源沿用上次資料: {', '.join(self.fallbacks)}")
+            self._log()
+
+    @staticmethod
+    def save(league_data: Dict, output_file: str) -> None:
+        """儲存聯盟數據（原子寫入並更新 manifest）"""
+        write_json_artifact(output_file, league_data)
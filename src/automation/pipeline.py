@@ -0,0 +1,412 @@
+"""
+同步流程 DAG
+
+每個階段宣告依賴的階段與輸入 / 輸出：
+1. 依賴一完成就開始執行（不等同一層的其他階段），互不依賴的階段
+   （例如兩個產生器、四個 Sheets 同步）在 max_workers 個執行緒內並行，
+   整體耗時約等於最長的一條依賴鏈
+2. 輸入內容的 hash 與上次成功時相同、且輸出都在時略過（不重跑也不重寫 Sheets）
+3. 每個階段各自的逾時；逾時時終止整個子行程群組（含 shell 啟動的 python）
+4. 上游失敗時，下游（含間接依賴）立即標記為 blocked，不會啟動；
+   中斷（Ctrl-C / SIGTERM）時終止執行中的子行程，尚未開始的標記為 cancelled
+5. 每次執行寫出報告（各階段狀態、耗時與最長依賴鏈）
+
+輸入可以是檔案路徑（以 sha256 比對），也可以是回傳字串的函式
+（例如聯盟數據排除 last_updated 後的 hash）。
+"""
+
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from ..storage.artifacts import file_sha256, write_json_artifact
+
+DEFAULT_STATE_FILE = 'data/cache/pipeline_state.json'
+DEFAULT_REPORT_FILE = 'data/cache/pipeline_report.json'
+
+# 預設的階段逾時（秒）與並行數
+COMMAND_TIMEOUT = 300
+DEFAULT_MAX_WORKERS = 4
+
+# 逾時或中斷時，送出 SIGTERM 後等待子行程結束的秒數（之後改送 SIGKILL）
+TERMINATE_GRACE = 5
+
+SUCCESS = 'success'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+BLOCKED = 'blocked'
+CANCELLED = 'cancelled'
+
+Input = Union[str, Callable[[], str]]
+
+
+class PipelineError(Exception):
+    """DAG 定義錯誤（重複名稱、未知依賴、循環）"""
+
+
+@dataclass
+class Stage:
+    """同步流程中的一個階段"""
+
+    name: str
+    description: str
+    # shell 命令，或不帶參數的函式（回傳 False 或拋出例外表示失敗）
+    command: Union[str, Callable[[], Optional[bool]]]
+    depends_on: List[str] = field(default_factory=list)
+    inputs: List[Input] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    # 每次都執行（例如抓取 Yahoo 數據）
+    always_run: bool = False
+    # 逾時秒數，None 使用 Pipeline 的預設值（只對 shell 命令有效）
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StageResult:
+    """單一階段的執行結果"""
+
+    name: str
+    status: str
+    duration: float = 0.0
+    started_at: Optional[str] = None
+    reason: str = ''
+    # 成功時的輸入 hash（由排程執行緒寫入狀態檔）
+    fingerprint: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'duration': round(self.duration, 2),
+            'started_at': self.started_at,
+            'reason': self.reason
+        }
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _log(message: str) -> None:
+    print(f"[{_now()}] {message}", flush=True)
+
+
+class Pipeline:
+    """依 DAG 執行同步流程"""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        state_file: str = DEFAULT_STATE_FILE,
+        report_file: str = DEFAULT_REPORT_FILE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        default_timeout: float = COMMAND_TIMEOUT
+    ):
+        """
+        Args:
+            stages: 所有階段
+            state_file: 記錄各階段上次成功時輸入 hash 的檔案
+            report_file: 執行報告輸出路徑
+            max_workers: 同時執行的階段數上限
+            default_timeout: 階段沒有指定 timeout 時的逾時秒數
+
+        Raises:
+            PipelineError: 名稱重複、依賴不存在或有循環
+        """
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise PipelineError(f"階段名稱重複: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise PipelineError(f"{stage.name} 依賴不存在的階段: {dep}")
+
+        self.waves = self._waves()
+        self.order = [name for wave in self.waves for name in wave]
+        self.state_file = Path(state_file)
+        self.report_file = Path(report_file)
+        self.max_workers = max(1, int(max_workers))
+        self.default_timeout = default_timeout
+
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._processes_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def _waves(self) -> List[List[str]]:
+        """依依賴關係分層，同一層的階段互不依賴"""
+        remaining = dict(self.stages)
+        done: set = set()
+        waves = []
+        while remaining:
+            wave = [name for name, stage in remaining.items() if all(d in done for d in stage.depends_on)]
+            if not wave:
+                raise PipelineError(f"階段依賴有循環: {', '.join(remaining)}")
+            waves.append(wave)
+            done.update(wave)
+            for name in wave:
+                del remaining[name]
+        return waves
+
+    # ------------------------------------------------------------------
+    # 輸入 hash
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def fingerprint(stage: Stage) -> str:
+        """階段輸入的 hash（命令本身也算在內，命令改變時會重跑）"""
+        hasher = hashlib.sha256()
+        hasher.update(str(stage.command if isinstance(stage.command, str) else stage.name).encode('utf-8'))
+        for item in stage.inputs:
+            if callable(item):
+                value = f"fn:{item()}"
+            else:
+                path = Path(item)
+                value = f"{item}:{file_sha256(path) if path.exists() else 'missing'}"
+            hasher.update(b'\0' + value.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _is_unchanged(self, stage: Stage, fingerprint: str, state: Dict) -> bool:
+        if stage.always_run or not stage.inputs:
+            return False
+        if any(not Path(output).exists() for output in stage.outputs):
+            return False
+        return state.get(stage.name, {}).get('fingerprint') == fingerprint
+
+    # ------------------------------------------------------------------
+    # 執行
+    # ------------------------------------------------------------------
+
+    def _execute(self, stage: Stage) -> Optional[str]:
+        """執行階段，成功回傳 None，失敗回傳原因"""
+        if not isinstance(stage.command, str):
+            try:
+                ok = stage.command()
+            except Exception as e:
+                return str(e)[:200]
+            return '回傳失敗' if ok is False else None
+
+        timeout = stage.timeout if stage.timeout is not None else self.default_timeout
+        try:
+            # 獨立的行程群組：逾時或中斷時連同 shell 啟動的子行程一起終止
+            process = subprocess.Popen(
+                stage.command,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                start_new_session=True
+            )
+        except Exception as e:
+            return str(e)[:200]
+
+        with self._processes_lock:
+            self._processes[stage.name] = process
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._terminate(process)
+            process.communicate()
+            return f"超時 ({timeout:g} 秒)"
+        finally:
+            with self._processes_lock:
+                self._processes.pop(stage.name, None)
+
+        if self._cancelled.is_set():
+            return '已中斷'
+        if process.returncode != 0:
+            return (stderr or stdout).strip()[-200:] or f"結束代碼 {process.returncode}"
+        return None
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen) -> None:
+        """
+        終止子行程群組（先 SIGTERM，寬限後 SIGKILL）
+
+        只送訊號並 wait，輸出由執行該階段的執行緒的 communicate 讀取。
+        """
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                process.wait(timeout=TERMINATE_GRACE)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+    def cancel(self) -> None:
+        """中斷執行：終止執行中的子行程，尚未開始的階段不再啟動"""
+        self._cancelled.set()
+        with self._processes_lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            self._terminate(process)
+
+    def _run_stage(self, stage: Stage, state: Dict, force: bool) -> StageResult:
+        if self._cancelled.is_set():
+            # 已排入佇列但中斷前還沒開始
+            return StageResult(stage.name, CANCELLED, reason='流程中斷，未執行')
+
+        started = time.perf_counter()
+        result = StageResult(stage.name, SUCCESS, started_at=_now())
+
+        try:
+            fingerprint = self.fingerprint(stage)
+        except Exception as e:
+            fingerprint = None
+            _log(f"⚠️ {stage.description} 無法計算輸入 hash，照常執行: {str(e)[:200]}")
+
+        if not force and fingerprint and self._is_unchanged(stage, fingerprint, state):
+            result.status = SKIPPED
+            result.reason = '輸入未變更'
+            _log(f"⏭️ {stage.description} 輸入未變更，略過")
+            return result
+
+        _log(f"{stage.description}...")
+        error = self._execute(stage)
+        result.duration = time.perf_counter() - started
+
+        if error is None:
+            _log(f"✅ {stage.description} 成功 ({result.duration:.1f} 秒)")
+            result.fingerprint = fingerprint
+        elif self._cancelled.is_set():
+            result.status = CANCELLED
+            result.reason = error
+            _log(f"🛑 {stage.description} 已中斷")
+        else:
+            result.status = FAILED
+            result.reason = error
+            _log(f"⚠️ {stage.description} 失敗: {error}")
+        return result
+
+    def _block_dependents(self, pending: set, results: Dict[str, StageResult]) -> None:
+        """上游失敗 / 被擋下的階段，連同間接依賴一起標記為 blocked（依拓撲順序一次處理完）"""
+        for name in self.order:
+            if name not in pending:
+                continue
+            failed = [
+                d for d in self.stages[name].depends_on
+                if d in results and results[d].status in (FAILED, BLOCKED, CANCELLED)
+            ]
+            if failed:
+                pending.discard(name)
+                results[name] = StageResult(name, BLOCKED, reason=f"上游失敗: {', '.join(failed)}")
+                _log(f"⛔ {self.stages[name].description} 取消（上游失敗: {', '.join(failed)}）")
+
+    def _critical_path(self, results: Dict[str, StageResult]) -> Dict:
+        """實際耗時最長的依賴鏈"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self.order:
+            deps = self.stages[name].depends_on
+            before = max(deps, key=lambda d: finish[d], default=None)
+            previous[name] = before
+            finish[name] = (finish[before] if before else 0.0) + results[name].duration
+
+        end = max(self.order, key=lambda n: finish[n], default=None)
+        chain = []
+        while end is not None:
+            chain.append(end)
+            end = previous[end]
+        return {
+            'stages': chain[::-1],
+            'duration': round(finish[chain[0]], 2) if chain else 0.0
+        }
+
+    def run(self, force: bool = False) -> Dict[str, StageResult]:
+        """
+        執行整個流程
+
+        Args:
+            force: 忽略輸入 hash，全部重跑
+
+        Returns:
+            {階段名稱: StageResult}
+        """
+        state = self._load_state()
+        results: Dict[str, StageResult] = {}
+        pending = set(self.order)
+        running: Dict = {}
+        started_at = _now()
+        started = time.perf_counter()
+        self._cancelled.clear()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while pending or running:
+                if not self._cancelled.is_set():
+                    self._block_dependents(pending, results)
+                    for name in self.order:
+                        stage = self.stages[name]
+                        if name in pending and all(d in results for d in stage.depends_on):
+                            pending.discard(name)
+                            running[executor.submit(self._run_stage, stage, state, force)] = name
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[running.pop(future)] = result
+                    if result.fingerprint:
+                        state[result.name] = {'fingerprint': result.fingerprint, 'succeeded_at': _now()}
+                        write_json_artifact(self.state_file, state, compact=False, manifest=False)
+        except KeyboardInterrupt:
+            _log("🛑 收到中斷，終止執行中的階段...")
+            self.cancel()
+            for future, name in running.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = StageResult(name, CANCELLED, reason=str(e)[:200])
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            for name in self.order:
+                if name not in results:
+                    results[name] = StageResult(name, CANCELLED, reason='流程中斷，未執行')
+            self._write_report(results, started_at, started)
+
+        return results
+
+    def _write_report(self, results: Dict[str, StageResult], started_at: str, started: float) -> None:
+        self.last_report = {
+            'started_at': started_at,
+            'finished_at': _now(),
+            'duration': round(time.perf_counter() - started, 2),
+            'max_workers': self.max_workers,
+            'critical_path': self._critical_path(results),
+            'stages': [results[name].to_dict() for name in self.order]
+        }
+        write_json_artifact(self.report_file, self.last_report, compact=False, manifest=False)
+
+    def print_report(self) -> None:
+        """印出各階段狀態與耗時"""
+        icons = {SUCCESS: '✅', FAILED: '⚠️', SKIPPED: '⏭️', BLOCKED: '⛔', CANCELLED: '🛑'}
+        print(f"{'階段':<28} {'狀態':<8} {'耗時':>8}")
+        print("-" * 48)
+        for stage in self.last_report['stages']:
+            print(f"{stage['name']:<28} {icons[stage['status']]} {stage['status']:<9} {stage['duration']:>7.1f}s")
+        print("-" * 48)
+        critical = self.last_report['critical_path']
+        print(f"總耗時: {self.last_report['duration']:.1f} 秒（並行數 {self.last_report['max_workers']}）")
+        print(f"最長依賴鏈: {' → '.join(critical['stages'])} ({critical['duration']:.1f} 秒)")
@@ -2,6 +2,8 @@
 第三方整合模組
 """
 
-from .google_sheets_sync import GoogleSheetsSync
+from .google_sheets_sync import GoogleSheetsSync, SheetsBatchWriter
+from .sheets_engine import SheetsEngine
+from .xlsx_export import XlsxExporter
 
-__all__ = ['GoogleSheetsSync']
+__all__ = ['GoogleSheetsSync', 'SheetsBatchWriter', 'SheetsEngine', 'XlsxExporter']
@@ -0,0 +1,785 @@
+"""
+本機 Google Sheets / Drive API 替身
+
+在行程內模擬 Sheets v4 與 Drive v3 的 HTTP 介面，讓 GoogleSheetsSync、SheetsEngine
+與 sync_*.py 不需要 Google 帳號就能做整合測試與效能測試：
+
+- 工作表模型：格線大小、儲存格數值與格式、下拉選單、欄寬、隱藏、條件式格式
+- batchUpdate 語意：整批套用，任一請求失敗時整批不生效（與真的 API 相同）；
+  超出格線的寫入回傳 400
+- 額度模擬：每分鐘讀取 / 寫入次數超過上限時回傳 429
+- 可設定延遲與錯誤注入（與 src/api/replay.py 相同的參數）
+- 統計每個端點的請求數與傳送 / 接收的位元組數
+
+用法（有安裝 gspread 時直接以 session 替換 HTTP 連線）：
+    service = FakeSheetsService()
+    service.create_spreadsheet('聯盟', spreadsheet_id='abc')
+    client = service.connect()              # gspread.Client 或相同介面的 FakeClient
+    spreadsheet = client.open_by_key('abc')
+
+限制：公式不會計算，讀回的是公式本身；只實作本專案用到的 batchUpdate 請求類型。
+"""
+
+import copy
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from .google_sheets_sync import GSPREAD_AVAILABLE, a1_to_grid_range
+
+if GSPREAD_AVAILABLE:
+    import gspread
+
+
+SHEETS_URL = 'https://sheets.googleapis.com/v4/spreadsheets'
+DRIVE_URL = 'https://www.googleapis.com/drive/v3/files'
+
+DEFAULT_ROWS = 1000
+DEFAULT_COLS = 26
+
+_SPREADSHEET_PATH = re.compile(r'^/([^/:]+)(?::(batchUpdate))?$')
+_VALUES_PATH = re.compile(r'^/([^/]+)/values(?::(batchGet|batchUpdate|batchClear)|/(.+?)(?::(clear|append))?)$')
+
+
+class FakeAPIError(Exception):
+    """FakeClient 收到非 2xx 回應（介面與 gspread.exceptions.APIError 相同，帶有 response）"""
+
+    def __init__(self, response: 'FakeResponse'):
+        self.response = response
+        error = response.json().get('error', {})
+        self.code = error.get('code', response.status_code)
+        super().__init__(f"APIError [{self.code}]: {error.get('message', '')}")
+
+
+class RequestError(Exception):
+    """處理請求時發現的錯誤，轉成對應的 HTTP 錯誤回應"""
+
+    STATUS = {400: 'INVALID_ARGUMENT', 404: 'NOT_FOUND', 429: 'RESOURCE_EXHAUSTED', 503: 'UNAVAILABLE'}
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class FakeResponse:
+    """提供 gspread 會用到的 requests.Response 介面"""
+
+    def __init__(self, url: str, status_code: int, body: Any, headers: Optional[Dict] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.headers = headers or {'Content-Type': 'application/json; charset=UTF-8'}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise FakeAPIError(self)
+
+
+# ============================================================================
+# 工作表模型
+# ============================================================================
+
+class FakeWorksheet:
+    """一張工作表：屬性、儲存格 {(列, 欄): CellData}、欄寬、條件式格式"""
+
+    def __init__(self, properties: Dict):
+        grid = properties.setdefault('gridProperties', {})
+        grid.setdefault('rowCount', DEFAULT_ROWS)
+        grid.setdefault('columnCount', DEFAULT_COLS)
+        properties.setdefault('hidden', False)
+        self.properties = properties
+        self.cells: Dict[Tuple[int, int], Dict] = {}
+        self.column_widths: Dict[int, int] = {}
+        self.conditional_formats: List[Dict] = []
+
+    @property
+    def id(self) -> int:
+        return self.properties['sheetId']
+
+    @property
+    def title(self) -> str:
+        return self.properties['title']
+
+    @property
+    def row_count(self) -> int:
+        return self.properties['gridProperties']['rowCount']
+
+    @property
+    def col_count(self) -> int:
+        return self.properties['gridProperties']['columnCount']
+
+    def bounds(self, grid: Dict) -> Tuple[int, int, int, int]:
+        """
+        GridRange 轉 (起始列, 起始欄, 結束列, 結束欄)，省略的邊界延伸到格線邊緣
+
+        Raises:
+            RequestError: 超出格線
+        """
+        start_row = grid.get('startRowIndex', 0)
+        start_col = grid.get('startColumnIndex', 0)
+        end_row = grid.get('endRowIndex', self.row_count)
+        end_col = grid.get('endColumnIndex', self.col_count)
+        if end_row > self.row_count or end_col > self.col_count or start_row < 0 or start_col < 0:
+            raise RequestError(400, (
+                f"Range ('{self.title}'!R{start_row + 1}C{start_col + 1}:R{end_row}C{end_col}) "
+                f"exceeds grid limits. Max rows: {self.row_count}, max columns: {self.col_count}"
+            ))
+        return start_row, start_col, end_row, end_col
+
+    def resize(self):
+        """格線縮小時丟掉格線外的儲存格"""
+        for key in [key for key in self.cells if key[0] >= self.row_count or key[1] >= self.col_count]:
+            del self.cells[key]
+
+    def value(self, row: int, col: int) -> Any:
+        """儲存格的 Python 值（公式回傳公式本身）"""
+        extended = self.cells.get((row, col), {}).get('userEnteredValue', {})
+        for key in ('formulaValue', 'stringValue', 'numberValue', 'boolValue'):
+            if key in extended:
+                return extended[key]
+        return None
+
+    def values(self) -> List[List[Any]]:
+        """所有數值（去掉尾端的空白列與空白欄，與 values.get 相同）"""
+        filled = [key for key, cell in self.cells.items() if 'userEnteredValue' in cell]
+        if not filled:
+            return []
+        rows = max(row for row, _ in filled) + 1
+        result = []
+        for row in range(rows):
+            line = [self.value(row, col) for col in range(self.col_count)]
+            while line and line[-1] is None:
+                line.pop()
+            result.append(['' if value is None else value for value in line])
+        return result
+
+    def metadata(self) -> Dict:
+        sheet = {'properties': copy.deepcopy(self.properties)}
+        if self.conditional_formats:
+            sheet['conditionalFormats'] = copy.deepcopy(self.conditional_formats)
+        return sheet
+
+
+class FakeSpreadsheet:
+    """一個 Spreadsheet 的所有工作表"""
+
+    def __init__(self, spreadsheet_id: str, title: str):
+        self.id = spreadsheet_id
+        self.title = title
+        self.sheets: List[FakeWorksheet] = [
+            FakeWorksheet({'sheetId': 0, 'title': '工作表1', 'index': 0})
+        ]
+
+    def by_id(self, sheet_id: int) -> FakeWorksheet:
+        for sheet in self.sheets:
+            if sheet.id == sheet_id:
+                return sheet
+        raise RequestError(400, f"No grid with id: {sheet_id}")
+
+    def by_title(self, title: str) -> FakeWorksheet:
+        for sheet in self.sheets:
+            if sheet.title == title:
+                return sheet
+        raise RequestError(400, f"Unable to parse range: '{title}'")
+
+    def metadata(self) -> Dict:
+        return {
+            'spreadsheetId': self.id,
+            'properties': {'title': self.title, 'locale': 'zh_TW', 'timeZone': 'Asia/Taipei'},
+            'sheets': [sheet.metadata() for sheet in self.sheets],
+            'spreadsheetUrl': f'https://docs.google.com/spreadsheets/d/{self.id}/edit'
+        }
+
+
+# ============================================================================
+# 欄位遮罩（fields）
+# ============================================================================
+
+def _split_fields(fields: str) -> List[str]:
+    """以最外層逗號切開 fields（括號內的逗號不切）"""
+    parts, depth, current = [], 0, ''
+    for char in fields:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _apply_mask(target: Dict, source: Dict, fields: str):
+    """依 fields 把 source 的欄位寫進 target；遮罩內但 source 沒有的欄位視為清除"""
+    for field in _split_fields(fields):
+        if field == '*':
+            target.clear()
+            target.update(copy.deepcopy(source))
+            continue
+
+        match = re.match(r'^([\w.]+)(?:\((.*)\))?$', field)
+        if not match:
+            raise RequestError(400, f"Invalid field mask: {field}")
+        path, nested = match.group(1).split('.'), match.group(2)
+
+        node, src = target, source
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+            src = (src or {}).get(key, {})
+        key = path[-1]
+        if nested:
+            _apply_mask(node.setdefault(key, {}), (src or {}).get(key, {}), nested)
+            if not node[key]:
+                del node[key]
+        elif key in (src or {}):
+            node[key] = copy.deepcopy(src[key])
+        else:
+            node.pop(key, None)
+
+
+def _user_entered(value: Any, parse: bool) -> Dict:
+    """values API 的值轉 ExtendedValue；parse 為 USER_ENTERED 語意（公式、數字字串）"""
+    if value is None or value == '':
+        return {}
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, (int, float)):
+        return {'numberValue': value}
+    value = str(value)
+    if parse:
+        if value.startswith('='):
+            return {'formulaValue': value}
+        try:
+            return {'numberValue': float(value) if '.' in value else int(value)}
+        except ValueError:
+            pass
+    return {'stringValue': value}
+
+
+def _split_range(a1_range: str) -> Tuple[str, str]:
+    """"'工作表'!A1:B2" → ('工作表', 'A1:B2')；只有名稱時範圍為空字串"""
+    if '!' in a1_range:
+        title, cells = a1_range.rsplit('!', 1)
+    else:
+        title, cells = a1_range, ''
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def _format_value(value: Any, render: str) -> Any:
+    if render == 'UNFORMATTED_VALUE' or not isinstance(value, (int, float)) or isinstance(value, bool):
+        return value
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+# ============================================================================
+# 服務
+# ============================================================================
+
+class FakeSheetsService:
+    """
+    行程內的 Sheets / Drive API
+
+    所有請求經過 handle()，由 FakeSession（給 gspread）或 FakeClient 呼叫。
+    """
+
+    def __init__(
+        self,
+        reads_per_minute: Optional[int] = None,
+        writes_per_minute: Optional[int] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = 42
+    ):
+        """
+        Args:
+            reads_per_minute: 每分鐘讀取上限（None 不限制）
+            writes_per_minute: 每分鐘寫入上限（None 不限制）
+            latency: 每次請求的固定延遲（秒）
+            jitter: 額外隨機延遲上限（秒）
+            error_rate: 回傳 503 的機率 (0-1)
+            seed: 隨機種子
+        """
+        self.limits = {'read': reads_per_minute, 'write': writes_per_minute}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.spreadsheets: Dict[str, FakeSpreadsheet] = {}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window: Dict[str, List[float]] = {'read': [], 'write': []}
+        self._next_id = 1
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # 測試輔助
+    # ------------------------------------------------------------------
+
+    def create_spreadsheet(self, title: str, spreadsheet_id: Optional[str] = None) -> FakeSpreadsheet:
+        """直接建立 Spreadsheet（不計入統計）"""
+        with self._lock:
+            spreadsheet_id = spreadsheet_id or f'fake-{self._next_id}'
+            self._next_id += 1
+            spreadsheet = FakeSpreadsheet(spreadsheet_id, title)
+            self.spreadsheets[spreadsheet_id] = spreadsheet
+            return spreadsheet
+
+    def worksheet(self, spreadsheet_id: str, title: str) -> FakeWorksheet:
+        return self.spreadsheets[spreadsheet_id].by_title(title)
+
+    def values(self, spreadsheet_id: str, title: str) -> List[List[Any]]:
+        """工作表目前的數值（公式回傳公式本身）"""
+        return self.worksheet(spreadsheet_id, title).values()
+
+    def reset_stats(self):
+        self.stats = {
+            'requests': 0,
+            'reads': 0,
+            'writes': 0,
+            'bytes_sent': 0,       # 客戶端送出（URL + 請求內容）
+            'bytes_received': 0,   # 客戶端收到（回應內容）
+            'rate_limited': 0,
+            'injected_errors': 0,
+            'errors': 0,
+            'endpoints': defaultdict(int),
+        }
+
+    def stats_dict(self) -> Dict:
+        stats = dict(self.stats)
+        stats['endpoints'] = dict(stats['endpoints'])
+        return stats
+
+    def session(self) -> 'FakeSession':
+        """給 gspread.Client(auth=None, session=...) 使用的 HTTP session"""
+        return FakeSession(self)
+
+    def connect(self):
+        """
+        取得指向本服務的客戶端
+
+        Returns:
+            有安裝 gspread 時為真正的 gspread.Client，否則為相同介面的 FakeClient
+        """
+        if GSPREAD_AVAILABLE:
+            return gspread.Client(None, session=self.session())
+        return FakeClient(self)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def handle(self, method: str, url: str, params: Optional[Dict] = None,
+               body: Optional[Dict] = None) -> FakeResponse:
+        """處理一個 HTTP 請求"""
+        method = method.upper()
+        kind = 'read' if method == 'GET' else 'write'
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[kind + 's'] += 1
+            self.stats['bytes_sent'] += len(url.encode('utf-8'))
+            if body is not None:
+                self.stats['bytes_sent'] += len(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+
+            try:
+                self._check_quota(kind)
+                if self.error_rate and self._random.random() < self.error_rate:
+                    self.stats['injected_errors'] += 1
+                    raise RequestError(503, 'The service is currently unavailable.')
+                endpoint, result = self._route(method, url, params or {}, body or {})
+                self.stats['endpoints'][endpoint] += 1
+                response = FakeResponse(url, 200, result)
+            except RequestError as e:
+                if e.code == 429:
+                    self.stats['rate_limited'] += 1
+                else:
+                    self.stats['errors'] += 1
+                response = FakeResponse(url, e.code, {'error': {
+                    'code': e.code, 'message': e.message, 'status': RequestError.STATUS.get(e.code, 'UNKNOWN')
+                }})
+
+            self.stats['bytes_received'] += len(response.content)
+            return response
+
+    def _check_quota(self, kind: str):
+        limit = self.limits[kind]
+        if limit is None:
+            return
+        now = time.monotonic()
+        window = [t for t in self._window[kind] if t > now - 60.0]
+        if len(window) >= limit:
+            self._window[kind] = window
+            raise RequestError(429, (
+                f"Quota exceeded for quota metric '{kind.capitalize()} requests' and limit "
+                f"'{kind.capitalize()} requests per minute per user'"
+            ))
+        window.append(now)
+        self._window[kind] = window
+
+    def _route(self, method: str, url: str, params: Dict, body: Dict) -> Tuple[str, Any]:
+        """依 URL 分派，回傳 (端點名稱, 回應內容)"""
+        if url.startswith(DRIVE_URL):
+            return self._drive(method, url[len(DRIVE_URL):], params, body)
+        if not url.startswith(SHEETS_URL):
+            raise RequestError(404, f"Unknown URL: {url}")
+
+        path = url[len(SHEETS_URL):]
+        match = _VALUES_PATH.match(path)
+        if match:
+            spreadsheet = self._spreadsheet(unquote(match.group(1)))
+            action, a1_range, suffix = match.group(2), match.group(3), match.group(4)
+            if action == 'batchGet' and method == 'GET':
+                ranges = params.get('ranges', [])
+                ranges = [ranges] if isinstance(ranges, str) else ranges
+                return 'values.batchGet', {
+                    'spreadsheetId': spreadsheet.id,
+                    'valueRanges': [self._values_get(spreadsheet, r, params) for r in ranges]
+                }
+            if action == 'batchUpdate' and method == 'POST':
+                return 'values.batchUpdate', self._values_batch_update(spreadsheet, body)
+            if action == 'batchClear' and method == 'POST':
+                for a1 in body.get('ranges', []):
+                    self._values_clear(spreadsheet, a1)
+                return 'values.batchClear', {'spreadsheetId': spreadsheet.id, 'clearedRanges': body.get('ranges', [])}
+            if a1_range and suffix == 'clear' and method == 'POST':
+                self._values_clear(spreadsheet, unquote(a1_range))
+                return 'values.clear', {'spreadsheetId': spreadsheet.id, 'clearedRange': unquote(a1_range)}
+            if a1_range and suffix is None and method == 'GET':
+                return 'values.get', self._values_get(spreadsheet, unquote(a1_range), params)
+            if a1_range and suffix is None and method == 'PUT':
+                data = dict(body, range=body.get('range', unquote(a1_range)))
+                return 'values.update', self._values_batch_update(spreadsheet, {
+                    'valueInputOption': params.get('valueInputOption', 'RAW'), 'data': [data]
+                })
+            raise RequestError(404, f"Unsupported values request: {method} {path}")
+
+        match = _SPREADSHEET_PATH.match(path)
+        if match:
+            spreadsheet = self._spreadsheet(unquote(match.group(1)))
+            if match.group(2) == 'batchUpdate' and method == 'POST':
+                return 'batchUpdate', self._batch_update(spreadsheet, body.get('requests', []))
+            if match.group(2) is None and method == 'GET':
+                return 'get', spreadsheet.metadata()
+        raise RequestError(404, f"Unsupported request: {method} {path}")
+
+    def _spreadsheet(self, spreadsheet_id: str) -> FakeSpreadsheet:
+        if spreadsheet_id not in self.spreadsheets:
+            raise RequestError(404, f"Requested entity was not found: {spreadsheet_id}")
+        return self.spreadsheets[spreadsheet_id]
+
+    # ------------------------------------------------------------------
+    # Drive
+    # ------------------------------------------------------------------
+
+    def _drive(self, method: str, path: str, params: Dict, body: Dict) -> Tuple[str, Any]:
+        if path == '' and method == 'GET':
+            return 'drive.list', {'files': [
+                {'id': s.id, 'name': s.title, 'mimeType': 'application/vnd.google-apps.spreadsheet'}
+                for s in self.spreadsheets.values()
+            ]}
+        if path == '' and method == 'POST':
+            spreadsheet_id = f'fake-{self._next_id}'
+            self._next_id += 1
+            self.spreadsheets[spreadsheet_id] = FakeSpreadsheet(spreadsheet_id, body.get('name', 'Untitled'))
+            return 'drive.create', {'id': spreadsheet_id, 'name': body.get('name', 'Untitled')}
+        if path.startswith('/') and method == 'DELETE':
+            self.spreadsheets.pop(path[1:], None)
+            return 'drive.delete', {}
+        raise RequestError(404, f"Unsupported Drive request: {method} {path}")
+
+    # ------------------------------------------------------------------
+    # values API
+    # ------------------------------------------------------------------
+
+    def _grid(self, spreadsheet: FakeSpreadsheet, a1_range: str) -> Tuple[FakeWorksheet, Dict]:
+        title, cells = _split_range(a1_range)
+        sheet = spreadsheet.by_title(title)
+        try:
+            grid = a1_to_grid_range(cells, sheet.id) if cells else {'sheetId': sheet.id}
+        except ValueError:
+            raise RequestError(400, f"Unable to parse range: {a1_range}")
+        return sheet, grid
+
+    def _values_get(self, spreadsheet: FakeSpreadsheet, a1_range: str, params: Dict) -> Dict:
+        sheet, grid = self._grid(spreadsheet, a1_range)
+        start_row, start_col, end_row, end_col = sheet.bounds(grid)
+        render = params.get('valueRenderOption', 'FORMATTED_VALUE')
+
+        rows = []
+        for row in range(start_row, end_row):
+            line = [sheet.value(row, col) for col in range(start_col, end_col)]
+            while line and line[-1] is None:
+                line.pop()
+            rows.append(['' if value is None else _format_value(value, render) for value in line])
+        while rows and not rows[-1]:
+            rows.pop()
+
+        result = {'range': a1_range, 'majorDimension': 'ROWS'}
+        if rows:
+            result['values'] = rows
+        return result
+
+    def _values_batch_update(self, spreadsheet: FakeSpreadsheet, body: Dict) -> Dict:
+        parse = body.get('valueInputOption', 'RAW') == 'USER_ENTERED'
+        staged = copy.deepcopy(spreadsheet.sheets)  # 任一範圍失敗時整批不生效
+        total = 0
+        for data in body.get('data', []):
+            sheet, grid = self._grid(spreadsheet, data['range'])
+            sheet = next(s for s in staged if s.id == sheet.id)
+            values = data.get('values', [])
+            start_row = grid.get('startRowIndex', 0)
+            start_col = grid.get('startColumnIndex', 0)
+            width = max((len(row) for row in values), default=0)
+            sheet.bounds({'startRowIndex': start_row, 'startColumnIndex': start_col,
+                          'endRowIndex': start_row + len(values), 'endColumnIndex': start_col + width})
+            for r, row in enumerate(values):
+                for c, value in enumerate(row):
+                    cell = sheet.cells.setdefault((start_row + r, start_col + c), {})
+                    extended = _user_entered(value, parse)
+                    if extended:
+                        cell['userEnteredValue'] = extended
+                    else:
+                        cell.pop('userEnteredValue', None)
+                    total += 1
+        spreadsheet.sheets = staged
+        return {'spreadsheetId': spreadsheet.id, 'totalUpdatedCells': total}
+
+    def _values_clear(self, spreadsheet: FakeSpreadsheet, a1_range: str):
+        sheet, grid = self._grid(spreadsheet, a1_range)
+        start_row, start_col, end_row, end_col = sheet.bounds(grid)
+        for (row, col), cell in sheet.cells.items():
+            if start_row <= row < end_row and start_col <= col < end_col:
+                cell.pop('userEnteredValue', None)
+
+    # ------------------------------------------------------------------
+    # batchUpdate
+    # ------------------------------------------------------------------
+
+    def _batch_update(self, spreadsheet: FakeSpreadsheet, requests: List[Dict]) -> Dict:
+        """整批套用在副本上，全部成功才取代原本的工作表"""
+        staged = FakeSpreadsheet(spreadsheet.id, spreadsheet.title)
+        staged.sheets = copy.deepcopy(spreadsheet.sheets)
+
+        replies = []
+        for index, request in enumerate(requests):
+            if len(request) != 1:
+                raise RequestError(400, f"Invalid requests[{index}]: exactly one request type is required")
+            kind, payload = next(iter(request.items()))
+            handler = getattr(self, f'_req_{kind}', None)
+            if handler is None:
+                raise RequestError(400, f"Invalid requests[{index}]: unsupported request type {kind}")
+            try:
+                replies.append(handler(staged, payload) or {})
+            except RequestError as e:
+                raise RequestError(e.code, f"Invalid requests[{index}].{kind}: {e.message}")
+
+        spreadsheet.sheets = staged.sheets
+        return {'spreadsheetId': spreadsheet.id, 'replies': replies}
+
+    def _req_addSheet(self, spreadsheet: FakeSpreadsheet, payload: Dict) -> Dict:
+        properties = copy.deepcopy(payload.get('properties', {}))
+        title = properties.get('title') or f'工作表{len(spreadsheet.sheets) + 1}'
+        if any(sheet.title == title for sheet in spreadsheet.sheets):
+            raise RequestError(400, f'A sheet with the name "{title}" already exists. Please enter another name.')
+        sheet_id = properties.get('sheetId')
+        if sheet_id is None:
+            sheet_id = max((sheet.id for sheet in spreadsheet.sheets), default=0) + 1
+        elif any(sheet.id == sheet_id for sheet in spreadsheet.sheets):
+            raise RequestError(400, f"Sheet with id {sheet_id} already exists")
+
+        properties.update({'sheetId': sheet_id, 'title': title})
+        properties.setdefault('index', len(spreadsheet.sheets))
+        sheet = FakeWorksheet(properties)
+        spreadsheet.sheets.insert(min(properties['index'], len(spreadsheet.sheets)), sheet)
+        for index, existing in enumerate(spreadsheet.sheets):
+            existing.properties['index'] = index
+        return {'addSheet': {'properties': copy.deepcopy(sheet.properties)}}
+
+    def _req_deleteSheet(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        sheet = spreadsheet.by_id(payload['sheetId'])
+        if len(spreadsheet.sheets) == 1:
+            raise RequestError(400, "You can't remove all the sheets in a document.")
+        spreadsheet.sheets.remove(sheet)
+
+    def _req_updateSheetProperties(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        properties = payload['properties']
+        sheet = spreadsheet.by_id(properties['sheetId'])
+        if 'title' in properties and properties['title'] != sheet.title and any(
+                other.title == properties['title'] for other in spreadsheet.sheets):
+            raise RequestError(400, f'A sheet with the name "{properties["title"]}" already exists.')
+        _apply_mask(sheet.properties, properties, payload.get('fields', '*'))
+        sheet.properties['sheetId'] = sheet.id
+        if sheet.properties.get('hidden') and all(s.properties.get('hidden') for s in spreadsheet.sheets):
+            raise RequestError(400, "You can't hide all the sheets in a document.")
+        sheet.resize()
+
+    def _req_updateCells(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        fields = payload.get('fields')
+        if not fields:
+            raise RequestError(400, "At least one field must be specified in 'fields'.")
+        rows = payload.get('rows', [])
+
+        if 'range' in payload:
+            sheet = spreadsheet.by_id(payload['range']['sheetId'])
+            start_row, start_col, end_row, end_col = sheet.bounds(payload['range'])
+        else:
+            start = payload['start']
+            sheet = spreadsheet.by_id(start['sheetId'])
+            start_row, start_col = start.get('rowIndex', 0), start.get('columnIndex', 0)
+            end_row = start_row + len(rows)
+            end_col = start_col + max((len(row.get('values', [])) for row in rows), default=0)
+            sheet.bounds({'startRowIndex': start_row, 'startColumnIndex': start_col,
+                          'endRowIndex': end_row, 'endColumnIndex': end_col})
+
+        for row in range(start_row, end_row):
+            values = rows[row - start_row].get('values', []) if row - start_row < len(rows) else []
+            for col in range(start_col, end_col):
+                source = values[col - start_col] if col - start_col < len(values) else {}
+                cell = sheet.cells.setdefault((row, col), {})
+                _apply_mask(cell, source, fields)
+
+    def _req_repeatCell(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        sheet = spreadsheet.by_id(payload['range']['sheetId'])
+        start_row, start_col, end_row, end_col = sheet.bounds(payload['range'])
+        for row in range(start_row, end_row):
+            for col in range(start_col, end_col):
+                _apply_mask(sheet.cells.setdefault((row, col), {}), payload.get('cell', {}), payload['fields'])
+
+    def _req_setDataValidation(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        sheet = spreadsheet.by_id(payload['range']['sheetId'])
+        start_row, start_col, end_row, end_col = sheet.bounds(payload['range'])
+        for row in range(start_row, end_row):
+            for col in range(start_col, end_col):
+                cell = sheet.cells.setdefault((row, col), {})
+                if payload.get('rule'):
+                    cell['dataValidation'] = copy.deepcopy(payload['rule'])
+                else:
+                    cell.pop('dataValidation', None)
+
+    def _req_updateDimensionProperties(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        dimension_range = payload['range']
+        sheet = spreadsheet.by_id(dimension_range['sheetId'])
+        limit = sheet.col_count if dimension_range['dimension'] == 'COLUMNS' else sheet.row_count
+        if dimension_range.get('endIndex', limit) > limit:
+            raise RequestError(400, f"Invalid dimension range, exceeds grid limits ({limit})")
+        if dimension_range['dimension'] == 'COLUMNS' and 'pixelSize' in payload.get('properties', {}):
+            for column in range(dimension_range.get('startIndex', 0), dimension_range.get('endIndex', limit)):
+                sheet.column_widths[column] = payload['properties']['pixelSize']
+
+    def _req_addConditionalFormatRule(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        rule = payload['rule']
+        sheets = {grid['sheetId'] for grid in rule.get('ranges', [])}
+        if len(sheets) != 1:
+            raise RequestError(400, "All ranges of a conditional format rule must be on the same sheet")
+        sheet = spreadsheet.by_id(sheets.pop())
+        for grid in rule['ranges']:
+            sheet.bounds(grid)
+        index = payload.get('index', 0)
+        if index > len(sheet.conditional_formats):
+            raise RequestError(400, f"Invalid index {index}")
+        sheet.conditional_formats.insert(index, copy.deepcopy(rule))
+
+    def _req_deleteConditionalFormatRule(self, spreadsheet: FakeSpreadsheet, payload: Dict):
+        sheet = spreadsheet.by_id(payload['sheetId'])
+        index = payload.get('index', 0)
+        if index >= len(sheet.conditional_formats):
+            raise RequestError(400, f"No conditional format on sheet: {sheet.id} at index: {index}")
+        sheet.conditional_formats.pop(index)
+
+
+# ============================================================================
+# 客戶端
+# ============================================================================
+
+class FakeSession:
+    """取代 google.auth AuthorizedSession，把 gspread 的 HTTP 請求轉給 FakeSheetsService"""
+
+    def __init__(self, service: FakeSheetsService):
+        self.service = service
+        self.headers: Dict[str, str] = {}
+
+    def request(self, method: str, url: str, params: Optional[Dict] = None, data: Any = None,
+                **kwargs) -> FakeResponse:
+        body = kwargs.get('json')
+        if body is None and data:
+            body = json.loads(data) if isinstance(data, (str, bytes)) else data
+        return self.service.handle(method, url, params=params, body=body)
+
+
+class FakeSpreadsheetClient:
+    """
+    gspread.Spreadsheet 的精簡替身（沒有安裝 gspread 時使用）
+
+    只提供 SheetsBatchWriter 與 SheetsEngine 會呼叫的方法，所有請求一樣經過 FakeSheetsService，
+    統計與安裝 gspread 時相同。
+    """
+
+    def __init__(self, service: FakeSheetsService, spreadsheet_id: str):
+        self.service = service
+        self.id = spreadsheet_id
+        self._properties = self.fetch_sheet_metadata()['properties']
+
+    @property
+    def title(self) -> str:
+        return self._properties['title']
+
+    @property
+    def url(self) -> str:
+        return f'https://docs.google.com/spreadsheets/d/{self.id}'
+
+    def _request(self, method: str, url: str, params: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
+        response = self.service.handle(method, url, params=params, body=body)
+        if not response.ok:
+            raise FakeAPIError(response)
+        return response.json()
+
+    def fetch_sheet_metadata(self, params: Optional[Dict] = None) -> Dict:
+        return self._request('GET', f'{SHEETS_URL}/{self.id}', params=params)
+
+    def batch_update(self, body: Dict) -> Dict:
+        return self._request('POST', f'{SHEETS_URL}/{self.id}:batchUpdate', body=body)
+
+    def values_batch_update(self, body: Dict) -> Dict:
+        return self._request('POST', f'{SHEETS_URL}/{self.id}/values:batchUpdate', body=body)
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict] = None) -> Dict:
+        return self._request('GET', f'{SHEETS_URL}/{self.id}/values:batchGet',
+                             params=dict(params or {}, ranges=ranges))
+
+    def values_get(self, a1_range: str, params: Optional[Dict] = None) -> Dict:
+        return self._request('GET', f'{SHEETS_URL}/{self.id}/values/{a1_range}', params=params)
+
+
+class FakeClient:
+    """gspread.Client 的精簡替身（open_by_key）"""
+
+    def __init__(self, service: FakeSheetsService):
+        self.service = service
+
+    def open_by_key(self, key: str) -> FakeSpreadsheetClient:
+        return FakeSpreadsheetClient(self.service, key)
@@ -8,10 +8,19 @@ Google Sheets 自動同步系統
 4. 生成週報告
 """
 
+import hashlib
 import json
-from typing import Dict, List, Any
+import random
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from ..storage.artifacts import file_lock, write_json_artifact
+from .sheets_quota import READ, WRITE, QuotaGovernor, get_default_governor, is_server_error
+
 try:
     import gspread
     from google.oauth2.service_account import Credentials
@@ -22,6 +31,829 @@ except ImportError:
     print("執行: pip install gspread google-auth")
 
 
+def column_letter(index: int) -> str:
+    """
+    欄位索引轉欄位字母（0 → A、26 → AA）
+
+    Args:
+        index: 從 0 開始的欄位索引
+    """
+    letters = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _column_index(letters: str) -> int:
+    """欄位字母轉從 0 開始的索引"""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+_A1_CELL = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def a1_to_grid_range(a1_range: str, sheet_id: int) -> Dict:
+    """
+    A1 範圍轉 Sheets API 的 GridRange
+
+    支援 'B2'、'A1:G1'、'A:A'、'B4:E' 等寫法；省略的邊界代表延伸到工作表邊緣。
+
+    Args:
+        a1_range: 不含工作表名稱的 A1 範圍
+        sheet_id: 工作表 ID
+
+    Raises:
+        ValueError: 無法解析的範圍
+    """
+    grid = {'sheetId': sheet_id}
+    parts = a1_range.split(':')
+    if len(parts) > 2:
+        raise ValueError(f"無法解析的範圍: {a1_range}")
+
+    cells = []
+    for part in parts:
+        match = _A1_CELL.match(part)
+        if not match or not part:
+            raise ValueError(f"無法解析的範圍: {a1_range}")
+        cells.append(match.groups())
+
+    start_col, start_row = cells[0]
+    end_col, end_row = cells[-1]
+    if start_col:
+        grid['startColumnIndex'] = _column_index(start_col)
+    if end_col:
+        grid['endColumnIndex'] = _column_index(end_col) + 1
+    if start_row:
+        grid['startRowIndex'] = int(start_row) - 1
+    if end_row:
+        grid['endRowIndex'] = int(end_row)
+    return grid
+
+
+def _sheet_range(title: str, a1_range: str) -> str:
+    """加上工作表名稱的 A1 範圍（名稱中的單引號需重複）"""
+    return "'{}'!{}".format(title.replace("'", "''"), a1_range)
+
+
+def _extended_value(value: Any) -> Dict:
+    """Python 值轉 USER_ENTERED 語意的 ExtendedValue（'=' 開頭視為公式）"""
+    if value is None:
+        return {}
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, (int, float)):
+        return {'numberValue': value}
+    value = str(value)
+    if value.startswith('='):
+        return {'formulaValue': value}
+    return {'stringValue': value}
+
+
+DEFAULT_SHADOW_DIR = 'data/cache/sheets_shadow'
+
+SHADOW_VERSION = 1
+
+
+def _cell(rows: List[List[Any]], row: int, col: int) -> Any:
+    """取得儲存格值，超出範圍或 None 視為空字串"""
+    if row < len(rows) and col < len(rows[row]):
+        value = rows[row][col]
+        return '' if value is None else value
+    return ''
+
+
+def _same(a: Any, b: Any) -> bool:
+    """比較兩個儲存格值（1 與 True、1 與 '1' 視為不同）"""
+    return type(a) is type(b) and a == b
+
+
+def diff_rectangles(old_rows: List[List[Any]], new_rows: List[List[Any]]) -> List[Tuple[int, int, int, int]]:
+    """
+    找出兩份二維數值之間有變動的儲存格，合併成矩形
+
+    先把每一列連續變動的儲存格合併成區段，再把上下相鄰、欄位範圍相同的
+    區段合併成同一個矩形。新數值比舊數值小時，多出來的舊儲存格也算變動（需清空）。
+
+    Args:
+        old_rows: 上次寫入的數值
+        new_rows: 這次要寫入的數值
+
+    Returns:
+        [(起始列, 起始欄, 結束列, 結束欄)]，從 0 開始，結束為不含
+    """
+    rectangles = []
+    open_runs: Dict[Tuple[int, int], int] = {}  # (起始欄, 結束欄) → 起始列
+
+    for row in range(max(len(old_rows), len(new_rows)) + 1):
+        runs = []
+        if row < max(len(old_rows), len(new_rows)):
+            width = max(
+                len(old_rows[row]) if row < len(old_rows) else 0,
+                len(new_rows[row]) if row < len(new_rows) else 0
+            )
+            start = None
+            for col in range(width + 1):
+                changed = col < width and not _same(_cell(old_rows, row, col), _cell(new_rows, row, col))
+                if changed and start is None:
+                    start = col
+                elif not changed and start is not None:
+                    runs.append((start, col))
+                    start = None
+
+        next_open = {}
+        for run in runs:
+            next_open[run] = open_runs.pop(run, row)
+        for (start_col, end_col), start_row in open_runs.items():
+            rectangles.append((start_row, start_col, row, end_col))
+        open_runs = next_open
+
+    return sorted(rectangles)
+
+
+def _a1_rectangle(start_row: int, start_col: int, end_row: int, end_col: int) -> str:
+    """矩形（從 0 開始，結束為不含）轉 A1 範圍"""
+    return f"{column_letter(start_col)}{start_row + 1}:{column_letter(end_col - 1)}{end_row}"
+
+
+def _signature(payload: Any) -> str:
+    """操作內容的 sha256，用來判斷與上次套用的是否相同"""
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _covers(desired: Any, live: Any) -> bool:
+    """
+    live（API 回傳）是否包含 desired 的所有設定
+
+    API 會省略值為 0 / False 的欄位（例如顏色的 blue: 0），缺少的欄位以預設值比較；
+    浮點數容許些微誤差。
+    """
+    if isinstance(desired, dict):
+        live = live if isinstance(live, dict) else {}
+        return all(_covers(value, live.get(key, _default_like(value))) for key, value in desired.items())
+    if isinstance(desired, list):
+        return (isinstance(live, list) and len(desired) == len(live)
+                and all(_covers(d, l) for d, l in zip(desired, live)))
+    if isinstance(desired, float) or isinstance(live, float):
+        return isinstance(live, (int, float)) and abs(desired - live) < 1e-3
+    return desired == live
+
+
+def _default_like(value: Any) -> Any:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return 0
+    if isinstance(value, str):
+        return ''
+    return None
+
+
+def _row_width(row: Any) -> int:
+    """一列的格數（values.batchUpdate 的 list 或 updateCells 的 RowData）"""
+    return len(row['values']) if isinstance(row, dict) else len(row)
+
+
+def _block_covers(new_rows: List, old_rows: List) -> bool:
+    """從同一起點寫入時，new_rows 是否蓋過 old_rows 的每一格"""
+    return len(new_rows) >= len(old_rows) and all(
+        _row_width(new) >= _row_width(old) for new, old in zip(new_rows, old_rows)
+    )
+
+
+def _layout_key(request: Dict) -> str:
+    """版面請求的合併鍵：請求類型 + 範圍 + 欄位（不含設定值）"""
+    kind, body = next(iter(request.items()))
+    target = body.get('range', body.get('properties', {}).get('sheetId'))
+    return json.dumps([kind, target, body.get('fields')], sort_keys=True)
+
+
+@dataclass
+class SheetHandle:
+    """
+    工作表的本機代表（取代 gspread Worksheet，不需再向 API 查詢）
+
+    Attributes:
+        id: sheetId
+        title: 工作表名稱
+        row_count: 列數
+        col_count: 欄數
+        hidden: 是否隱藏
+        created: 本次同步才建立（flush() 前尚不存在於線上）
+    """
+    id: int
+    title: str
+    row_count: int
+    col_count: int
+    hidden: bool = False
+    created: bool = False
+
+
+METADATA_FIELDS = (
+    'sheets(properties(sheetId,title,hidden,gridProperties(rowCount,columnCount)),conditionalFormats)'
+)
+
+
+class SheetsBatchWriter:
+    """
+    Google Sheets 批次寫入器
+
+    同步腳本把數值、格式、下拉選單、欄寬、隱藏等操作先排入佇列，
+    flush() 時每個 Spreadsheet 最多送出兩個寫入請求：
+
+    1. spreadsheets.batchUpdate：清除、公式、格式、下拉選單、欄寬、隱藏、條件式格式
+    2. values.batchUpdate（RAW）：一般數值
+
+    batchUpdate 先送出，所以同一批次中 clear() 一定在寫入數值之前生效。
+
+    本機影子副本（data/cache/sheets_shadow/<spreadsheet id>.json）記錄每張工作表
+    上次寫入的數值與版面設定：
+
+    - sync_values() 只寫入有變動的矩形，不清除整張工作表
+    - 格式、下拉選單、欄寬、隱藏與上次相同時不再送出
+    - 條件式格式規則只在第一次（或規則改變）時讀取線上規則比對，不同才重建
+
+    影子副本在 flush() 成功後才更新；刪除該檔案可強制下次完整重寫。
+
+    同一批次中寫到同一範圍的操作會合併（後者完整蓋過前者時只送後者）；
+    所有 API 呼叫都經過 QuotaGovernor，額度用完時排隊，429 / 5xx 自動退避重試。
+
+    worksheet() 以一次 fetch_sheet_metadata 取得所有工作表的 ID、名稱與格線大小，
+    不存在的工作表在本機配發 sheetId，與其他操作一起在同一個 batchUpdate 中建立；
+    寫入超出格線時也會在同一批次中先擴大工作表。
+
+    用法：
+        writer = SheetsBatchWriter(spreadsheet)
+        sheet = writer.worksheet('聯盟排名', rows=20, cols=8)
+        writer.sync_values(sheet, rows)
+        writer.format(sheet, 'A1:G1', {...})
+        writer.flush()
+    """
+
+    def __init__(self, spreadsheet, shadow_dir: Optional[str] = DEFAULT_SHADOW_DIR,
+                 governor: Optional[QuotaGovernor] = None):
+        """
+        Args:
+            spreadsheet: gspread Spreadsheet
+            shadow_dir: 影子副本目錄；None 時每次完整重寫、重新套用格式
+            governor: API 額度控管（預設為行程內共用的實例）
+        """
+        self.spreadsheet = spreadsheet
+        self.governor = governor or get_default_governor()
+        self.requests: List[Dict] = []
+        self.value_ranges: List[Dict] = []
+        self.cells_written = 0
+        self.coalesced = 0
+        self.api_calls = 0
+
+        self._sheets: Optional[Dict[str, SheetHandle]] = None
+        self._live_conditional: Optional[Dict[int, List[Dict]]] = None
+        self._structure: List[Dict] = []  # 建立工作表、擴大格線，排在批次最前面
+
+        self.shadow_path = Path(shadow_dir) / f'{spreadsheet.id}.json' if shadow_dir else None
+        self._shadow: Optional[Dict[str, Dict]] = None
+        self._pending_rows: Dict[str, Dict] = {}
+        self._stale_rows: Dict[str, int] = {}
+        self._layout: Dict[str, Dict] = {}
+        self._conditional: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return (len(self._structure) + len(self.requests) + len(self.value_ranges)
+                + sum(len(layout['requests']) for layout in self._layout.values())
+                + sum(len(conditional['rules']) for conditional in self._conditional.values()))
+
+    # ------------------------------------------------------------------
+    # 工作表
+    # ------------------------------------------------------------------
+
+    def fetch_metadata(self) -> Dict[str, SheetHandle]:
+        """
+        讀取所有工作表的中繼資料（每個寫入器只讀一次）
+
+        Returns:
+            {工作表名稱: SheetHandle}
+        """
+        if self._sheets is None:
+            metadata = self.governor.call(READ, self.spreadsheet.fetch_sheet_metadata,
+                                          {'fields': METADATA_FIELDS})
+            self.api_calls += 1
+            self._sheets = {}
+            self._live_conditional = {}
+            for sheet in metadata.get('sheets', []):
+                properties = sheet['properties']
+                grid = properties.get('gridProperties', {})
+                handle = SheetHandle(
+                    id=properties['sheetId'],
+                    title=properties['title'],
+                    row_count=grid.get('rowCount', 0),
+                    col_count=grid.get('columnCount', 0),
+                    hidden=properties.get('hidden', False)
+                )
+                self._sheets[handle.title] = handle
+                self._live_conditional[handle.id] = sheet.get('conditionalFormats', [])
+        return self._sheets
+
+    def worksheet(self, title: str, rows: int = 100, cols: int = 20) -> SheetHandle:
+        """
+        取得工作表，不存在時排入建立（flush() 時與其他操作一起送出）
+
+        Args:
+            title: 工作表名稱
+            rows: 建立時的列數
+            cols: 建立時的欄數
+        """
+        sheets = self.fetch_metadata()
+        if title in sheets:
+            return sheets[title]
+
+        used_ids = {sheet.id for sheet in sheets.values()}
+        sheet_id = random.randint(1, 2 ** 31 - 1)
+        while sheet_id in used_ids:
+            sheet_id = random.randint(1, 2 ** 31 - 1)
+
+        handle = sheets[title] = SheetHandle(sheet_id, title, rows, cols, created=True)
+        self._live_conditional[sheet_id] = []
+        self._structure.append({
+            'addSheet': {
+                'properties': {
+                    'sheetId': sheet_id,
+                    'title': title,
+                    'gridProperties': {'rowCount': rows, 'columnCount': cols}
+                }
+            }
+        })
+        return handle
+
+    def _ensure_grid(self, worksheet, rows: int, cols: int):
+        """寫入範圍超出已知格線大小時，排入擴大工作表"""
+        if not isinstance(worksheet, SheetHandle):
+            return
+        if rows <= worksheet.row_count and cols <= worksheet.col_count:
+            return
+        worksheet.row_count = max(worksheet.row_count, rows)
+        worksheet.col_count = max(worksheet.col_count, cols)
+        self._structure.append({
+            'updateSheetProperties': {
+                'properties': {
+                    'sheetId': worksheet.id,
+                    'gridProperties': {'rowCount': worksheet.row_count, 'columnCount': worksheet.col_count}
+                },
+                'fields': 'gridProperties(rowCount,columnCount)'
+            }
+        })
+
+    # ------------------------------------------------------------------
+    # 影子副本
+    # ------------------------------------------------------------------
+
+    def _read_shadow_file(self) -> Dict[str, Dict]:
+        if not self.shadow_path:
+            return {}
+        try:
+            with open(self.shadow_path, 'r', encoding='utf-8') as f:
+                shadow = json.load(f)
+            if shadow.get('version') == SHADOW_VERSION:
+                return shadow['sheets']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+        return {}
+
+    def _load_shadow(self) -> Dict[str, Dict]:
+        """讀取影子副本 {工作表名稱: {'sheet_id', 'rows', 'layout', 'conditional'}}"""
+        if self._shadow is None:
+            self._shadow = self._read_shadow_file()
+        return self._shadow
+
+    def _save_shadow(self, titles: set):
+        """
+        把指定工作表的影子副本寫回檔案
+
+        在檔案鎖內重新讀取再合併，同時同步同一個 Spreadsheet 的其他腳本
+        寫入的其他工作表紀錄不會被覆蓋。
+        """
+        if not self.shadow_path or not titles:
+            return
+        shadow = self._load_shadow()
+        with file_lock(str(self.shadow_path)):
+            on_disk = self._read_shadow_file()
+            for title in titles:
+                if title in shadow:
+                    on_disk[title] = shadow[title]
+                else:
+                    on_disk.pop(title, None)
+            write_json_artifact(
+                str(self.shadow_path),
+                {'version': SHADOW_VERSION, 'sheets': on_disk},
+                manifest=False
+            )
+        self._shadow = on_disk
+
+    def _shadow_entry(self, title: str, sheet_id: int) -> Dict:
+        """
+        工作表的影子副本；工作表被刪除重建（sheet_id 改變）時視為沒有影子副本
+
+        Returns:
+            可直接修改的 dict（未 flush 前不會寫回檔案）
+        """
+        shadow = self._load_shadow()
+        entry = shadow.get(title)
+        if not entry or entry.get('sheet_id') != sheet_id:
+            entry = shadow[title] = {'sheet_id': sheet_id}
+        return entry
+
+    def _recorded(self, title: str, sheet_id: int, key: str) -> Any:
+        """影子副本中的某個欄位（沒有或 sheet_id 不符時為 None）"""
+        entry = self._load_shadow().get(title)
+        if not entry or entry.get('sheet_id') != sheet_id:
+            return None
+        return entry.get(key)
+
+    # ------------------------------------------------------------------
+    # 數值
+    # ------------------------------------------------------------------
+
+    def sync_values(self, worksheet, rows: List[List[Any]], user_entered: bool = False):
+        """
+        以 A1 為左上角，讓工作表內容等於 rows，只寫入與上次不同的儲存格
+
+        沒有影子副本（第一次同步、工作表重建、停用影子副本）時改為清除後完整寫入。
+
+        Args:
+            worksheet: gspread Worksheet
+            rows: 二維數值
+            user_entered: 以 USER_ENTERED 語意寫入（公式會被執行）
+        """
+        rows = [['' if value is None else value for value in row] for row in rows]
+        previous = self._recorded(worksheet.title, worksheet.id, 'rows')
+        self._pending_rows[worksheet.title] = {'sheet_id': worksheet.id, 'rows': rows}
+
+        if previous is None:
+            self._queue_clear(worksheet)
+            self._queue_update(worksheet, 'A1', rows, user_entered)
+            return
+
+        for start_row, start_col, end_row, end_col in diff_rectangles(previous, rows):
+            block = [
+                [_cell(rows, row, col) for col in range(start_col, end_col)]
+                for row in range(start_row, end_row)
+            ]
+            if user_entered:
+                # 空字串以 None 送出，updateCells 會清除該儲存格
+                block = [[value if value != '' else None for value in row] for row in block]
+            self._queue_update(worksheet, _a1_rectangle(start_row, start_col, end_row, end_col),
+                               block, user_entered)
+
+    def observe_column(self, worksheet, col: int, values: List[Any]):
+        """
+        把讀回的線上數值記入影子副本（成員自行編輯的欄位）
+
+        之後的 sync_values 以實際內容比對：合併回來的值與線上相同時不會重寫，
+        成員清掉的值也不會被當成沒變。沒有影子副本時不做任何事（反正會完整重寫）。
+
+        Args:
+            worksheet: gspread Worksheet
+            col: 欄位索引（從 0 開始）
+            values: 從第 1 列起的數值
+        """
+        previous = self._recorded(worksheet.title, worksheet.id, 'rows')
+        if previous is None:
+            return
+        for row, value in enumerate(values):
+            while len(previous) <= row:
+                previous.append([])
+            line = previous[row]
+            while len(line) <= col:
+                line.append('')
+            line[col] = '' if value is None else value
+
+    def clear(self, worksheet):
+        """清除工作表所有數值（保留格式，與 worksheet.clear() 相同）"""
+        self._stale_rows[worksheet.title] = worksheet.id
+        self._queue_clear(worksheet)
+
+    def _queue_clear(self, worksheet):
+        self.requests.append({
+            'updateCells': {
+                'range': {'sheetId': worksheet.id},
+                'fields': 'userEnteredValue'
+            }
+        })
+
+    def update(self, worksheet, a1_start: str, rows: List[List[Any]], user_entered: bool = False):
+        """
+        直接寫入數值（不比對影子副本）
+
+        Args:
+            worksheet: gspread Worksheet
+            a1_start: 左上角儲存格，例如 'A1'
+            rows: 二維數值
+            user_entered: 以 USER_ENTERED 語意寫入（公式會被執行），
+                改由 batchUpdate 的 updateCells 送出
+        """
+        self._stale_rows[worksheet.title] = worksheet.id
+        self._queue_update(worksheet, a1_start, rows, user_entered)
+
+    def _queue_update(self, worksheet, a1_start: str, rows: List[List[Any]], user_entered: bool):
+        if not rows:
+            return
+        self.cells_written += sum(len(row) for row in rows)
+        grid = a1_to_grid_range(a1_start, worksheet.id)
+        self._ensure_grid(
+            worksheet,
+            grid.get('startRowIndex', 0) + len(rows),
+            grid.get('startColumnIndex', 0) + max(len(row) for row in rows)
+        )
+
+        if not user_entered:
+            value_range = {'range': _sheet_range(worksheet.title, a1_start), 'values': rows}
+            self._coalesce_values(self.value_ranges, value_range, 'range', 'values')
+            return
+
+        self._coalesce_values(self.requests, {
+            'updateCells': {
+                'start': {
+                    'sheetId': worksheet.id,
+                    'rowIndex': grid.get('startRowIndex', 0),
+                    'columnIndex': grid.get('startColumnIndex', 0)
+                },
+                'rows': [
+                    {'values': [{'userEnteredValue': _extended_value(value)} for value in row]}
+                    for row in rows
+                ],
+                'fields': 'userEnteredValue'
+            }
+        }, 'start', 'rows')
+
+    def _coalesce_values(self, queue: List[Dict], item: Dict, key: str, block: str):
+        """
+        排入一筆數值寫入；同一起點的舊寫入被新的一筆完整蓋過時直接丟掉舊的
+
+        Args:
+            queue: self.value_ranges 或 self.requests
+            item: {key: 起點, block: 二維數值}（updateCells 請求則包在 'updateCells' 內）
+            key: 起點欄位（'range' 或 'start'）
+            block: 數值欄位（'values' 或 'rows'）
+        """
+        def unwrap(entry):
+            return entry.get('updateCells', entry)
+
+        new = unwrap(item)
+        for index, entry in enumerate(queue):
+            old = unwrap(entry)
+            if key in old and old[key] == new[key] and block in old and _block_covers(new[block], old[block]):
+                del queue[index]
+                self.cells_written -= sum(_row_width(row) for row in old[block])
+                self.coalesced += 1
+                break
+        queue.append(item)
+
+    # ------------------------------------------------------------------
+    # 版面（與上次相同時不送出）
+    # ------------------------------------------------------------------
+
+    def _queue_layout(self, worksheet, request: Dict):
+        layout = self._layout.setdefault(worksheet.title, {'sheet_id': worksheet.id, 'requests': []})
+        # 同一範圍、同一組欄位的設定，後者完全取代前者
+        key = _layout_key(request)
+        for index, queued in enumerate(layout['requests']):
+            if _layout_key(queued) == key:
+                del layout['requests'][index]
+                self.coalesced += 1
+                break
+        layout['requests'].append(request)
+
+    def format(self, worksheet, a1_range: str, cell_format: Dict):
+        """
+        套用儲存格格式（與 worksheet.format() 相同的格式 dict）
+
+        Args:
+            worksheet: gspread Worksheet
+            a1_range: 範圍，例如 'A1:G1'
+            cell_format: CellFormat，例如 {'textFormat': {'bold': True}}
+        """
+        self._queue_layout(worksheet, {
+            'repeatCell': {
+                'range': a1_to_grid_range(a1_range, worksheet.id),
+                'cell': {'userEnteredFormat': cell_format},
+                'fields': 'userEnteredFormat({})'.format(','.join(cell_format.keys()))
+            }
+        })
+
+    def set_data_validation(self, worksheet, a1_range: str, options: List[str], strict: bool = True):
+        """
+        設定下拉選單
+
+        Args:
+            worksheet: gspread Worksheet
+            a1_range: 範圍，例如 'B1'
+            options: 選項
+            strict: 拒絕選項以外的輸入
+        """
+        self._queue_layout(worksheet, {
+            'setDataValidation': {
+                'range': a1_to_grid_range(a1_range, worksheet.id),
+                'rule': {
+                    'condition': {
+                        'type': 'ONE_OF_LIST',
+                        'values': [{'userEnteredValue': option} for option in options]
+                    },
+                    'showCustomUi': True,
+                    'strict': strict
+                }
+            }
+        })
+
+    def set_column_widths(self, worksheet, widths: Dict[int, int]):
+        """
+        設定欄寬
+
+        Args:
+            worksheet: gspread Worksheet
+            widths: {從 0 開始的欄位索引: 像素寬度}
+        """
+        for column, pixels in sorted(widths.items()):
+            self._queue_layout(worksheet, {
+                'updateDimensionProperties': {
+                    'range': {
+                        'sheetId': worksheet.id,
+                        'dimension': 'COLUMNS',
+                        'startIndex': column,
+                        'endIndex': column + 1
+                    },
+                    'properties': {'pixelSize': pixels},
+                    'fields': 'pixelSize'
+                }
+            })
+
+    def hide(self, worksheet, hidden: bool = True):
+        """隱藏（或取消隱藏）工作表"""
+        self._queue_layout(worksheet, {
+            'updateSheetProperties': {
+                'properties': {'sheetId': worksheet.id, 'hidden': hidden},
+                'fields': 'hidden'
+            }
+        })
+
+    def ensure_conditional_formats(self, worksheet, rules: List[Dict]):
+        """
+        確保工作表的條件式格式規則恰好是 rules（依值上色，不必每列各送一次格式）
+
+        規則與影子副本記錄的相同時不做任何事；否則 flush() 時讀取一次線上規則，
+        已相同就只記錄下來，不同才刪除舊規則並依序重建。
+
+        Args:
+            worksheet: gspread Worksheet
+            rules: [{'range': 'B5:B', 'condition': 'TEXT_EQ', 'value': 'S',
+                     'format': {'backgroundColor': {...}}}]
+                condition 為 Sheets API 的 ConditionType（TEXT_EQ、TEXT_STARTS_WITH、
+                NUMBER_GREATER 等）；format 只支援粗體、斜體、刪除線、文字顏色、背景色
+        """
+        self._conditional[worksheet.title] = {
+            'sheet_id': worksheet.id,
+            'rules': [
+                {
+                    'ranges': [a1_to_grid_range(rule['range'], worksheet.id)],
+                    'booleanRule': {
+                        'condition': {
+                            'type': rule['condition'],
+                            'values': [{'userEnteredValue': str(rule['value'])}]
+                        },
+                        'format': rule['format']
+                    }
+                }
+                for rule in rules
+            ]
+        }
+
+    def _live_conditional_formats(self) -> Dict[int, List[Dict]]:
+        """所有工作表目前的條件式格式規則 {sheet_id: [規則]}（與工作表中繼資料一起讀取）"""
+        if self._live_conditional is None:
+            self._sheets = None
+            self.fetch_metadata()
+        return self._live_conditional
+
+    # ------------------------------------------------------------------
+    # 送出
+    # ------------------------------------------------------------------
+
+    def _batch_update(self, requests: List[Dict]):
+        """
+        送出 spreadsheets.batchUpdate
+
+        batchUpdate 是原子操作，但 5xx 時不知道是否已經套用；含 addSheet 的批次
+        直接重送會因工作表已存在回傳 400。這類批次遇到 5xx 先重新讀取中繼資料：
+        新工作表已存在代表整批已套用，不再重送，否則才重試。
+        """
+        added = {request['addSheet']['properties']['sheetId'] for request in requests if 'addSheet' in request}
+        if not added:
+            self.governor.call(WRITE, self.spreadsheet.batch_update, {'requests': requests})
+            self.api_calls += 1
+            return
+
+        for attempt in range(self.governor.MAX_RETRIES + 1):
+            try:
+                self.governor.call(WRITE, self.spreadsheet.batch_update, {'requests': requests},
+                                   retry_server_errors=False)
+                self.api_calls += 1
+                return
+            except Exception as e:
+                if not is_server_error(e) or attempt == self.governor.MAX_RETRIES:
+                    raise
+            time.sleep(self.governor.backoff(attempt))
+
+            metadata = self.governor.call(READ, self.spreadsheet.fetch_sheet_metadata,
+                                          {'fields': 'sheets.properties.sheetId'})
+            self.api_calls += 1
+            if added & {sheet['properties']['sheetId'] for sheet in metadata.get('sheets', [])}:
+                self.api_calls += 1  # 上一次的 batchUpdate 已經套用
+                return
+
+    def flush(self) -> int:
+        """
+        送出佇列中的所有操作並清空佇列
+
+        Returns:
+            實際送出的 HTTP 請求數（0-3，含比對條件式格式時可能需要的一次讀取）
+        """
+        calls_before = self.api_calls
+        requests, self.requests = self._structure + self.requests, []
+        self._structure = []
+        value_ranges, self.value_ranges = self.value_ranges, []
+        pending_rows, self._pending_rows = self._pending_rows, {}
+        stale_rows, self._stale_rows = self._stale_rows, {}
+        layouts, self._layout = self._layout, {}
+        conditionals, self._conditional = self._conditional, {}
+
+        touched = set(pending_rows) | set(stale_rows) | set(layouts) | set(conditionals)
+        recorded = []  # [(工作表名稱, sheet_id, 欄位, 值)]，全部送出成功後寫入影子副本
+        try:
+            for title, layout in layouts.items():
+                signature = _signature(layout['requests'])
+                if self._recorded(title, layout['sheet_id'], 'layout') != signature:
+                    requests.extend(layout['requests'])
+                recorded.append((title, layout['sheet_id'], 'layout', signature))
+
+            unverified = {
+                title: conditional for title, conditional in conditionals.items()
+                if self._recorded(title, conditional['sheet_id'], 'conditional') != _signature(conditional['rules'])
+            }
+            if unverified:
+                live = self._live_conditional_formats()
+                for title, conditional in unverified.items():
+                    sheet_id = conditional['sheet_id']
+                    existing = live.get(sheet_id, [])
+                    if not _covers(conditional['rules'], existing):
+                        requests.extend(
+                            {'deleteConditionalFormatRule': {'sheetId': sheet_id, 'index': index}}
+                            for index in reversed(range(len(existing)))
+                        )
+                        requests.extend(
+                            {'addConditionalFormatRule': {'rule': rule, 'index': index}}
+                            for index, rule in enumerate(conditional['rules'])
+                        )
+                        live[sheet_id] = conditional['rules']
+            for title, conditional in conditionals.items():
+                recorded.append((title, conditional['sheet_id'], 'conditional',
+                                 _signature(conditional['rules'])))
+
+            if requests:
+                self._batch_update(requests)
+            if value_ranges:
+                self.governor.call(WRITE, self.spreadsheet.values_batch_update, {
+                    'valueInputOption': 'RAW',
+                    'data': value_ranges
+                })
+                self.api_calls += 1
+        except Exception:
+            # 寫到一半失敗時工作表狀態未知：捨棄相關影子副本並重新讀取中繼資料，下次完整重寫
+            shadow = self._load_shadow()
+            for title in touched:
+                shadow.pop(title, None)
+            self._save_shadow(touched)
+            self._sheets = None
+            self._live_conditional = None
+            raise
+
+        for handle in (self._sheets or {}).values():
+            handle.created = False
+
+        for title, entry in pending_rows.items():
+            self._shadow_entry(title, entry['sheet_id'])['rows'] = entry['rows']
+        # 同一批次中直接 clear()/update() 過的工作表無法確定內容，不保留數值影子副本
+        for title, sheet_id in stale_rows.items():
+            self._shadow_entry(title, sheet_id).pop('rows', None)
+        for title, sheet_id, key, value in recorded:
+            self._shadow_entry(title, sheet_id)[key] = value
+
+        self._save_shadow(touched)
+        return self.api_calls - calls_before
+
+
 class GoogleSheetsSync:
     """Google Sheets 同步管理器"""
 
@@ -46,6 +878,9 @@ class GoogleSheetsSync:
         self.spreadsheet_id = spreadsheet_id
         self.client = None
         self.spreadsheet = None
+        self.governor = get_default_governor()
+        self.shadow_dir = DEFAULT_SHADOW_DIR
+        self._writer: Optional[SheetsBatchWriter] = None
 
     def authenticate(self):
         """
@@ -81,34 +916,41 @@ class GoogleSheetsSync:
         spreadsheet_id = spreadsheet_id or self.spreadsheet_id
 
         try:
-            self.spreadsheet = self.client.open_by_key(spreadsheet_id)
+            self.spreadsheet = self.governor.call(READ, self.client.open_by_key, spreadsheet_id)
             print(f"✅ 已連接到: {self.spreadsheet.title}")
             return True
         except Exception as e:
             print(f"❌ 無法連接到 Spreadsheet: {e}")
             return False
 
-    def update_roster_sheet(self, roster_data: Dict):
+    def batch_writer(self) -> SheetsBatchWriter:
+        """取得目前 Spreadsheet 的批次寫入器（同一連線共用，工作表中繼資料只讀一次）"""
+        if self._writer is None or self._writer.spreadsheet is not self.spreadsheet:
+            self._writer = SheetsBatchWriter(self.spreadsheet, shadow_dir=self.shadow_dir, governor=self.governor)
+        return self._writer
+
+    def _flush(self, writer: SheetsBatchWriter, owned: bool):
+        """自行建立的寫入器立即送出；呼叫端傳入的寫入器由呼叫端 flush()"""
+        if owned:
+            writer.flush()
+
+    def update_roster_sheet(self, roster_data: Dict, writer: Optional[SheetsBatchWriter] = None):
         """
         更新陣容分頁
 
         Args:
             roster_data: 陣容數據字典
+            writer: 批次寫入器；未提供時立即送出
         """
         if not self.spreadsheet:
             print("請先連接到 Spreadsheet")
             return False
 
         try:
+            owned = writer is None
+            writer = writer or self.batch_writer()
             # 獲取或建立 "Roster" 分頁
-            try:
-                worksheet = self.spreadsheet.worksheet("Roster")
-            except:
-                worksheet = self.spreadsheet.add_worksheet(
-                    title="Roster",
-                    rows=100,
-                    cols=20
-                )
+            worksheet = writer.worksheet("Roster", rows=100, cols=20)
 
             # 準備表頭
             headers = [
@@ -139,14 +981,14 @@ class GoogleSheetsSync:
                 data.append(row)
 
             # 更新資料
-            worksheet.clear()
-            worksheet.update('A1', data)
+            writer.sync_values(worksheet, data)
 
             # 格式化
-            worksheet.format('A1:M1', {
+            writer.format(worksheet, 'A1:M1', {
                 'backgroundColor': {'red': 0.2, 'green': 0.6, 'blue': 0.9},
                 'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
             })
+            self._flush(writer, owned)
 
             print("✅ Roster 分頁已更新")
             return True
@@ -155,26 +997,22 @@ class GoogleSheetsSync:
             print(f"❌ 更新 Roster 失敗: {e}")
             return False
 
-    def update_matchup_sheet(self, matchup_data: Dict):
+    def update_matchup_sheet(self, matchup_data: Dict, writer: Optional[SheetsBatchWriter] = None):
         """
         更新對戰分頁
 
         Args:
             matchup_data: 對戰數據
+            writer: 批次寫入器；未提供時立即送出
         """
         if not self.spreadsheet:
             print("請先連接到 Spreadsheet")
             return False
 
         try:
-            try:
-                worksheet = self.spreadsheet.worksheet("Matchup")
-            except:
-                worksheet = self.spreadsheet.add_worksheet(
-                    title="Matchup",
-                    rows=50,
-                    cols=15
-                )
+            owned = writer is None
+            writer = writer or self.batch_writer()
+            worksheet = writer.worksheet("Matchup", rows=50, cols=15)
 
             # 表頭
             headers = [
@@ -207,8 +1045,8 @@ class GoogleSheetsSync:
             ]
             data.append(row)
 
-            worksheet.clear()
-            worksheet.update('A1', data)
+            writer.sync_values(worksheet, data)
+            self._flush(writer, owned)
 
             print("✅ Matchup 分頁已更新")
             return True
@@ -217,25 +1055,21 @@ class GoogleSheetsSync:
             print(f"❌ 更新 Matchup 失敗: {e}")
             return False
 
-    def update_analysis_sheet(self, analysis: Dict):
+    def update_analysis_sheet(self, analysis: Dict, writer: Optional[SheetsBatchWriter] = None):
         """
         更新分析結果分頁
 
         Args:
             analysis: 陣容分析結果
+            writer: 批次寫入器；未提供時立即送出
         """
         if not self.spreadsheet:
             return False
 
         try:
-            try:
-                worksheet = self.spreadsheet.worksheet("Analysis")
-            except:
-                worksheet = self.spreadsheet.add_worksheet(
-                    title="Analysis",
-                    rows=30,
-                    cols=10
-                )
+            owned = writer is None
+            writer = writer or self.batch_writer()
+            worksheet = writer.worksheet("Analysis", rows=30, cols=10)
 
             # 建立報告
             data = [
@@ -260,8 +1094,8 @@ class GoogleSheetsSync:
             for suggestion in analysis.get('suggestions', []):
                 data.append([suggestion.get('issue', ''), suggestion.get('recommendation', '')])
 
-            worksheet.clear()
-            worksheet.update('A1', data)
+            writer.sync_values(worksheet, data)
+            self._flush(writer, owned)
 
             print("✅ Analysis 分頁已更新")
             return True
@@ -284,13 +1118,14 @@ class GoogleSheetsSync:
             "Schedule"      # 賽程
         ]
 
+        # 缺少的分頁在同一個 batchUpdate 中一次建立
+        writer = self.batch_writer()
         for sheet_name in sheets_to_create:
-            try:
-                self.spreadsheet.worksheet(sheet_name)
-                print(f"  ✓ {sheet_name} 已存在")
-            except:
-                self.spreadsheet.add_worksheet(title=sheet_name, rows=100, cols=20)
+            if writer.worksheet(sheet_name, rows=100, cols=20).created:
                 print(f"  + 建立 {sheet_name}")
+            else:
+                print(f"  ✓ {sheet_name} 已存在")
+        writer.flush()
 
         print("✅ 儀表板建立完成")
 
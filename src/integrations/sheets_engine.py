@@ -0,0 +1,275 @@
+"""
+Google Sheets 同步引擎
+
+一次認證、一次載入聯盟數據，依 config/sheets_engine.json 渲染所有 Spreadsheet 的工作表，
+再以執行緒池同時送出各 Spreadsheet 的批次更新（每個 Spreadsheet 各自一個 SheetsBatchWriter）。
+
+渲染在主執行緒依序進行（LeagueStore 的 SQLite 連線不跨執行緒），
+執行緒只負責網路 I/O：open_by_key → 讀中繼資料 → batchUpdate。
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .google_sheets_sync import DEFAULT_SHADOW_DIR, GSPREAD_AVAILABLE, GoogleSheetsSync, SheetsBatchWriter
+from .sheets_quota import READ, get_default_governor
+from .sheets_user_columns import DEFAULT_USER_COLUMNS_DIR, UserColumnCache
+from .sheets_views import VIEW_GROUPS, Rendered, SheetView, ViewContext, ViewDataError
+
+if GSPREAD_AVAILABLE:
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+
+DEFAULT_ENGINE_CONFIG = 'config/sheets_engine.json'
+
+SPREADSHEET_ID_PLACEHOLDER = "請建立新的 Google Sheets 並填入 ID"
+
+
+@dataclass
+class SpreadsheetTarget:
+    """一個 Spreadsheet 及要同步到它的工作表群組"""
+    name: str
+    spreadsheet_id: str
+    config: Dict
+    groups: List[str]
+
+
+@dataclass
+class SyncResult:
+    """單一 Spreadsheet 的同步結果"""
+    name: str
+    title: str = ''
+    url: str = ''
+    synced: List[Tuple[str, str]] = field(default_factory=list)  # [(工作表, 摘要)]
+    skipped: List[str] = field(default_factory=list)             # 數據缺失而略過的群組
+    api_calls: int = 0
+    cells_written: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+def load_targets(engine_config: Dict) -> List[SpreadsheetTarget]:
+    """
+    依引擎設定載入各 Spreadsheet 的設定檔（SheetsEngine 與 XLSX 匯出共用）
+
+    Raises:
+        ValueError: 設定了未知的工作表群組
+    """
+    targets = []
+    for entry in engine_config['spreadsheets']:
+        with open(entry['config'], 'r', encoding='utf-8') as f:
+            sheets_config = json.load(f)
+
+        unknown = [group for group in entry['groups'] if group not in VIEW_GROUPS]
+        if unknown:
+            raise ValueError(f"{entry['config']}: 未知的工作表群組 {', '.join(unknown)}")
+
+        targets.append(SpreadsheetTarget(
+            name=entry['name'],
+            spreadsheet_id=sheets_config['spreadsheet_id'],
+            config=sheets_config,
+            groups=list(entry['groups'])
+        ))
+    return targets
+
+
+class SheetsEngine:
+    """
+    多 Spreadsheet 同步引擎
+
+    使用方式:
+        engine = SheetsEngine()
+        results = engine.run(groups=['league_shared', 'my_team'])
+    """
+
+    def __init__(self, config_path: str = DEFAULT_ENGINE_CONFIG, max_workers: Optional[int] = None,
+                 shadow_dir: Optional[str] = DEFAULT_SHADOW_DIR,
+                 user_columns_dir: Optional[str] = DEFAULT_USER_COLUMNS_DIR):
+        """
+        Args:
+            config_path: 引擎設定檔
+            max_workers: 同時送出的 Spreadsheet 數（預設取設定檔）
+            shadow_dir: 寫入器的影子副本目錄（效能測試指向暫存目錄）
+            user_columns_dir: 成員編輯欄位的快取目錄
+        """
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        self.max_workers = max_workers or self.config.get('max_workers', 3)
+        self.shadow_dir = shadow_dir
+        self.user_columns_dir = user_columns_dir
+        self.client = None
+        self.governor = get_default_governor()  # 所有執行緒共用同一份 API 額度
+        self.targets = load_targets(self.config)
+
+    def authenticate(self):
+        """以 Service Account 認證（整個同步只做一次，所有 Spreadsheet 共用同一個 client）"""
+        if self.client is not None:
+            return self.client
+        if not GSPREAD_AVAILABLE:
+            raise ImportError("請先安裝: pip install gspread google-auth")
+
+        credentials = Credentials.from_service_account_file(
+            self.config['service_account_file'],
+            scopes=GoogleSheetsSync.SCOPES
+        )
+        self.client = gspread.authorize(credentials)
+        return self.client
+
+    def render(self, ctx: ViewContext, target: SpreadsheetTarget,
+               groups: Optional[List[str]] = None) -> Tuple[List[Tuple[SheetView, Rendered]], SyncResult]:
+        """
+        渲染一個 Spreadsheet 的工作表（主執行緒）
+
+        數據缺失的群組整組略過，其他群組照常同步。
+
+        Returns:
+            ([(工作表定義, 渲染結果)], 同步結果)
+        """
+        result = SyncResult(name=target.name)
+        rendered = []
+
+        for group in target.groups:
+            if groups is not None and group not in groups:
+                continue
+            try:
+                group_views = [(view, view.render(ctx)) for view in VIEW_GROUPS[group](target.config)]
+            except ViewDataError as e:
+                print(f"⚠️  {target.name}/{group} 略過: {e}")
+                result.skipped.append(group)
+                continue
+            rendered.extend(group_views)
+
+        return rendered, result
+
+    def push(self, target: SpreadsheetTarget, rendered: List[Tuple[SheetView, Rendered]],
+             result: SyncResult) -> SyncResult:
+        """把渲染好的工作表排入同一個寫入器並送出（在工作執行緒執行）"""
+        try:
+            spreadsheet = self.governor.call(READ, self.client.open_by_key, target.spreadsheet_id)
+            result.title = spreadsheet.title
+            result.url = spreadsheet.url
+
+            writer = SheetsBatchWriter(spreadsheet, shadow_dir=self.shadow_dir, governor=self.governor)
+
+            # 成員在表上填的欄位（備註等）：重寫前讀回並合併，最多多一次 batchGet
+            user_views = [(view, content) for view, content in rendered if view.user_columns]
+            user_cache = UserColumnCache(target.spreadsheet_id, self.user_columns_dir)
+            if user_views:
+                user_cache.read_back(spreadsheet, writer, user_views, self.governor)
+                for view, content in user_views:
+                    user_cache.merge(view, content)
+
+            for view, content in rendered:
+                handle = writer.worksheet(view.title, rows=view.rows, cols=view.cols)
+                writer.sync_values(handle, content.rows, user_entered=view.user_entered)
+                for a1_range, cell_format in view.formats + content.formats:
+                    writer.format(handle, a1_range, cell_format)
+                for a1_range, options in content.validations:
+                    writer.set_data_validation(handle, a1_range, options)
+                if view.column_widths:
+                    writer.set_column_widths(handle, view.column_widths)
+                if view.conditional:
+                    writer.ensure_conditional_formats(handle, view.conditional)
+                if view.hidden:
+                    writer.hide(handle)
+                result.synced.append((view.title, content.summary))
+
+            writer.flush()
+            user_cache.save(user_views)
+            result.api_calls = writer.api_calls + user_cache.api_calls + 1  # 含 open_by_key
+            result.cells_written = writer.cells_written
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def run(self, groups: Optional[List[str]] = None, now: Optional[datetime] = None) -> List[SyncResult]:
+        """
+        同步所有（或指定群組的）Spreadsheet
+
+        Args:
+            groups: 只同步這些工作表群組（None = 全部）
+            now: 工作表上顯示的更新時間（預設為現在；效能測試固定時間以便比對）
+
+        Returns:
+            每個 Spreadsheet 的同步結果
+        """
+        selected = [
+            target for target in self.targets
+            if groups is None or any(group in groups for group in target.groups)
+        ]
+        for target in selected:
+            if target.spreadsheet_id == SPREADSHEET_ID_PLACEHOLDER:
+                raise ValueError(f"{target.name}: 尚未設定 Spreadsheet ID")
+
+        # 渲染：所有工作表共用同一份數據
+        ctx = ViewContext(now=now or datetime.now())
+        try:
+            jobs = [(target, *self.render(ctx, target, groups)) for target in selected]
+        finally:
+            ctx.close()
+
+        self.authenticate()
+
+        # 送出：每個 Spreadsheet 一個工作執行緒
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(self.push, target, rendered, result)
+                for target, rendered, result in jobs
+            ]
+            return [future.result() for future in futures]
+
+
+def run_sync(groups: Optional[List[str]] = None, banner: str = 'Google Sheets 同步',
+             config_path: str = DEFAULT_ENGINE_CONFIG, max_workers: Optional[int] = None) -> int:
+    """
+    命令列入口：執行同步並印出結果
+
+    Returns:
+        結束代碼（任一 Spreadsheet 失敗或有群組被略過時為 1）
+    """
+    print("=" * 80)
+    print(f"  {banner}")
+    print("=" * 80)
+    print()
+    print(f"同步時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        engine = SheetsEngine(config_path, max_workers=max_workers)
+        results = engine.run(groups)
+    except (ValueError, ImportError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for result in results:
+        if result.error:
+            print(f"❌ {result.name}: {result.error}")
+            print()
+            continue
+
+        print(f"📊 {result.title}: {result.url}")
+        for title, summary in result.synced:
+            print(f"  • {title}" + (f" - {summary}" if summary else ""))
+        print(f"  ✅ 共 {result.api_calls} 個 API 請求，寫入 {result.cells_written} 格")
+        print()
+
+    print(engine.governor.summary())
+    print()
+
+    print("=" * 80)
+    if all(result.ok for result in results):
+        print("  同步完成！")
+    else:
+        print("  同步完成（部分失敗）")
+    print("=" * 80)
+    print()
+
+    return 0 if all(result.ok for result in results) else 1
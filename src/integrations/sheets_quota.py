@@ -0,0 +1,242 @@
+"""
+Google Sheets API 額度控管
+
+所有 Sheets API 呼叫都經過這裡：
+1. 依「每位使用者每分鐘」的讀取與寫入額度分別計數（滑動視窗，
+   src/api/rate_limit.py 與 Yahoo 的 token bucket 共用同一套機制），
+   狀態存在檔案中，同一台機器上接連或同時執行的同步腳本共用額度
+2. 超過額度的請求排隊等待，直到視窗內有空位
+3. 429 與 5xx 回應以指數退避加隨機抖動重試（有 Retry-After 時照它等）；
+   只依實際的 HTTP 狀態碼或 RESOURCE_EXHAUSTED 判斷，不比對訊息中的數字
+4. 記錄請求數、排隊等待、重試次數等指標
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..api.rate_limit import SlidingWindow, http_status
+
+
+READ = 'read'
+WRITE = 'write'
+
+# 視窗長度（秒）
+WINDOW_SECONDS = 60.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class QuotaExceededError(Exception):
+    """Sheets API 持續回傳 429 / 5xx，重試後仍失敗"""
+
+
+# 額度用完時 Google API 錯誤內容的 status
+QUOTA_REASON = 'RESOURCE_EXHAUSTED'
+
+def _error_reason(error: Exception) -> Optional[str]:
+    """Google API 錯誤內容的 status（例如 RESOURCE_EXHAUSTED），沒有時回傳 None"""
+    details = getattr(error, 'error', None)
+    if isinstance(details, dict):
+        return details.get('status')
+    return QUOTA_REASON if QUOTA_REASON in str(error) else None
+
+
+def is_server_error(error: Exception) -> bool:
+    """5xx：請求可能已經套用，只是回應失敗"""
+    status = http_status(error)
+    return status is not None and status >= 500
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """判斷例外是否為可重試的限流或伺服器錯誤"""
+    status = http_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return _error_reason(error) == QUOTA_REASON
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """回應的 Retry-After 標頭（秒）"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class KindMetrics:
+    """讀取或寫入的統計"""
+
+    requests: int = 0
+    throttled: int = 0
+    throttle_seconds: float = 0.0
+    retries: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class QuotaMetrics:
+    """額度控管統計"""
+
+    kinds: Dict[str, KindMetrics] = field(
+        default_factory=lambda: {READ: KindMetrics(), WRITE: KindMetrics()}
+    )
+
+    def to_dict(self) -> Dict:
+        """轉換為字典格式"""
+        return {
+            kind: {
+                'requests': m.requests,
+                'throttled': m.throttled,
+                'throttle_seconds': round(m.throttle_seconds, 2),
+                'retries': m.retries,
+                'errors': m.errors,
+                'last_error': m.last_error
+            }
+            for kind, m in self.kinds.items()
+        }
+
+
+class QuotaGovernor:
+    """
+    Sheets API 額度控管
+
+    多個執行緒（SheetsEngine 同時送出多個 Spreadsheet）共用同一個實例；
+    每次呼叫先在對應的視窗取得空位，額度用完時排隊等待，
+    429 / 5xx 以指數退避加抖動重試。
+    """
+
+    # Sheets API 預設額度：每位使用者每分鐘 60 次讀取、60 次寫入
+    DEFAULT_READS_PER_MINUTE = 60
+    DEFAULT_WRITES_PER_MINUTE = 60
+
+    MAX_RETRIES = 5
+    BASE_BACKOFF_SECONDS = 1.0
+    MAX_BACKOFF_SECONDS = 64.0
+
+    def __init__(
+        self,
+        reads_per_minute: int = DEFAULT_READS_PER_MINUTE,
+        writes_per_minute: int = DEFAULT_WRITES_PER_MINUTE,
+        state_file: Optional[Path] = None
+    ):
+        """
+        初始化額度控管
+
+        Args:
+            reads_per_minute: 每分鐘讀取請求數
+            writes_per_minute: 每分鐘寫入請求數
+            state_file: 跨行程共用的視窗狀態檔
+        """
+        self.window = SlidingWindow(
+            {READ: reads_per_minute, WRITE: writes_per_minute}, state_file, window_seconds=WINDOW_SECONDS
+        )
+        self.metrics = QuotaMetrics()
+        self._metrics_lock = threading.Lock()
+
+    def acquire(self, kind: str) -> float:
+        """
+        取得一次請求額度，必要時等待
+
+        Returns:
+            等待的秒數
+        """
+        waited = self.window.acquire(kind)
+        if waited > 0:
+            with self._metrics_lock:
+                self.metrics.kinds[kind].throttled += 1
+                self.metrics.kinds[kind].throttle_seconds += waited
+        return waited
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次重試前的等待秒數（指數退避，抖動取一半到全額之間）"""
+        delay = min(self.MAX_BACKOFF_SECONDS, self.BASE_BACKOFF_SECONDS * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def call(self, kind: str, fn: Callable[..., Any], *args,
+             retry_server_errors: bool = True, **kwargs) -> Any:
+        """
+        在額度內執行一次 API 呼叫
+
+        Args:
+            kind: READ 或 WRITE
+            fn: 實際發出請求的函式
+            retry_server_errors: 5xx 時是否重送；不能重複套用的請求（含 addSheet 的
+                batchUpdate）傳 False，由呼叫端確認是否已套用。429 一律重試（請求未被執行）
+
+        Returns:
+            fn 的回傳值
+
+        Raises:
+            QuotaExceededError: 429 / 5xx 重試 MAX_RETRIES 次後仍失敗
+        """
+        metrics = self.metrics.kinds[kind]
+        with self._metrics_lock:
+            metrics.requests += 1
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.acquire(kind)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable_error(e) and (retry_server_errors or not is_server_error(e))
+                with self._metrics_lock:
+                    metrics.last_error = str(e)[:200]
+                    if not retryable or attempt == self.MAX_RETRIES:
+                        metrics.errors += 1
+                    else:
+                        metrics.retries += 1
+                if not retryable:
+                    raise
+                if attempt == self.MAX_RETRIES:
+                    raise QuotaExceededError(
+                        f"Sheets API {http_status(e) or ''} 重試 {attempt} 次後仍失敗: {e}"
+                    ) from e
+
+                wait = retry_after(e) or self.backoff(attempt)
+                if not is_server_error(e):
+                    # 額度用完（429 / RESOURCE_EXHAUSTED）：其他執行緒與行程也一起暫停
+                    self.window.penalize(wait)
+                else:
+                    time.sleep(wait)
+
+    def summary(self) -> str:
+        """產生可列印的統計摘要"""
+        lines = ["Sheets API 請求統計"]
+        for kind, m in self.metrics.kinds.items():
+            if m.requests == 0:
+                continue
+            lines.append(
+                f"  {kind}: {m.requests} 次請求, 額度等待 {m.throttled} 次 ({m.throttle_seconds:.1f}s), "
+                f"重試 {m.retries}, 錯誤 {m.errors}"
+            )
+            if m.last_error and m.errors:
+                lines.append(f"    最後錯誤: {m.last_error}")
+        return '\n'.join(lines)
+
+
+_default_governor: Optional[QuotaGovernor] = None
+_default_governor_lock = threading.Lock()
+
+
+def get_default_governor() -> QuotaGovernor:
+    """
+    取得行程內共用的額度控管
+
+    視窗狀態存在 data/cache/sheets_quota.json，與其他行程共用。
+    """
+    global _default_governor
+    with _default_governor_lock:
+        if _default_governor is None:
+            project_root = Path(__file__).parent.parent.parent
+            _default_governor = QuotaGovernor(
+                state_file=project_root / "data" / "cache" / "sheets_quota.json"
+            )
+        return _default_governor
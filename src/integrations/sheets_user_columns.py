@@ -0,0 +1,154 @@
+"""
+成員自行編輯欄位的讀回快取
+
+共享工作表裡有些欄位是給成員填寫的（例如對戰表的「備註」），同步重寫時會被清掉。
+每次同步前以一次 values.batchGet 讀回這些欄位，依上次寫入時每列的穩定 ID
+（Rendered.row_keys，例如 'W5:3-8'）存進本機快取，重寫時再合併回對應的列，
+即使隊伍順序改變、工作表被清除重建也不會對錯列。
+
+快取檔: data/cache/sheets_user_columns/<spreadsheet_id>.json
+    {工作表名稱: {'row_keys': [...上次寫入時每列的 ID...], 'values': {欄位字母: {列 ID: 數值}}}}
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..storage.artifacts import file_lock, write_json_artifact
+from .google_sheets_sync import SheetsBatchWriter, a1_to_grid_range
+from .sheets_quota import READ, QuotaGovernor
+from .sheets_views import Rendered, SheetView
+
+
+DEFAULT_USER_COLUMNS_DIR = 'data/cache/sheets_user_columns'
+
+
+def _column_index(letter: str) -> int:
+    return a1_to_grid_range(f'{letter}1', 0)['startColumnIndex']
+
+
+class UserColumnCache:
+    """
+    一個 Spreadsheet 的使用者欄位快取
+
+    用法（SheetsEngine.push）：
+        cache = UserColumnCache(spreadsheet.id)
+        cache.read_back(spreadsheet, writer, views)   # 最多一次 batchGet
+        cache.merge(view, content)                   # sync_values 之前
+        ... writer.flush() ...
+        cache.save(views)
+    """
+
+    def __init__(self, spreadsheet_id: str, cache_dir: Optional[str] = DEFAULT_USER_COLUMNS_DIR):
+        """
+        Args:
+            spreadsheet_id: Spreadsheet ID
+            cache_dir: 快取目錄；None 時只在記憶體中（不跨次同步保留）
+        """
+        self.path = Path(cache_dir) / f'{spreadsheet_id}.json' if cache_dir else None
+        self.sheets: Dict[str, Dict] = self._read_file()
+        self.api_calls = 0
+
+    def _read_file(self) -> Dict[str, Dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def read_back(self, spreadsheet, writer: SheetsBatchWriter,
+                  views: List[Tuple[SheetView, Rendered]], governor: QuotaGovernor) -> int:
+        """
+        以一次 values.batchGet 讀回所有工作表的使用者欄位，更新快取
+
+        只讀上次同步寫過（有記錄 row_keys）且目前仍存在的工作表；都沒有時不發出請求。
+        讀回的值同時記入寫入器的影子副本，合併回去的值與線上相同時不會重寫。
+
+        Returns:
+            讀回的數值數
+        """
+        live_sheets = writer.fetch_metadata()
+        ranges = []
+        for view, _ in views:
+            entry = self.sheets.get(view.title)
+            if not entry or not entry.get('row_keys') or view.title not in live_sheets:
+                continue
+            last_row = len(entry['row_keys'])
+            for letter in view.user_columns:
+                ranges.append((view.title, letter, f"'{view.title}'!{letter}1:{letter}{last_row}"))
+        if not ranges:
+            return 0
+
+        response = governor.call(
+            READ, spreadsheet.values_batch_get,
+            [a1_range for _, _, a1_range in ranges],
+            params={'valueRenderOption': 'UNFORMATTED_VALUE'}
+        )
+        self.api_calls += 1
+
+        absorbed = 0
+        for (title, letter, _), value_range in zip(ranges, response.get('valueRanges', [])):
+            entry = self.sheets[title]
+            keys = entry['row_keys']
+            # values.get 會去掉尾端空白列，補回與上次寫入相同的長度
+            live = [row[0] if row else '' for row in value_range.get('values', [])]
+            live += [''] * (len(keys) - len(live))
+
+            stored = entry.setdefault('values', {}).setdefault(letter, {})
+            for key, value in zip(keys, live):
+                if key is None:
+                    continue
+                if value == '':
+                    stored.pop(key, None)  # 成員清掉了
+                else:
+                    stored[key] = value
+                    absorbed += 1
+            writer.observe_column(live_sheets[title], _column_index(letter), live)
+        return absorbed
+
+    def merge(self, view: SheetView, content: Rendered) -> int:
+        """
+        把快取的使用者數值填回渲染結果（只填 render 留空的儲存格）
+
+        Returns:
+            填回的儲存格數
+        """
+        values = self.sheets.get(view.title, {}).get('values', {})
+        merged = 0
+        for letter in view.user_columns:
+            stored = values.get(letter, {})
+            col = _column_index(letter)
+            for row, key in enumerate(content.row_keys):
+                value = stored.get(key) if key is not None else None
+                if value in (None, '') or row >= len(content.rows):
+                    continue
+                line = content.rows[row]
+                line.extend([''] * (col + 1 - len(line)))
+                if line[col] in (None, ''):
+                    line[col] = value
+                    merged += 1
+        return merged
+
+    def save(self, views: List[Tuple[SheetView, Rendered]]):
+        """
+        記錄這次寫入時每列的 ID 並寫回快取檔（在 flush 成功之後呼叫）
+
+        week_scoped_rows 的工作表只保留目前各列的數值，快取不會隨週次累積。
+        """
+        for view, content in views:
+            entry = self.sheets.setdefault(view.title, {})
+            entry['row_keys'] = list(content.row_keys)
+            if view.week_scoped_rows:
+                current = {key for key in content.row_keys if key is not None}
+                for stored in entry.get('values', {}).values():
+                    for key in [key for key in stored if key not in current]:
+                        del stored[key]
+        if not self.path or not views:
+            return
+        with file_lock(str(self.path)):
+            on_disk = self._read_file()
+            on_disk.update({view.title: self.sheets[view.title] for view, _ in views})
+            write_json_artifact(str(self.path), on_disk, manifest=False)
+        self.sheets = on_disk
@@ -0,0 +1,1247 @@
+"""
+Google Sheets 工作表定義
+
+每張工作表是一個 SheetView：名稱、格線大小、固定格式、條件式格式，
+以及從 ViewContext 產生內容的 render 函式。同一個 Spreadsheet 的工作表
+依「群組」（原本的 sync_*.py 腳本）組織，由 sheets_engine 統一認證、載入數據與送出。
+
+群組：
+    league_shared          聯盟共享 Sheets（原 sync_league_shared.py）
+    league_insights        聯盟洞察（原 sync_league_insights.py）
+    advanced_trade_value   進階交易價值（原 sync_advanced_trade_value.py）
+    my_team                個人球隊（原 sync_my_team.py）
+    roster_summary         陣容摘要（原 sync_to_sheets.py）
+    league_overview        聯盟總覽（原 sync_league_to_sheets.py）
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..storage import LeagueStore
+
+
+# ============================================================================
+# 共用格式
+# ============================================================================
+
+BLUE = {"red": 0.2, "green": 0.4, "blue": 0.8}
+WHITE = {"red": 1, "green": 1, "blue": 1}
+
+# 第 2 行的大標題
+BANNER = {
+    "backgroundColor": BLUE,
+    "textFormat": {"bold": True, "foregroundColor": WHITE, "fontSize": 14},
+    "horizontalAlignment": "CENTER"
+}
+
+# 第 1 行就是欄位標題的表格
+HEADER_BLUE = {
+    "backgroundColor": BLUE,
+    "textFormat": {"bold": True, "foregroundColor": WHITE},
+    "horizontalAlignment": "CENTER"
+}
+
+HEADER_GREY = {
+    "backgroundColor": {"red": 0.7, "green": 0.7, "blue": 0.7},
+    "textFormat": {"bold": True},
+    "horizontalAlignment": "CENTER"
+}
+
+HEADER_LIGHT = {
+    "backgroundColor": {"red": 0.8, "green": 0.8, "blue": 0.8},
+    "textFormat": {"bold": True},
+    "horizontalAlignment": "CENTER"
+}
+
+SUBTITLE = {"textFormat": {"bold": True, "fontSize": 12}}
+SECTION = {"textFormat": {"bold": True, "fontSize": 14}}
+
+
+# ============================================================================
+# 定義
+# ============================================================================
+
+class ViewDataError(Exception):
+    """工作表需要的數據不存在或不完整"""
+    pass
+
+
+@dataclass
+class Rendered:
+    """
+    render 函式的結果
+
+    Attributes:
+        rows: 從 A1 開始的二維數值
+        formats: 依數據而變的格式 [(範圍, 格式)]，套用在 SheetView.formats 之後
+        validations: 下拉選單 [(範圍, 選項)]
+        summary: 完成訊息（例如「14 支隊伍」）
+        row_keys: 每列的穩定 ID（team_id、player_id 等），SheetView.user_columns 依此對應回正確的列；
+            None 或超出長度的列不保留使用者編輯
+    """
+    rows: List[List[Any]]
+    formats: List[Tuple[str, Dict]] = field(default_factory=list)
+    validations: List[Tuple[str, List[str]]] = field(default_factory=list)
+    summary: str = ''
+    row_keys: List[Optional[str]] = field(default_factory=list)
+
+
+@dataclass
+class SheetView:
+    """
+    一張工作表的宣告式定義
+
+    Attributes:
+        title: 工作表名稱
+        render: 產生內容的函式 (ViewContext) -> Rendered
+        rows: 建立時的列數
+        cols: 建立時的欄數
+        formats: 固定格式 [(範圍, 格式)]
+        conditional: 條件式格式規則（SheetsBatchWriter.ensure_conditional_formats 的格式）
+        column_widths: {欄位索引: 像素寬度}
+        hidden: 隱藏工作表
+        user_entered: 以 USER_ENTERED 寫入（內容含公式）
+        user_columns: 成員在表上自行填寫的欄位（欄位字母，例如 ['D']），
+            同步前讀回、依 Rendered.row_keys 快取，重寫時合併回去；render 應在這些欄位留空
+        week_scoped_rows: 每列只屬於當週（row_keys 含週次，例如 'W5:3-8'），
+            快取只保留目前各列的數值，過去週次的值在換週後丟棄
+    """
+    title: str
+    render: Callable[['ViewContext'], Rendered]
+    rows: int = 100
+    cols: int = 20
+    formats: List[Tuple[str, Dict]] = field(default_factory=list)
+    conditional: List[Dict] = field(default_factory=list)
+    column_widths: Dict[int, int] = field(default_factory=dict)
+    hidden: bool = False
+    user_entered: bool = False
+    user_columns: List[str] = field(default_factory=list)
+    week_scoped_rows: bool = False
+
+
+# 數據檔 → 產生它的腳本（找不到時的提示）
+DATA_SOURCES = {
+    'data/league_insights.json': 'generate_league_insights.py',
+    'data/advanced_trade_value.json': 'generate_advanced_trade_value.py',
+    'data/league_data.json': 'get_league_data.py',
+    'data/my_roster_full.json': 'get_my_roster.py',
+}
+
+
+class ViewContext:
+    """
+    所有工作表共用的數據來源（每次同步只載入一次）
+
+    render 函式在主執行緒依序執行，不需要考慮 SQLite 連線跨執行緒的問題。
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        """
+        Args:
+            now: 同步時間（所有工作表的「更新時間」一致）
+        """
+        self.now = now or datetime.now()
+        self._store: Optional[LeagueStore] = None
+        self._json: Dict[str, Any] = {}
+        self._memo: Dict[str, Any] = {}
+
+    @property
+    def store(self) -> LeagueStore:
+        """聯盟數據庫"""
+        if self._store is None:
+            self._store = LeagueStore.open()
+        return self._store
+
+    def load_json(self, path: str) -> Any:
+        """
+        讀取 JSON 數據檔（快取）
+
+        Raises:
+            ViewDataError: 檔案不存在
+        """
+        if path not in self._json:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._json[path] = json.load(f)
+            except FileNotFoundError:
+                hint = DATA_SOURCES.get(path)
+                message = f"找不到 {path}"
+                if hint:
+                    message += f"，請先執行: python3 {hint}"
+                raise ViewDataError(message)
+        return self._json[path]
+
+    def memo(self, key: str, factory: Callable[[], Any]) -> Any:
+        """多張工作表共用的計算結果只算一次"""
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+def _blank(width: int) -> List[str]:
+    return [""] * width
+
+
+def _title_row(text: str, width: int) -> List[str]:
+    return [text] + [""] * (width - 1)
+
+
+def _bind(render: Callable[[ViewContext, Dict], Rendered], config: Dict) -> Callable[[ViewContext], Rendered]:
+    return lambda ctx: render(ctx, config)
+
+
+# ============================================================================
+# 群組: league_shared（聯盟共享 Sheets）
+# ============================================================================
+
+def _league_basics(ctx: ViewContext) -> Dict:
+    def build():
+        meta = ctx.store.get_meta()
+        return {
+            'meta': meta,
+            'teams': ctx.store.get_teams(),
+            'active_weeks': [week for week in ctx.store.get_active_weeks() if week <= meta['total_weeks']],
+        }
+    return ctx.memo('league_basics', build)
+
+
+def _render_standings(ctx: ViewContext) -> Rendered:
+    teams = _league_basics(ctx)['teams']
+    rows = [["排名", "隊伍名稱", "經理", "勝", "敗", "和", "勝率"]]
+
+    for i, team in enumerate(teams, 1):
+        wins = team.get('wins', 0)
+        losses = team.get('losses', 0)
+        ties = team.get('ties', 0)
+        total_games = wins + losses + ties
+        win_rate = f"{wins / total_games:.3f}" if total_games > 0 else "0.000"
+
+        rows.append([i, team['team_name'], team.get('manager', 'Unknown'), wins, losses, ties, win_rate])
+
+    return Rendered(rows, summary=f"{len(teams)} 支隊伍")
+
+
+def _render_shared_matchups(ctx: ViewContext) -> Rendered:
+    current_week = _league_basics(ctx)['meta']['current_week']
+    matchups = ctx.store.get_matchups(current_week)
+
+    rows = [
+        _blank(4),
+        _title_row(f"Week {current_week} 對戰表", 4),
+        _blank(4),
+        ["#", "隊伍 A", "隊伍 B", "備註"]
+    ]
+    row_keys = [None] * len(rows)
+    for i, matchup in enumerate(matchups, 1):
+        rows.append([i, matchup['team1_name'], matchup['team2_name'], ""])
+        row_keys.append(f"W{current_week}:{matchup['team1_id']}-{matchup['team2_id']}")
+
+    return Rendered(rows, summary=f"Week {current_week} ({len(matchups)} 場)", row_keys=row_keys)
+
+
+def _render_shared_schedule(ctx: ViewContext) -> Rendered:
+    from .google_sheets_sync import column_letter
+
+    basics = _league_basics(ctx)
+    active_weeks = basics['active_weeks']
+    current_week = basics['meta']['current_week']
+    team_schedules = ctx.store.get_team_schedules()
+
+    rows = [["隊伍名稱"] + [f"W{w}" for w in active_weeks]]
+    for team in basics['teams']:
+        row = [team['team_name']]
+        schedule = team_schedules.get(str(team['team_id']), {})
+        for week in active_weeks:
+            week_key = str(week)  # team_schedules 的 key 是字串
+            if week_key in schedule:
+                # 縮短名稱以適應格子
+                row.append(schedule[week_key]['opponent_name'][:12])
+            else:
+                row.append("-")
+        rows.append(row)
+
+    formats = [(f'A1:{column_letter(len(active_weeks))}1', HEADER_BLUE)]
+
+    # 標記當前週次
+    if current_week in active_weeks:
+        current_week_col = column_letter(active_weeks.index(current_week) + 1)
+        formats.append((f'{current_week_col}1:{current_week_col}1', {
+            "backgroundColor": {"red": 1, "green": 0.65, "blue": 0},
+            "textFormat": {"bold": True, "foregroundColor": WHITE},
+            "horizontalAlignment": "CENTER"
+        }))
+
+    return Rendered(rows, formats=formats, summary=f"完整賽程 ({len(active_weeks)} 週)")
+
+
+def _render_player_source(ctx: ViewContext) -> Rendered:
+    rosters = ctx.store.get_rosters()
+    rows = [["隊伍名稱", "球員名稱", "NBA隊伍", "位置", "狀態", "隊伍ID"]]
+
+    for team in _league_basics(ctx)['teams']:
+        team_id = str(team['team_id'])
+        for player in rosters.get(team_id, []):
+            rows.append([
+                team['team_name'],
+                player['name'],
+                player.get('team', ''),
+                ','.join(player.get('positions', [])),
+                player.get('status', ''),
+                team_id
+            ])
+
+    return Rendered(rows, summary=f"{len(rows) - 1} 名球員")
+
+
+def _team_names(ctx: ViewContext) -> List[str]:
+    return [team['team_name'] for team in _league_basics(ctx)['teams']]
+
+
+# 預先計算模式：每隊的統計與陣容由 Python 算好寫進隱藏工作表，
+# 下拉選單只用 MATCH 找到隊伍列、INDEX 取出固定大小的區塊，不再對整份球員資料跑 FILTER/COUNTIFS
+TEAM_BLOCK_SHEET = '_隊伍區塊'
+TEAM_STATS_COLUMNS = ['球員數量', '經理', '戰績', 'PG', 'SG', 'SF', 'PF', 'C']  # B:I
+ROSTER_BLOCK_COLUMNS = ['球員名稱', 'NBA隊伍', '位置', '狀態']                  # K:N
+
+
+def _team_blocks(ctx: ViewContext) -> Dict:
+    def build():
+        rosters = ctx.store.get_rosters()
+        teams = _league_basics(ctx)['teams']
+        return {
+            'teams': teams,
+            'rosters': {str(team['team_id']): rosters.get(str(team['team_id']), []) for team in teams},
+            # 每隊區塊一樣高，才能用 (隊伍序號 × 區塊高度) 直接算出位置
+            'block_size': max([len(rosters.get(str(team['team_id']), [])) for team in teams] + [1]),
+        }
+    return ctx.memo('team_blocks', build)
+
+
+def _render_team_blocks(ctx: ViewContext) -> Rendered:
+    blocks = _team_blocks(ctx)
+    teams = blocks['teams']
+    block_size = blocks['block_size']
+
+    stats_rows = []
+    roster_rows = []
+    for team in teams:
+        roster = blocks['rosters'][str(team['team_id'])]
+        record = f"{team.get('wins', 0)}-{team.get('losses', 0)}-{team.get('ties', 0)}"
+        stats_rows.append([team['team_name'], len(roster), team.get('manager', 'Unknown'), record] + [
+            sum(1 for player in roster if pos in player.get('positions', []))
+            for pos in ['PG', 'SG', 'SF', 'PF', 'C']
+        ])
+        for i in range(block_size):
+            if i < len(roster):
+                player = roster[i]
+                roster_rows.append([
+                    player['name'],
+                    player.get('team', ''),
+                    ','.join(player.get('positions', [])),
+                    player.get('status', '')
+                ])
+            else:
+                roster_rows.append(_blank(4))
+
+    rows = [["隊伍名稱"] + TEAM_STATS_COLUMNS + [""] + ROSTER_BLOCK_COLUMNS]
+    for i, roster_row in enumerate(roster_rows):
+        stats_row = stats_rows[i] if i < len(stats_rows) else _blank(len(TEAM_STATS_COLUMNS) + 1)
+        rows.append(stats_row + [""] + roster_row)
+
+    return Rendered(rows, summary=f"{len(teams)} 隊 × {block_size} 列")
+
+
+def _team_row_formula() -> str:
+    """B1 選擇的隊伍在 _隊伍區塊 的列號（第 2 列起）"""
+    return f"MATCH(B1,'{TEAM_BLOCK_SHEET}'!A:A,0)"
+
+
+def _team_stat_formula(column: str) -> str:
+    return f"=IFERROR(INDEX('{TEAM_BLOCK_SHEET}'!{column}:{column},{_team_row_formula()}),\"\")"
+
+
+def _team_roster_formula(ctx: ViewContext) -> str:
+    """以 INDEX(起點):INDEX(終點) 取出所選隊伍的陣容區塊（非 volatile，只在 B1 改變時重算）"""
+    block_size = _team_blocks(ctx)['block_size']
+    start = f"({_team_row_formula()}-2)*{block_size}+2"
+    return (
+        f"=IFERROR(INDEX('{TEAM_BLOCK_SHEET}'!K:K,{start}):"
+        f"INDEX('{TEAM_BLOCK_SHEET}'!N:N,{start}+{block_size - 1}),\"\")"
+    )
+
+
+def _render_shared_roster(ctx: ViewContext, config: Dict) -> Rendered:
+    default_team = _league_basics(ctx)['teams'][0]
+
+    if config.get('precompute_team_views'):
+        roster_formula = _team_roster_formula(ctx)
+    else:
+        # 公式會根據 B1 的值自動篩選 _球員數據源 的資料（從第4行開始）
+        roster_formula = f'=IF(ISBLANK(B1),"",FILTER(\'_球員數據源\'!B2:E,\'_球員數據源\'!A2:A=B1))'
+    rows = [
+        ["選擇隊伍:", default_team['team_name'], "", "", "", "", ""],
+        _blank(7),
+        ["#", "球員名稱", "NBA隊伍", "位置", "狀態", "", ""],
+        ["", roster_formula],
+    ]
+    return Rendered(rows, validations=[('B1', _team_names(ctx))], summary="含下拉選單")
+
+
+def _render_shared_stats(ctx: ViewContext, config: Dict) -> Rendered:
+    default_team = _league_basics(ctx)['teams'][0]
+
+    if config.get('precompute_team_views'):
+        count, manager, record = (_team_stat_formula(column) for column in 'BCD')
+        position_formulas = [_team_stat_formula(column) for column in 'EFGHI']
+    else:
+        count = '=COUNTIF(\'_球員數據源\'!A:A,B1)'
+        manager = '=IFERROR(VLOOKUP(B1,\'聯盟排名\'!B:C,2,FALSE),"")'
+        record = '=IFERROR(VLOOKUP(B1,\'聯盟排名\'!B:D,2,FALSE)&"-"&VLOOKUP(B1,\'聯盟排名\'!B:E,2,FALSE)&"-"&VLOOKUP(B1,\'聯盟排名\'!B:F,2,FALSE),"")'
+        position_formulas = [
+            f'=COUNTIFS(\'_球員數據源\'!A:A,B1,\'_球員數據源\'!D:D,"*{pos}*")'
+            for pos in ['PG', 'SG', 'SF', 'PF', 'C']
+        ]
+
+    rows = [
+        ["選擇隊伍:", default_team['team_name'], ""],
+        ["", "", ""],
+        ["統計項目", "數值", ""],
+        ["球員數量", count, ""],
+        ["經理", manager, ""],
+        ["戰績", record, ""],
+        ["", "", ""],
+        ["位置分佈", "", ""],
+    ]
+    for pos, formula in zip(['PG', 'SG', 'SF', 'PF', 'C'], position_formulas):
+        rows.append([f"  {pos}", formula, ""])
+
+    return Rendered(rows, validations=[('B1', _team_names(ctx))], summary="含下拉選單")
+
+
+def _render_shared_info(ctx: ViewContext) -> Rendered:
+    basics = _league_basics(ctx)
+    meta = basics['meta']
+
+    rows = [
+        ["項目", "內容", ""],
+        ["", "", ""],
+        ["聯盟名稱", meta['league_name'], ""],
+        ["聯盟 ID", meta['league_id'], ""],
+        ["賽季", meta['season'], ""],
+        ["隊伍數", meta['num_teams'], ""],
+        ["當前週次", f"Week {meta['current_week']}", ""],
+        ["總週數", f"{len(basics['active_weeks'])} 週", ""],
+        ["", "", ""],
+        ["類別", "H2H 9-CAT", ""],
+        ["", "", ""],
+        ["統計類別", "", ""],
+    ]
+    rows.extend(["", f"• {cat}", ""] for cat in ['FG%', 'FT%', '3PM', 'PTS', 'REB', 'AST', 'ST', 'BLK', 'TO'])
+    rows.extend([
+        ["", "", ""],
+        ["最後更新", meta['last_updated'], ""],
+    ])
+    return Rendered(rows)
+
+
+def league_shared_views(config: Dict) -> List[SheetView]:
+    """
+    聯盟共享 Sheets（不含個人分析）
+
+    config 的 precompute_team_views 為 true 時，球員陣容與球隊統計改從預先計算的
+    _隊伍區塊 以 INDEX/MATCH 取值，切換隊伍時只需重算幾個儲存格；此時沒有公式
+    讀取 _球員數據源，不再渲染與寫入。
+    """
+    sheets = config['sheets']
+    if config.get('precompute_team_views'):
+        source_views = [SheetView(TEAM_BLOCK_SHEET, _render_team_blocks, rows=500, cols=14, hidden=True)]
+    else:
+        source_views = [SheetView('_球員數據源', _render_player_source, rows=500, cols=6, hidden=True)]
+    return [
+        SheetView(sheets['standings'], _render_standings, rows=20, cols=8,
+                  formats=[('A1:G1', HEADER_BLUE)]),
+        SheetView(sheets['matchups'], _render_shared_matchups, rows=15, cols=5,
+                  formats=[('A2:D2', BANNER), ('A4:D4', HEADER_LIGHT)], user_columns=['D'],
+                  week_scoped_rows=True),
+        SheetView(sheets['schedule'], _render_shared_schedule, rows=20, cols=25),
+    ] + source_views + [
+        SheetView(sheets['roster'], _bind(_render_shared_roster, config), rows=50, cols=8, user_entered=True,
+                  formats=[('A1:A1', SUBTITLE), ('A3:G3', HEADER_LIGHT)]),
+        SheetView(sheets['stats'], _bind(_render_shared_stats, config), rows=20, cols=5, user_entered=True,
+                  formats=[('A1:A1', SUBTITLE), ('A3:C3', HEADER_LIGHT)]),
+        SheetView(sheets['info'], _render_shared_info, rows=25, cols=5,
+                  formats=[('A1:C1', HEADER_BLUE)]),
+    ]
+
+
+# ============================================================================
+# 群組: league_insights（聯盟洞察）
+# ============================================================================
+
+def _insights(ctx: ViewContext) -> Dict:
+    return ctx.load_json('data/league_insights.json')
+
+
+def _render_schedule_difficulty(ctx: ViewContext) -> Rendered:
+    data = _insights(ctx)
+    current_week = data['current_week']
+    schedule_data = data['insights']['schedule_difficulty']
+
+    rows = [
+        _blank(12),
+        _title_row(f"未來賽程難度分析 (Week {current_week}-{current_week+3})", 12),
+        _blank(12),
+        ["排名", "難度", "隊伍", "當前勝率", "對手平均實力",
+         "Week", "對手", "對手勝率", "Week", "對手", "對手勝率", "評語"]
+    ]
+
+    comments = {"困難": "賽程艱難，需做好準備", "容易": "絕佳機會，把握勝場"}
+    for i, team_sched in enumerate(schedule_data, 1):
+        opponents = team_sched['future_opponents']
+        row = [
+            i,
+            f"{team_sched['emoji']} {team_sched['difficulty_level']}",
+            team_sched['team_name'],
+            team_sched['current_win_rate'],
+            team_sched['avg_opponent_strength'],
+        ]
+        # 前兩場對戰
+        for j in range(2):
+            if j < len(opponents):
+                opp = opponents[j]
+                row.extend([f"W{opp['week']}", opp['opponent'], opp['win_rate']])
+            else:
+                row.extend(["", "", ""])
+        row.append(comments.get(team_sched['difficulty_level'], "中等難度，穩定發揮"))
+        rows.append(row)
+
+    return Rendered(rows, summary=f"{len(schedule_data)} 支隊伍")
+
+
+def _render_position_depth(ctx: ViewContext) -> Rendered:
+    depth_data = _insights(ctx)['insights']['position_depth']
+
+    rows = [
+        _blank(10),
+        _title_row("各隊位置深度分析", 10),
+        _blank(10),
+        ["排名", "隊伍", "球員總數", "PG", "SG", "SF", "PF", "C", "最強位置", "最弱位置"]
+    ]
+
+    # 依總球員數排序
+    for i, team_depth in enumerate(sorted(depth_data, key=lambda x: x['total_players'], reverse=True), 1):
+        pos = team_depth['positions']
+        rows.append([
+            i, team_depth['team_name'], team_depth['total_players'],
+            pos['PG'], pos['SG'], pos['SF'], pos['PF'], pos['C'],
+            team_depth['strongest_position'], team_depth['weakest_position']
+        ])
+
+    return Rendered(rows, summary=f"{len(depth_data)} 支隊伍")
+
+
+def _render_trade_reference(ctx: ViewContext) -> Rendered:
+    trade_data = _insights(ctx)['insights']['trade_reference']
+
+    rows = [
+        _blank(9),
+        _title_row("交易價值參考（簡化版）", 9),
+        _blank(9),
+        ["排名", "球員", "Fantasy球隊", "位置數", "位置", "健康狀態", "多位置分", "健康調整", "交易價值"]
+    ]
+
+    # 只顯示前100名
+    for i, player in enumerate(trade_data[:100], 1):
+        rows.append([
+            i, player['player_name'], player['team_name'], player['num_positions'],
+            ','.join(player['positions']), player['health_status'],
+            player['versatility_score'], player['health_adjustment'], player['trade_value']
+        ])
+
+    return Rendered(rows, summary="Top 100 球員")
+
+
+def _render_weekly_report(ctx: ViewContext) -> Rendered:
+    weekly = _insights(ctx)['insights']['weekly_report']
+
+    rows = [
+        _blank(8),
+        _title_row(f"Week {weekly['current_week']} 戰報", 8),
+        _blank(8),
+        ["本週對戰數", weekly['total_matchups'], "", "", "", "", "", ""],
+        _blank(8),
+        _title_row("本週焦點對戰", 8),
+        _blank(8),
+    ]
+
+    if weekly['top_matchup']:
+        top = weekly['top_matchup']
+        rows.extend([
+            ["類型", "強強對決", "", "", "", "", "", ""],
+            ["隊伍 A", top['team1'], f"勝率: {top['team1_wr']}", "", "", "", "", ""],
+            ["隊伍 B", top['team2'], f"勝率: {top['team2_wr']}", "", "", "", "", ""],
+            ["評語", "本週最值得關注的對決！", "", "", "", "", "", ""],
+            _blank(8)
+        ])
+
+    if weekly['bottom_matchup']:
+        bottom = weekly['bottom_matchup']
+        rows.extend([
+            _blank(8),
+            _title_row("弱弱對決", 8),
+            ["隊伍 A", bottom['team1'], f"勝率: {bottom['team1_wr']}", "", "", "", "", ""],
+            ["隊伍 B", bottom['team2'], f"勝率: {bottom['team2_wr']}", "", "", "", "", ""],
+            _blank(8)
+        ])
+
+    rows.extend([
+        _blank(8),
+        _title_row("所有對戰", 8),
+        ["#", "隊伍 A", "勝率", "隊伍 B", "勝率", "平均實力", "類型", ""]
+    ])
+    for i, matchup in enumerate(weekly['all_matchups'], 1):
+        rows.append([
+            i, matchup['team1'], matchup['team1_wr'], matchup['team2'], matchup['team2_wr'],
+            matchup['avg_strength'], matchup['matchup_type'], ""
+        ])
+
+    return Rendered(rows, summary=f"Week {weekly['current_week']}")
+
+
+# 難度欄依 emoji 上色
+DIFFICULTY_COLORS = {
+    '🔴': {"red": 0.96, "green": 0.8, "blue": 0.8},   # 困難
+    '🟡': {"red": 1, "green": 0.95, "blue": 0.8},     # 中等
+    '🟢': {"red": 0.85, "green": 0.92, "blue": 0.83}  # 容易
+}
+
+
+def league_insights_views(config: Dict) -> List[SheetView]:
+    """聯盟洞察：賽程分析、位置深度、交易價值、每週戰報"""
+    return [
+        SheetView("賽程分析", _render_schedule_difficulty, rows=30, cols=12,
+                  formats=[('A2:L2', BANNER), ('A4:L4', HEADER_GREY)],
+                  conditional=[
+                      {'range': 'B5:B', 'condition': 'TEXT_STARTS_WITH', 'value': emoji,
+                       'format': {"backgroundColor": color}}
+                      for emoji, color in DIFFICULTY_COLORS.items()
+                  ]),
+        SheetView("位置深度", _render_position_depth, rows=30, cols=10,
+                  formats=[('A2:J2', BANNER), ('A4:J4', HEADER_GREY)]),
+        SheetView("交易價值", _render_trade_reference, rows=300, cols=10,
+                  formats=[('A2:I2', BANNER), ('A4:I4', HEADER_GREY)]),
+        SheetView("每週戰報", _render_weekly_report, rows=30, cols=8,
+                  formats=[('A2:H2', BANNER)]),
+    ]
+
+
+# ============================================================================
+# 群組: advanced_trade_value（進階交易價值）
+# ============================================================================
+
+TIER_COLORS = {
+    'S': {"red": 1, "green": 0.84, "blue": 0},        # 金色
+    'A': {"red": 0.75, "green": 0.75, "blue": 0.75},  # 銀色
+    'B': {"red": 0.8, "green": 0.52, "blue": 0.25},   # 銅色
+    'C': {"red": 0.85, "green": 0.92, "blue": 0.83},  # 淺綠
+    'D': {"red": 0.95, "green": 0.95, "blue": 0.95}   # 淺灰
+}
+
+
+def _render_advanced_trade_value(ctx: ViewContext) -> Rendered:
+    trade_data = ctx.load_json('data/advanced_trade_value.json')
+    players = trade_data['players']
+
+    rows = [
+        _blank(16),
+        _title_row(f"進階交易價值評估 - {trade_data['generated_at']}", 16),
+        _blank(16),
+        ["排名", "分級", "球員", "NBA球隊", "位置", "狀態", "Fantasy球隊", "勝率",
+         "總分", "基礎", "位置價值", "多位置", "稀缺性", "健康", "球隊實力", "特殊"]
+    ]
+
+    for i, player in enumerate(players, 1):
+        scores = player['scores']
+        rows.append([
+            i, player['tier'], player['player_name'], player['nba_team'],
+            ','.join(player['positions']), player['status'], player['fantasy_team'], player['win_rate'],
+            scores['total'], scores['base'], scores['position_value'], scores['multi_position_bonus'],
+            scores['scarcity_bonus'], scores['health_value'], scores['team_strength'], scores['special_bonus']
+        ])
+
+    return Rendered(rows, summary=f"{len(players)} 名球員")
+
+
+def advanced_trade_value_views(config: Dict) -> List[SheetView]:
+    """進階交易價值（分級欄以條件式格式上色）"""
+    return [
+        SheetView(
+            "進階交易價值", _render_advanced_trade_value, rows=500, cols=20,
+            formats=[
+                ('A2:P2', BANNER),
+                ('A4:P4', HEADER_GREY),
+                # 白底蓋掉舊版逐列套用的底色，分級顏色交給條件式格式
+                ('B5:B', {"backgroundColor": WHITE, "textFormat": {"bold": True},
+                          "horizontalAlignment": "CENTER"}),
+            ],
+            conditional=[
+                {'range': 'B5:B', 'condition': 'TEXT_EQ', 'value': tier, 'format': {"backgroundColor": color}}
+                for tier, color in TIER_COLORS.items()
+            ],
+            column_widths={0: 50, 1: 40, 2: 150, 6: 150}
+        ),
+    ]
+
+
+# ============================================================================
+# 群組: my_team（個人球隊）
+# ============================================================================
+
+HEALTH_INJURED = ['O', 'INJ', 'OUT']
+HEALTH_WATCH = ['GTD', 'DTD']
+
+
+def _my_team(ctx: ViewContext, config: Dict) -> Dict:
+    """個人球隊的陣容、賽程與位置分析（六張工作表共用）"""
+    def build():
+        store = ctx.store
+        meta = store.get_meta()
+        team_id = str(config['team_id'])
+        team_info = store.get_team(team_id)
+        if not team_info:
+            raise ViewDataError(f"找不到 Team ID {team_id}")
+
+        roster = store.get_roster(team_id)
+        if not roster:
+            raise ViewDataError(f"Team ID {team_id} 沒有陣容數據")
+
+        # 統計位置分佈
+        pos_counts = defaultdict(int)
+        for player in roster:
+            for pos in player.get('positions', []):
+                if pos in ['PG', 'SG', 'SF', 'PF', 'C']:
+                    pos_counts[pos] += 1
+
+        # 比較聯盟平均
+        total_teams = store.count_teams()
+        league_pos_counts = store.count_positions()
+        pos_analysis = []
+        for pos in ['PG', 'SG', 'SF', 'PF', 'C']:
+            avg_count = league_pos_counts.get(pos, 0) / total_teams
+            diff = pos_counts[pos] - avg_count
+            if diff > 1:
+                analysis, emoji = "優勢位置", "🟢"
+            elif diff < -1:
+                analysis, emoji = "劣勢位置", "🔴"
+            else:
+                analysis, emoji = "平均水平", "🟡"
+            pos_analysis.append({
+                'position': pos,
+                'my_count': pos_counts[pos],
+                'avg_count': round(avg_count, 1),
+                'diff': round(diff, 1),
+                'analysis': analysis,
+                'emoji': emoji
+            })
+
+        return {
+            'name': config['team_name'],
+            'meta': meta,
+            'roster': roster,
+            'schedule': store.get_team_schedule(team_id),
+            'pos_counts': pos_counts,
+            'multi_pos': sum(1 for p in roster if len(p.get('positions', [])) >= 3),
+            'pos_analysis': pos_analysis,
+            'weak_positions': [pa['position'] for pa in pos_analysis if pa['analysis'] == "劣勢位置"],
+            'strong_positions': [pa['position'] for pa in pos_analysis if pa['analysis'] == "優勢位置"],
+        }
+    return ctx.memo(f"my_team:{config['team_id']}", build)
+
+
+def _status_display(player: Dict) -> str:
+    status = player.get('status', '')
+    return status if status else "健康"
+
+
+def _render_my_roster(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    rows = [
+        _blank(7),
+        _title_row(f"{team['name']} - 陣容總覽", 7),
+        _title_row(f"更新時間: {ctx.now.strftime('%Y-%m-%d %H:%M:%S')}", 7),
+        _blank(7),
+        ["#", "球員名稱", "NBA球隊", "位置", "狀態", "位置數", "評價"]
+    ]
+
+    for i, player in enumerate(team['roster'], 1):
+        positions = player.get('positions', [])
+        if len(positions) >= 3:
+            rating = "多位置優勢"
+        elif 'C' in positions:
+            rating = "稀缺位置"
+        elif len(positions) == 2:
+            rating = "雙位置"
+        else:
+            rating = "單一位置"
+
+        rows.append([
+            i, player['name'], player.get('team', ''), ','.join(positions),
+            _status_display(player), len(positions), rating
+        ])
+
+    return Rendered(rows, summary=f"{len(team['roster'])} 名球員")
+
+
+def _render_my_stats(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    roster = team['roster']
+    pos_counts = team['pos_counts']
+    multi_pos = team['multi_pos']
+
+    health_counts = {'健康': 0, '受傷': 0, '觀察': 0}
+    for player in roster:
+        status = player.get('status', '')
+        if status in HEALTH_INJURED:
+            health_counts['受傷'] += 1
+        elif status in HEALTH_WATCH:
+            health_counts['觀察'] += 1
+        else:
+            health_counts['健康'] += 1
+
+    def share(count):
+        return f"{count/len(roster)*100:.1f}%"
+
+    rows = [
+        _blank(4),
+        _title_row(f"{team['name']} - 球員數據統計", 4),
+        _blank(4),
+        ["統計項目", "數值", "備註", ""],
+        _blank(4),
+        ["球員總數", len(roster), "", ""],
+        ["多位置球員 (3+)", multi_pos, share(multi_pos), ""],
+        _blank(4),
+        ["位置分佈", "", "", ""],
+    ]
+    rows.extend([pos, pos_counts[pos], "", ""] for pos in ['PG', 'SG', 'SF', 'PF', 'C'])
+    rows.extend([
+        _blank(4),
+        ["健康狀態", "", "", ""],
+        ["健康", health_counts['健康'], share(health_counts['健康']), ""],
+        ["觀察中", health_counts['觀察'], share(health_counts['觀察']), ""],
+        ["受傷", health_counts['受傷'], share(health_counts['受傷']), ""],
+    ])
+    return Rendered(rows, summary="數據統計")
+
+
+def _render_my_matchup(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    current_week = team['meta']['current_week']
+
+    current_matchup = team['schedule'].get(str(current_week), {})
+    opponent_name = current_matchup.get('opponent_name', 'N/A')
+    opponent_id = str(current_matchup.get('opponent_id', ''))
+    opponent_roster = ctx.store.get_roster(opponent_id) if opponent_id else []
+
+    rows = [
+        _blank(8),
+        _title_row(f"Week {current_week} 對戰", 8),
+        _blank(8),
+        ["我的球隊", team['name'], "", "對手球隊", opponent_name, "", "", ""],
+        ["球員數", len(team['roster']), "", "球員數", len(opponent_roster), "", "", ""],
+        _blank(8),
+        _title_row("對手陣容", 8),
+        ["#", "球員", "NBA球隊", "位置", "狀態", "", "", ""]
+    ]
+    for i, player in enumerate(opponent_roster, 1):
+        rows.append([
+            i, player['name'], player.get('team', ''), ','.join(player.get('positions', [])),
+            _status_display(player), "", "", ""
+        ])
+
+    return Rendered(rows, summary=f"Week {current_week} vs {opponent_name}")
+
+
+def _render_my_schedule(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    current_week = team['meta']['current_week']
+    schedule = team['schedule']
+
+    rows = [
+        _blank(4),
+        _title_row(f"{team['name']} - 完整賽程", 4),
+        _blank(4),
+        ["Week", "對手", "狀態", "備註"]
+    ]
+    row_keys = [None] * len(rows)
+    for week in range(1, team['meta']['total_weeks'] + 1):
+        week_str = str(week)
+        if week_str not in schedule:
+            continue
+        if week < current_week:
+            status = "已結束"
+        elif week == current_week:
+            status = "本週"
+        else:
+            status = "未來"
+        rows.append([f"Week {week}", schedule[week_str]['opponent_name'], status, ""])
+        row_keys.append(f"W{week}")
+
+    return Rendered(rows, summary=f"{len(schedule)} 週賽程", row_keys=row_keys)
+
+
+def _render_my_analysis(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    weak_positions = team['weak_positions']
+    strong_positions = team['strong_positions']
+    multi_pos = team['multi_pos']
+    roster_size = len(team['roster'])
+
+    rows = [
+        _blank(6),
+        _title_row(f"{team['name']} - 深度分析", 6),
+        _blank(6),
+        _title_row("位置深度分析", 6),
+        ["位置", "我的數量", "聯盟平均", "差距", "分析", ""],
+    ]
+    for pa in team['pos_analysis']:
+        rows.append([pa['position'], pa['my_count'], pa['avg_count'], pa['diff'],
+                     f"{pa['emoji']} {pa['analysis']}", ""])
+
+    rows.extend([_blank(6), _title_row("陣容診斷", 6), _blank(6)])
+
+    if weak_positions:
+        rows.append(["弱點位置", ', '.join(weak_positions), "", "", "", ""])
+        rows.append(["建議", f"優先補強 {', '.join(weak_positions)} 位置", "", "", "", ""])
+    else:
+        rows.append(["弱點位置", "無明顯弱點", "", "", "", ""])
+
+    rows.append(_blank(6))
+
+    if strong_positions:
+        rows.append(["優勢位置", ', '.join(strong_positions), "", "", "", ""])
+        rows.append(["建議", f"可考慮交易 {', '.join(strong_positions)} 球員換取弱點位置", "", "", "", ""])
+
+    rows.append(_blank(6))
+    rows.append(["多位置球員數", multi_pos, f"佔比 {multi_pos/roster_size*100:.1f}%", "", "", ""])
+
+    if multi_pos / roster_size < 0.3:
+        rows.append(["建議", "多位置球員較少，建議增加陣容靈活性", "", "", "", ""])
+    else:
+        rows.append(["評價", "多位置球員充足，陣容靈活", "", "", "", ""])
+
+    return Rendered(rows, summary="陣容深度分析")
+
+
+def _render_my_trades(ctx: ViewContext, config: Dict) -> Rendered:
+    team = _my_team(ctx, config)
+    weak_positions = team['weak_positions']
+    strong_positions = team['strong_positions']
+
+    rows = [
+        _blank(8),
+        _title_row(f"{team['name']} - 交易建議", 8),
+        _blank(8),
+        _title_row("基於陣容分析的交易建議", 8),
+        _blank(8)
+    ]
+
+    if weak_positions:
+        rows.extend([
+            ["目標", f"尋找 {', '.join(weak_positions)} 位置球員", "", "", "", "", "", ""],
+            ["策略", "從優勢位置交易換取弱點位置", "", "", "", "", "", ""],
+            _blank(8)
+        ])
+
+    # 可交易球員（來自優勢位置）
+    if strong_positions:
+        rows.extend([
+            _title_row("可交易球員 (優勢位置)", 8),
+            ["#", "球員", "位置", "位置數", "評價", "", "", ""]
+        ])
+        tradable = [
+            player for player in team['roster']
+            if any(pos in strong_positions for pos in player.get('positions', []))
+        ]
+        for i, player in enumerate(tradable, 1):
+            positions = player.get('positions', [])
+            if len(positions) >= 3:
+                value = "高價值 (多位置)"
+            elif 'C' in positions:
+                value = "高價值 (稀缺)"
+            else:
+                value = "中等價值"
+            rows.append([i, player['name'], ','.join(positions), len(positions), value, "", "", ""])
+
+    rows.extend([
+        _blank(8),
+        _title_row("交易原則", 8),
+        ["1", "優先補強弱點位置", "", "", "", "", "", ""],
+        ["2", "尋找多位置球員增加靈活性", "", "", "", "", "", ""],
+        ["3", "注意球員健康狀態", "", "", "", "", "", ""],
+        ["4", "考慮對手賽程難度", "", "", "", "", "", ""],
+    ])
+    return Rendered(rows, summary="交易建議")
+
+
+def my_team_views(config: Dict) -> List[SheetView]:
+    """個人球隊：陣容、球員數據、本週對戰、賽程、深度分析、交易建議"""
+    sheets = config['sheets']
+    return [
+        SheetView(sheets['roster'], _bind(_render_my_roster, config), rows=50, cols=8,
+                  formats=[('A2:G2', BANNER), ('A5:G5', HEADER_GREY)]),
+        SheetView(sheets['stats'], _bind(_render_my_stats, config), rows=50, cols=10,
+                  formats=[('A2:D2', BANNER), ('A4:D4', HEADER_GREY)]),
+        SheetView(sheets['matchup'], _bind(_render_my_matchup, config), rows=30, cols=8,
+                  formats=[('A2:H2', BANNER), ('A8:H8', HEADER_GREY)]),
+        SheetView(sheets['schedule'], _bind(_render_my_schedule, config), rows=30, cols=6,
+                  formats=[('A2:D2', BANNER), ('A4:D4', HEADER_GREY)], user_columns=['D']),
+        SheetView(sheets['analysis'], _bind(_render_my_analysis, config), rows=40, cols=6,
+                  formats=[('A2:F2', BANNER)]),
+        SheetView(sheets['trades'], _bind(_render_my_trades, config), rows=50, cols=8,
+                  formats=[('A2:H2', BANNER)]),
+    ]
+
+
+# ============================================================================
+# 群組: roster_summary（陣容摘要）
+# ============================================================================
+
+def _my_roster_full(ctx: ViewContext) -> Dict:
+    return ctx.load_json('data/my_roster_full.json')
+
+
+def _roster_status(player: Dict) -> str:
+    return player['status'] if player['status'] else "健康"
+
+
+def _render_roster_summary(ctx: ViewContext) -> Rendered:
+    players = _my_roster_full(ctx)['players']
+    rows = [["#", "球員名稱", "隊伍", "位置", "狀態", "備註"]]
+
+    status_emoji = {"健康": "✅", "GTD": "⚠️", "INJ": "❌"}
+    remarks = {"INJ": "需要處理", "GTD": "監控中"}
+    for i, player in enumerate(players, 1):
+        status = _roster_status(player)
+        positions = ','.join(player['positions']) if player['positions'] else "N/A"
+        rows.append([
+            i, player['name'], player['team'], positions,
+            f"{status_emoji.get(status, '❓')} {status}", remarks.get(status, "")
+        ])
+
+    return Rendered(rows, summary=f"{len(players)} 位球員")
+
+
+def _render_roster_stats(ctx: ViewContext) -> Rendered:
+    roster_data = _my_roster_full(ctx)
+    players = roster_data['players']
+    healthy_count = sum(1 for p in players if _roster_status(p) == "健康")
+    injured_count = sum(1 for p in players if _roster_status(p) == "INJ")
+
+    rows = [
+        ["統計項目", "數值", ""],
+        ["", "", ""],
+        ["隊伍名稱", roster_data['team_name'], ""],
+        ["聯盟", "大亂鬥 (ID# 71325)", ""],
+        ["週次", f"Week {roster_data['week']}", ""],
+        ["", "", ""],
+        ["陣容狀態", "", ""],
+        ["總球員數", len(players), ""],
+        ["健康球員", healthy_count, "✅"],
+        ["傷病球員", injured_count, "❌"],
+        ["", "", ""],
+        ["位置分布", "", ""],
+    ]
+
+    position_count = {}
+    for p in players:
+        for pos in p['positions']:
+            position_count[pos] = position_count.get(pos, 0) + 1
+    rows.extend([f"  {pos}", position_count[pos], ""] for pos in sorted(position_count))
+
+    return Rendered(rows, summary="統計摘要")
+
+
+def _render_roster_analysis(ctx: ViewContext) -> Rendered:
+    players = _my_roster_full(ctx)['players']
+    multi_pos_count = len([p for p in players if len(p['positions']) > 1])
+    bigs_count = len([p for p in players if set(p['positions']) == {'PF', 'C'}])
+    guards_count = len([p for p in players if set(p['positions']) == {'PG', 'SG'}])
+
+    # 分析內容（考慮多位置）
+    rows = [
+        ["分析項目", "內容", "優先級"],
+        ["", "", ""],
+        ["🏀 陣容診斷 (多位置分析)", "", ""],
+        ["", "", ""],
+        ["優勢", f"• 多位置球員: {multi_pos_count}/{len(players)} ({multi_pos_count/len(players)*100:.0f}%)", ""],
+        ["", f"• {bigs_count} 名 PF/C 雙棲 (Giannis, Chet, Filipowski)", ""],
+        ["", f"• {guards_count} 名 PG/SG 雙棲 (Mitchell, Nembhard, Lonzo)", ""],
+        ["", "• 排陣靈活度高，位置調整彈性大", ""],
+        ["", "", ""],
+        ["劣勢", "• 2 名核心球員受傷 (Tatum, Kyrie)", "🔴"],
+        ["", "• 4 名單一位置球員 (彈性較低)", "🟡"],
+        ["", "• Kyrie, Westbrook, Suggs 都是純 PG", "🟡"],
+        ["", "", ""],
+        ["🔴 緊急事項", "", ""],
+        ["", "", ""],
+        ["1", "確認 Jayson Tatum 傷病狀態", "高"],
+        ["", "→ 考慮交易換取即戰力", ""],
+        ["", "", ""],
+        ["2", "確認 Kyrie Irving 傷病狀態", "高"],
+        ["", "→ 評估長期價值", ""],
+        ["", "", ""],
+        ["3", "監控 Jalen Suggs (GTD)", "中"],
+        ["", "→ 確認復出時間", ""],
+        ["", "", ""],
+        ["💼 交易建議 (更新版)", "", ""],
+        ["", "", ""],
+        ["結論", "✅ 中鋒問題不嚴重！", ""],
+        ["", f"   實際有 {bigs_count+1} 名可打 C 的球員", ""],
+        ["", "", ""],
+        ["方案1", "送出: Kyrie Irving (PG, INJ)", ""],
+        ["", "換來: 健康的多位置球員", ""],
+        ["", "理由: Kyrie 單一位置且受傷", ""],
+        ["", "", ""],
+        ["方案2", "送出: Tatum (SF/PF, INJ)", ""],
+        ["", "換來: 即戰力側翼", ""],
+        ["", "理由: Tatum 多位置但受傷", ""],
+    ]
+    return Rendered(rows, summary="分析建議")
+
+
+def roster_summary_views(config: Dict) -> List[SheetView]:
+    """陣容摘要：陣容、統計、分析建議"""
+    sheets = config['sheets']
+    return [
+        SheetView(sheets['roster'], _render_roster_summary, rows=20, cols=10,
+                  formats=[('A1:F1', HEADER_BLUE)]),
+        SheetView(sheets['stats'], _render_roster_stats, rows=15, cols=5,
+                  formats=[('A1:C1', HEADER_BLUE), ('A3:A3', SUBTITLE), ('A7:A7', SUBTITLE),
+                           ('A12:A12', SUBTITLE)]),
+        SheetView(sheets['analysis'], _render_roster_analysis, rows=30, cols=3,
+                  formats=[('A1:C1', HEADER_BLUE), ('A3:A3', SECTION), ('A13:A13', SECTION),
+                           ('A24:A24', SECTION)]),
+    ]
+
+
+# ============================================================================
+# 群組: league_overview（聯盟總覽，data/league_data.json）
+# ============================================================================
+
+def _league_data(ctx: ViewContext) -> Dict:
+    return ctx.load_json('data/league_data.json')
+
+
+def _render_overview_standings(ctx: ViewContext) -> Rendered:
+    teams = _league_data(ctx)['teams']
+    rows = [["排名", "隊伍名稱", "經理", "勝", "敗", "和", "勝率", "備註"]]
+
+    for i, team in enumerate(teams, 1):
+        wins = team.get('wins', 0)
+        losses = team.get('losses', 0)
+        ties = team.get('ties', 0)
+        total_games = wins + losses + ties
+        win_rate = f"{wins / total_games:.3f}" if total_games > 0 else "0.000"
+        remark = "👑 盟主" if team['team_id'] == 1 else ""
+        rows.append([i, team['team_name'], team.get('manager', 'Unknown'), wins, losses, ties, win_rate, remark])
+
+    return Rendered(rows, summary=f"{len(teams)} 支隊伍")
+
+
+def _render_overview_matchups(ctx: ViewContext) -> Rendered:
+    league_data = _league_data(ctx)
+    current_week = league_data['current_week']
+    matchups = league_data['matchups']
+
+    rows = [
+        _blank(5),
+        _title_row(f"Week {current_week} 對戰表", 5),
+        _blank(5),
+        ["#", "主隊", "客隊", "預測", "備註"]
+    ]
+    for i, matchup in enumerate(matchups, 1):
+        # 標記你的對戰
+        remark = "你的對戰" if matchup['team1_id'] == 1 or matchup['team2_id'] == 1 else ""
+        rows.append([i, matchup['team1_name'], "vs", matchup['team2_name'], remark])
+
+    return Rendered(rows, summary=f"Week {current_week} ({len(matchups)} 場)")
+
+
+def _render_overview_info(ctx: ViewContext) -> Rendered:
+    league_data = _league_data(ctx)
+    rows = [
+        ["項目", "內容", ""],
+        ["", "", ""],
+        ["聯盟名稱", league_data['league_name'], ""],
+        ["聯盟 ID", league_data['league_id'], ""],
+        ["賽季", league_data['season'], ""],
+        ["隊伍數", league_data['num_teams'], ""],
+        ["當前週次", f"Week {league_data['current_week']}", ""],
+        ["", "", ""],
+        ["類別", "H2H 9-CAT", ""],
+        ["", "", ""],
+        ["統計類別", "", ""],
+    ]
+    rows.extend(["", f"• {cat}", ""] for cat in ['FG%', 'FT%', '3PM', 'PTS', 'REB', 'AST', 'ST', 'BLK', 'TO'])
+    rows.extend([
+        ["", "", ""],
+        ["最後更新", league_data['last_updated'], ""],
+        ["", "", ""],
+        ["盟主", "默絲佛陀攝影掃地伯", "👑"],
+    ])
+    return Rendered(rows, summary="基本資訊")
+
+
+def _render_overview_schedule(ctx: ViewContext) -> Rendered:
+    league_data = _league_data(ctx)
+    matchups = league_data['matchups']
+
+    # Week 1-10（目前只有 Week 1 的數據）
+    rows = [["隊伍名稱"] + [f"W{w}" for w in range(1, 11)]]
+    for team in league_data['teams']:
+        opponent = ""
+        for matchup in matchups:
+            if matchup['team1_id'] == team['team_id']:
+                opponent = matchup['team2_name'][:10]  # 縮短名稱
+                break
+            elif matchup['team2_id'] == team['team_id']:
+                opponent = matchup['team1_name'][:10]
+                break
+        rows.append([team['team_name'], opponent if opponent else "TBD"] + ["TBD"] * 9)
+
+    return Rendered(rows, summary="對戰時程")
+
+
+def league_overview_views(config: Dict) -> List[SheetView]:
+    """聯盟總覽：排名、對戰、聯盟資訊、賽程表"""
+    return [
+        SheetView("聯盟排名", _render_overview_standings, rows=20, cols=10,
+                  formats=[('A1:H1', HEADER_BLUE),
+                           # 標記盟主那一行
+                           ('A2:H2', {"backgroundColor": {"red": 1, "green": 0.95, "blue": 0.8},
+                                      "textFormat": {"bold": True}})]),
+        SheetView("本週對戰", _render_overview_matchups, rows=15, cols=8,
+                  formats=[('A2:E2', BANNER), ('A4:E4', HEADER_LIGHT)]),
+        SheetView("聯盟資訊", _render_overview_info, rows=20, cols=5,
+                  formats=[('A1:C1', HEADER_BLUE), ('A3:A3', SUBTITLE), ('A11:A11', SUBTITLE)]),
+        SheetView("賽程表", _render_overview_schedule, rows=25, cols=15,
+                  formats=[('A1:K1', HEADER_BLUE)]),
+    ]
+
+
+VIEW_GROUPS: Dict[str, Callable[[Dict], List[SheetView]]] = {
+    'league_shared': league_shared_views,
+    'league_insights': league_insights_views,
+    'advanced_trade_value': advanced_trade_value_views,
+    'my_team': my_team_views,
+    'roster_summary': roster_summary_views,
+    'league_overview': league_overview_views,
+}
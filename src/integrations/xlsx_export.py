@@ -0,0 +1,381 @@
+"""
+離線 Excel 匯出
+
+把 Google Sheets 同步的同一組工作表（sheets_views.py）渲染成一個 .xlsx 檔，
+給沒有 Google 帳號的成員使用，不經過 Sheets API、不消耗額度。
+
+- 以 xlsxwriter 的 constant_memory 模式逐列寫出，記憶體用量與列數無關
+- 固定格式、依數據而變的格式在寫入儲存格時一起套用
+- 分級、難度等顏色轉成 Excel 原生的條件式格式
+- 含公式的工作表（聯盟共享的下拉選單）寫成動態陣列公式，開檔時由 Excel 計算
+
+需要: pip install xlsxwriter
+"""
+
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .google_sheets_sync import a1_to_grid_range
+from .sheets_engine import DEFAULT_ENGINE_CONFIG, load_targets
+from .sheets_views import VIEW_GROUPS, Rendered, SheetView, ViewContext, ViewDataError
+
+try:
+    import xlsxwriter
+    from xlsxwriter.utility import xl_col_to_name, xl_rowcol_to_cell
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+
+DEFAULT_EXPORT_PATH = 'data/exports/fantasy_league.xlsx'
+
+# Excel 工作表名稱限制
+MAX_SHEET_NAME = 31
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+# 下拉選單直接寫在驗證規則裡的字數上限，超過時改放到隱藏工作表
+MAX_INLINE_LIST = 255
+OPTIONS_SHEET = '_選項'
+
+HORIZONTAL_ALIGN = {'LEFT': 'left', 'CENTER': 'center', 'RIGHT': 'right'}
+
+
+def _hex(color: Dict) -> str:
+    """Sheets 的 {'red', 'green', 'blue'}（0-1）轉 '#RRGGBB'"""
+    return '#' + ''.join(
+        f"{round(color.get(channel, 0) * 255):02X}" for channel in ('red', 'green', 'blue')
+    )
+
+
+def format_properties(cell_format: Dict) -> Dict:
+    """
+    Sheets CellFormat 轉 xlsxwriter 格式屬性
+
+    只轉換工作表定義用到的欄位：背景色、粗體、斜體、刪除線、文字顏色、字級、水平對齊。
+    """
+    properties = {}
+    if 'backgroundColor' in cell_format:
+        properties['bg_color'] = _hex(cell_format['backgroundColor'])
+        properties['pattern'] = 1
+    text = cell_format.get('textFormat', {})
+    if text.get('bold'):
+        properties['bold'] = True
+    if text.get('italic'):
+        properties['italic'] = True
+    if text.get('strikethrough'):
+        properties['font_strikeout'] = True
+    if 'foregroundColor' in text:
+        properties['font_color'] = _hex(text['foregroundColor'])
+    if 'fontSize' in text:
+        properties['font_size'] = text['fontSize']
+    if cell_format.get('horizontalAlignment') in HORIZONTAL_ALIGN:
+        properties['align'] = HORIZONTAL_ALIGN[cell_format['horizontalAlignment']]
+    return properties
+
+
+def _quoted(value: Any) -> str:
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def conditional_options(rule: Dict, first_cell: str) -> Dict:
+    """
+    SheetView.conditional 的規則轉 xlsxwriter conditional_format 選項（不含 format）
+
+    Args:
+        rule: {'range', 'condition', 'value', 'format'}
+        first_cell: 範圍左上角儲存格（公式型規則的相對參照）
+
+    Raises:
+        ValueError: 不支援的條件類型
+    """
+    condition, value = rule['condition'], rule['value']
+    if condition == 'TEXT_EQ':
+        return {'type': 'cell', 'criteria': '==', 'value': _quoted(value)}
+    # Excel 以 UTF-16 計算長度（emoji 佔 2），xlsxwriter 的 begins with 寫死 Python 長度，
+    # 所以開頭 / 結尾比對改用 LEN() 由 Excel 自己算
+    if condition == 'TEXT_STARTS_WITH':
+        return {'type': 'formula', 'criteria': f"=LEFT({first_cell},LEN({_quoted(value)}))={_quoted(value)}"}
+    if condition == 'TEXT_ENDS_WITH':
+        return {'type': 'formula', 'criteria': f"=RIGHT({first_cell},LEN({_quoted(value)}))={_quoted(value)}"}
+    if condition == 'TEXT_CONTAINS':
+        return {'type': 'text', 'criteria': 'containing', 'value': str(value)}
+    if condition == 'TEXT_NOT_CONTAINS':
+        return {'type': 'text', 'criteria': 'not containing', 'value': str(value)}
+
+    number_criteria = {
+        'NUMBER_EQ': '==', 'NUMBER_NOT_EQ': '!=',
+        'NUMBER_GREATER': '>', 'NUMBER_GREATER_THAN_EQ': '>=',
+        'NUMBER_LESS': '<', 'NUMBER_LESS_THAN_EQ': '<=',
+    }
+    if condition in number_criteria:
+        return {'type': 'cell', 'criteria': number_criteria[condition], 'value': value}
+    raise ValueError(f"不支援的條件式格式: {condition}")
+
+
+@dataclass
+class ExportResult:
+    """匯出結果"""
+    path: str
+    sheets: List[Tuple[str, str]] = field(default_factory=list)  # [(工作表, 摘要)]
+    skipped: List[str] = field(default_factory=list)             # 數據缺失而略過的群組
+    cells: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.skipped
+
+
+class XlsxExporter:
+    """
+    把工作表群組匯出成單一 Excel 檔
+
+    使用方式:
+        exporter = XlsxExporter()
+        result = exporter.export(groups=['league_shared', 'league_insights'])
+    """
+
+    def __init__(self, config_path: str = DEFAULT_ENGINE_CONFIG):
+        """
+        Args:
+            config_path: 引擎設定檔（與 sync_sheets.py 相同，決定有哪些群組與各群組的設定）
+        """
+        if not XLSXWRITER_AVAILABLE:
+            raise ImportError("請先安裝: pip install xlsxwriter")
+
+        with open(config_path, 'r', encoding='utf-8') as f:
+            self.targets = load_targets(json.load(f))
+
+    def render(self, ctx: ViewContext, groups: Optional[List[str]],
+               result: ExportResult) -> List[Tuple[SheetView, Rendered]]:
+        """依設定檔順序渲染所有工作表（同一群組只匯出一次）"""
+        rendered = []
+        seen = set()
+        for target in self.targets:
+            for group in target.groups:
+                if group in seen or (groups is not None and group not in groups):
+                    continue
+                seen.add(group)
+                try:
+                    rendered.extend((view, view.render(ctx)) for view in VIEW_GROUPS[group](target.config))
+                except ViewDataError as e:
+                    print(f"⚠️  {group} 略過: {e}")
+                    result.skipped.append(group)
+        return rendered
+
+    def export(self, output: str = DEFAULT_EXPORT_PATH, groups: Optional[List[str]] = None,
+               now: Optional[datetime] = None) -> ExportResult:
+        """
+        渲染並寫出 Excel 檔
+
+        Args:
+            output: 輸出路徑
+            groups: 只匯出這些工作表群組（None = 全部）
+            now: 工作表上顯示的更新時間（預設為現在）
+
+        Returns:
+            匯出結果
+        """
+        start = time.perf_counter()
+        result = ExportResult(path=output)
+
+        ctx = ViewContext(now=now or datetime.now())
+        try:
+            rendered = self.render(ctx, groups, result)
+        finally:
+            ctx.close()
+
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        try:
+            self._formats: Dict[str, Any] = {}
+            self._options: List[List[str]] = []
+            names = set()
+            for view, content in rendered:
+                name = self._sheet_name(view.title, names)
+                result.cells += self._write_sheet(workbook, name, view, content)
+                result.sheets.append((name, content.summary))
+            if self._options:
+                self._write_options(workbook)
+        finally:
+            workbook.close()
+
+        result.seconds = time.perf_counter() - start
+        return result
+
+    # ------------------------------------------------------------------
+    # 工作表
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _sheet_name(title: str, names: set) -> str:
+        """
+        Excel 可用的工作表名稱（不分大小寫唯一、最多 31 字）
+
+        不同 Spreadsheet 的同名工作表加上序號；公式參照的是先出現的那一張
+        （設定檔中排在前面的 Spreadsheet）。
+        """
+        base = _INVALID_SHEET_CHARS.sub('_', title)[:MAX_SHEET_NAME]
+        name, n = base, 2
+        while name.lower() in names:
+            suffix = f" ({n})"
+            name = base[:MAX_SHEET_NAME - len(suffix)] + suffix
+            n += 1
+        names.add(name.lower())
+        return name
+
+    def _format(self, workbook, cell_format: Optional[Dict]):
+        """同樣的格式只建立一次 xlsxwriter Format"""
+        if not cell_format:
+            return None
+        properties = format_properties(cell_format)
+        key = json.dumps(properties, sort_keys=True)
+        if key not in self._formats:
+            self._formats[key] = workbook.add_format(properties)
+        return self._formats[key]
+
+    @staticmethod
+    def _bounds(a1_range: str, last_row: int) -> Tuple[int, int, int, int]:
+        """
+        A1 範圍轉 (起始列, 起始欄, 結束列, 結束欄)（含頭尾）
+
+        'B5:B' 這類開放範圍只延伸到最後一列數據，避免格式化數百列空白。
+        """
+        grid = a1_to_grid_range(a1_range, 0)
+        first_row = grid.get('startRowIndex', 0)
+        end_row = grid.get('endRowIndex', max(last_row, first_row + 1))
+        first_col = grid.get('startColumnIndex', 0)
+        end_col = grid.get('endColumnIndex', first_col + 1)
+        return first_row, first_col, end_row - 1, end_col - 1
+
+    def _cell_formats(self, view: SheetView, content: Rendered) -> Dict[Tuple[int, int], Dict]:
+        """
+        每個儲存格最終的 CellFormat
+
+        與 SheetsBatchWriter.format() 相同：依序套用，後面的範圍覆蓋前面相同的頂層欄位。
+        constant_memory 模式下格式必須在寫入儲存格時一起給，所以先算好。
+        """
+        cells: Dict[Tuple[int, int], Dict] = {}
+        for a1_range, cell_format in view.formats + content.formats:
+            first_row, first_col, last_row, last_col = self._bounds(a1_range, len(content.rows))
+            for row in range(first_row, last_row + 1):
+                for col in range(first_col, last_col + 1):
+                    cells[(row, col)] = {**cells.get((row, col), {}), **cell_format}
+        return cells
+
+    def _write_sheet(self, workbook, name: str, view: SheetView, content: Rendered) -> int:
+        """依列寫出一張工作表，回傳寫入的儲存格數"""
+        worksheet = workbook.add_worksheet(name)
+        cell_formats = self._cell_formats(view, content)
+
+        # 欄寬與條件式格式不受逐列寫入的限制，先設定
+        for col, pixels in view.column_widths.items():
+            worksheet.set_column_pixels(col, col, pixels)
+        for rule in view.conditional:
+            first_row, first_col, last_row, last_col = self._bounds(rule['range'], len(content.rows))
+            options = conditional_options(rule, xl_rowcol_to_cell(first_row, first_col))
+            options['format'] = workbook.add_format(format_properties(rule['format']))
+            worksheet.conditional_format(first_row, first_col, last_row, last_col, options)
+        for a1_range, options in content.validations:
+            first_row, first_col, last_row, last_col = self._bounds(a1_range, len(content.rows))
+            worksheet.data_validation(first_row, first_col, last_row, last_col, self._validation(options))
+
+        formatted_rows: Dict[int, List[int]] = {}
+        for row, col in cell_formats:
+            formatted_rows.setdefault(row, []).append(col)
+
+        cells = 0
+        last_row = max([len(content.rows) - 1] + list(formatted_rows))
+        for row in range(last_row + 1):
+            values = content.rows[row] if row < len(content.rows) else []
+            columns = set(formatted_rows.get(row, [])) | set(range(len(values)))
+            for col in sorted(columns):
+                value = values[col] if col < len(values) else None
+                cell_format = self._format(workbook, cell_formats.get((row, col)))
+                if self._write_cell(worksheet, row, col, value, cell_format, view.user_entered):
+                    cells += 1
+
+        if view.hidden:
+            worksheet.hide()
+        return cells
+
+    @staticmethod
+    def _write_cell(worksheet, row: int, col: int, value: Any, cell_format, user_entered: bool) -> bool:
+        """
+        寫入一個儲存格（依型別選擇寫入方法，字串不會被誤判成公式或數字）
+
+        Returns:
+            是否寫入了數值
+        """
+        if value is None or value == '':
+            if cell_format is not None:
+                worksheet.write_blank(row, col, None, cell_format)
+            return False
+        if isinstance(value, bool):
+            worksheet.write_boolean(row, col, value, cell_format)
+        elif isinstance(value, (int, float)):
+            worksheet.write_number(row, col, value, cell_format)
+        elif user_entered and isinstance(value, str) and value.startswith('='):
+            # FILTER 與 INDEX(...):INDEX(...) 會回傳整個區塊，與 Sheets 一樣往下溢出
+            worksheet.write_dynamic_array_formula(row, col, row, col, value, cell_format)
+        else:
+            worksheet.write_string(row, col, str(value), cell_format)
+        return True
+
+    # ------------------------------------------------------------------
+    # 下拉選單
+    # ------------------------------------------------------------------
+
+    def _validation(self, options: List[str]) -> Dict:
+        """清單短時直接寫在規則裡，超過 Excel 的 255 字限制時改參照隱藏工作表的一欄"""
+        if len(','.join(options)) <= MAX_INLINE_LIST:
+            return {'validate': 'list', 'source': list(options)}
+
+        self._options.append(list(options))
+        column = xl_col_to_name(len(self._options) - 1)
+        return {
+            'validate': 'list',
+            'source': f"='{OPTIONS_SHEET}'!${column}$1:${column}${len(options)}"
+        }
+
+    def _write_options(self, workbook):
+        """所有長清單放在同一張隱藏工作表，每個清單一欄（逐列寫出）"""
+        worksheet = workbook.add_worksheet(OPTIONS_SHEET)
+        for row in range(max(len(options) for options in self._options)):
+            for col, options in enumerate(self._options):
+                if row < len(options):
+                    worksheet.write_string(row, col, str(options[row]))
+        worksheet.hide()
+
+
+def run_export(output: str = DEFAULT_EXPORT_PATH, groups: Optional[List[str]] = None,
+               config_path: str = DEFAULT_ENGINE_CONFIG) -> int:
+    """
+    命令列入口：匯出並印出結果
+
+    Returns:
+        結束代碼（有群組因數據缺失被略過時為 1）
+    """
+    print("=" * 80)
+    print("  Fantasy Basketball → Excel 匯出")
+    print("=" * 80)
+    print()
+
+    try:
+        result = XlsxExporter(config_path).export(output, groups)
+    except (ValueError, ImportError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for title, summary in result.sheets:
+        print(f"  • {title}" + (f" - {summary}" if summary else ""))
+    print()
+    print(f"✅ {result.path}: {len(result.sheets)} 張工作表、{result.cells} 格，耗時 {result.seconds:.2f}s")
+    print()
+
+    return 0 if result.ok else 1
@@ -4,6 +4,7 @@
 
 from .player import Player
 from .roster import Roster
-from .stats import PlayerStats, CategoryStats
+from .stats import GAMES_PLAYED_UNKNOWN, PlayerStats, CategoryStats, PlayerStatsColumns
 
-__all__ = ['Player', 'Roster', 'PlayerStats', 'CategoryStats']
+__all__ = ['Player', 'Roster', 'PlayerStats', 'CategoryStats', 'PlayerStatsColumns',
+           'GAMES_PLAYED_UNKNOWN']
@@ -2,9 +2,11 @@
 統計數據模型 - 針對 9-Cat Fantasy Basketball
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
 
+# Yahoo 9-cat 統計通常不含出賽數 (stat_id 0)；無法得知時以此標記，不要當成 0 場
+GAMES_PLAYED_UNKNOWN = -1
 
 @dataclass
 class PlayerStats:
@@ -29,7 +31,7 @@ class PlayerStats:
     team: str
     position: str
 
-    # 比賽場次
+    # 比賽場次（GAMES_PLAYED_UNKNOWN 表示來源沒有提供出賽數）
     games_played: int
 
     # 投籃相關
@@ -59,6 +61,10 @@ class PlayerStats:
     # 傷病狀態
     injury_status: Optional[str] = None  # GTD, INJ, O, etc.
 
+    def has_played(self) -> bool:
+        """是否有出賽（出賽數未知時視為有出賽，只有明確為 0 才排除）"""
+        return self.games_played != 0
+
     def get_at_ratio(self) -> float:
         """計算 A/T ratio (助攻失誤比)"""
         if self.to == 0:
@@ -158,3 +164,75 @@ def calculate_category_totals(player_stats_list: list[PlayerStats]) -> CategoryS
         to=sum(p.to for p in player_stats_list),
         dd=sum(p.dd for p in player_stats_list)
     )
+
+
+@dataclass
+class PlayerStatsColumns:
+    """
+    欄式 (columnar) 球員統計 - 每個欄位一個列表
+
+    大量球員時比逐筆建立 PlayerStats 物件省記憶體，也方便直接交給
+    numpy / pandas 做整欄運算；需要單筆物件時再用 row() 取出。
+    """
+
+    player_id: List[str] = field(default_factory=list)
+    player_name: List[str] = field(default_factory=list)
+    team: List[str] = field(default_factory=list)
+    position: List[str] = field(default_factory=list)
+    games_played: List[int] = field(default_factory=list)
+    fgm: List[int] = field(default_factory=list)
+    fga: List[int] = field(default_factory=list)
+    fg_pct: List[float] = field(default_factory=list)
+    ftm: List[int] = field(default_factory=list)
+    fta: List[int] = field(default_factory=list)
+    ft_pct: List[float] = field(default_factory=list)
+    three_pm: List[int] = field(default_factory=list)
+    pts: List[int] = field(default_factory=list)
+    reb: List[int] = field(default_factory=list)
+    ast: List[int] = field(default_factory=list)
+    st: List[int] = field(default_factory=list)
+    blk: List[int] = field(default_factory=list)
+    to: List[int] = field(default_factory=list)
+    dd: List[int] = field(default_factory=list)
+    injury_status: List[Optional[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.player_id)
+
+    @classmethod
+    def column_names(cls) -> List[str]:
+        """欄位名稱（與 PlayerStats 欄位相同）"""
+        return [f.name for f in fields(cls)]
+
+    def column_lists(self) -> List[tuple]:
+        """(欄位名稱, 欄位列表) 配對，供大量附加資料時使用"""
+        return [(name, getattr(self, name)) for name in self.column_names()]
+
+    def append(self, values: Dict[str, Any]) -> None:
+        """
+        新增一筆球員統計
+
+        Args:
+            values: 欄位名稱 -> 數值，缺少的數值欄位補 0（出賽數補 GAMES_PLAYED_UNKNOWN）
+        """
+        for name in self.column_names():
+            if name == 'injury_status':
+                default = None
+            elif name == 'games_played':
+                default = GAMES_PLAYED_UNKNOWN
+            else:
+                default = 0
+            getattr(self, name).append(values.get(name, default))
+
+    def extend(self, other: 'PlayerStatsColumns') -> None:
+        """合併另一份欄式統計"""
+        for name in self.column_names():
+            getattr(self, name).extend(getattr(other, name))
+
+    def row(self, index: int) -> PlayerStats:
+        """取出單筆 PlayerStats"""
+        return PlayerStats(**{name: getattr(self, name)[index] for name in self.column_names()})
+
+    def to_player_stats(self) -> List[PlayerStats]:
+        """轉換為 PlayerStats 列表"""
+        return [self.row(i) for i in range(len(self))]
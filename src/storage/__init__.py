@@ -0,0 +1,10 @@
+"""
+聯盟數據儲存模組
+"""
+
+from .league_snapshot import LeagueSnapshot
+from .league_store import LeagueStore
+from .snapshot_history import SnapshotHistory
+from .stats_dataset import PlayerStatsDataset
+
+__all__ = ['LeagueStore', 'LeagueSnapshot', 'SnapshotHistory', 'PlayerStatsDataset']
@@ -0,0 +1,422 @@
+"""
+產出檔案的原子寫入與 manifest
+
+產生器原本直接覆寫 data/*.json，run_all_sync.py 再用 cp 複製到 web/data，
+server.js 可能讀到寫到一半的檔案。這裡統一：
+
+1. 串流寫入同目錄的暫存檔（JSON 邊編碼邊計算 sha256）
+2. fsync 後以 os.replace 原子替換，讀取端只會看到舊檔或新檔
+3. 在同目錄的 manifest.json 記錄每個檔案的 sha256 / 大小 / 時間，
+   讀取端比對 hash 沒變就不必重新讀取與解析
+
+大型產出檔（每名球員一筆）用 open_json_artifact 逐筆寫入，搭配
+RecordSpool 暫存已評分的球員並依分數排序，記憶體只保留排序鍵，
+不必先組出整份 dict：
+
+    spool = RecordSpool()
+    for player in ...:
+        spool.add(score(player), key=...)
+
+    with open_json_artifact('data/advanced_trade_value.json') as out:
+        out.field('total_players', len(spool))
+        with out.array('players') as players:
+            for record in spool.sorted(reverse=True):
+                players.append(record)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, BinaryIO, Tuple
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+MANIFEST_FILE = 'manifest.json'
+
+# 串流複製的區塊大小
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 新檔案的權限（mkstemp 預設 0600，server.js 可能以其他使用者執行）
+DEFAULT_FILE_MODE = 0o644
+
+
+def _fsync_dir(directory: Path) -> None:
+    """讓 rename 本身也寫入磁碟（部分平台不支援開啟目錄，略過即可）"""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path: str) -> Iterator[BinaryIO]:
+    """
+    以二進位模式開啟暫存檔，區塊結束時 fsync 並原子替換成 path
+
+    發生例外時刪除暫存檔，原檔案保持不變。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = DEFAULT_FILE_MODE
+
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(path.parent)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def file_sha256(path: str) -> str:
+    """計算檔案的 sha256"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _json_encoder(compact: bool) -> json.JSONEncoder:
+    if compact:
+        return json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    return json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def _entry(sha256: str, size: int) -> Dict:
+    return {
+        'sha256': sha256,
+        'size': size,
+        'written_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def write_json_artifact(path: str, data: Any, compact: bool = True, manifest: bool = True) -> Dict:
+    """
+    原子寫入 JSON 產出檔並更新 manifest
+
+    Args:
+        path: 輸出路徑
+        data: 要寫入的數據
+        compact: 不縮排（檔案較小、寫入較快）；False 時保留 indent=2
+        manifest: 是否更新同目錄的 manifest.json
+
+    Returns:
+        manifest 紀錄 {'sha256', 'size', 'written_at'}
+    """
+    encoder = _json_encoder(compact)
+
+    hasher = hashlib.sha256()
+    size = 0
+    with atomic_open(path) as f:
+        for chunk in encoder.iterencode(data):
+            encoded = chunk.encode('utf-8')
+            hasher.update(encoded)
+            f.write(encoded)
+            size += len(encoded)
+
+    entry = _entry(hasher.hexdigest(), size)
+    if manifest:
+        update_manifest(Path(path).parent, {Path(path).name: entry})
+    return entry
+
+
+class _HashingWriter:
+    """寫入檔案並同時計算 sha256 與大小"""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        encoded = text.encode('utf-8')
+        self.hasher.update(encoded)
+        self._f.write(encoded)
+        self.size += len(encoded)
+
+
+class JsonStreamWriter:
+    """
+    逐欄位 / 逐筆寫入的 JSON 物件或陣列
+
+    由 open_json_artifact 建立；巢狀的 object() / array() 必須以 with 使用，
+    區塊結束時才補上結尾括號。非 compact 模式下每個元素各佔一行
+    （不做完整縮排，方便 diff）。
+    """
+
+    def __init__(self, out: _HashingWriter, encoder: json.JSONEncoder, compact: bool, is_array: bool):
+        self._out = out
+        self._encoder = encoder
+        self._compact = compact
+        self._is_array = is_array
+        self._count = 0
+        self._out.write('[' if is_array else '{')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _begin_item(self, key: Optional[str]) -> None:
+        if self._is_array and key is not None:
+            raise TypeError("陣列元素不能指定 key")
+        if not self._is_array and key is None:
+            raise TypeError("物件欄位必須指定 key")
+
+        if self._count:
+            self._out.write(',')
+        if not self._compact:
+            self._out.write('\n')
+        if key is not None:
+            self._out.write(self._encoder.encode(str(key)) + (':' if self._compact else ': '))
+        self._count += 1
+
+    def _write_value(self, value: Any) -> None:
+        for chunk in self._encoder.iterencode(value):
+            self._out.write(chunk)
+
+    def field(self, key: str, value: Any) -> None:
+        """寫入物件欄位"""
+        self._begin_item(key)
+        self._write_value(value)
+
+    def append(self, value: Any) -> None:
+        """寫入陣列元素"""
+        self._begin_item(None)
+        self._write_value(value)
+
+    def extend(self, values: Iterator[Any]) -> None:
+        """逐筆寫入多個陣列元素"""
+        for value in values:
+            self.append(value)
+
+    @contextmanager
+    def object(self, key: Optional[str] = None) -> Iterator['JsonStreamWriter']:
+        """巢狀物件（物件中需指定 key，陣列中不指定）"""
+        self._begin_item(key)
+        child = JsonStreamWriter(self._out, self._encoder, self._compact, is_array=False)
+        yield child
+        child._close()
+
+    @contextmanager
+    def array(self, key: Optional[str] = None) -> Iterator['JsonStreamWriter']:
+        """巢狀陣列（物件中需指定 key，陣列中不指定）"""
+        self._begin_item(key)
+        child = JsonStreamWriter(self._out, self._encoder, self._compact, is_array=True)
+        yield child
+        child._close()
+
+    def _close(self) -> None:
+        if not self._compact and self._count:
+            self._out.write('\n')
+        self._out.write(']' if self._is_array else '}')
+
+
+@contextmanager
+def open_json_artifact(path: str, compact: bool = True, manifest: bool = True) -> Iterator[JsonStreamWriter]:
+    """
+    以串流方式寫入 JSON 物件產出檔（原子替換並更新 manifest）
+
+    Args:
+        path: 輸出路徑
+        compact: 不縮排；False 時每個元素一行
+        manifest: 是否更新同目錄的 manifest.json
+
+    Yields:
+        最外層物件的 JsonStreamWriter
+    """
+    with atomic_open(path) as f:
+        out = _HashingWriter(f)
+        root = JsonStreamWriter(out, _json_encoder(compact), compact, is_array=False)
+        yield root
+        root._close()
+
+    if manifest:
+        update_manifest(Path(path).parent, {Path(path).name: _entry(out.hasher.hexdigest(), out.size)})
+
+
+class RecordSpool:
+    """
+    已產生的紀錄暫存在匿名暫存檔（每筆一行 JSON），記憶體只保留排序鍵與位移
+
+    產生器可以邊評分邊寫出，最後再依分數排序輸出，不需把所有紀錄留在記憶體。
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._index: List[Tuple[Any, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, record: Dict, key: Any = None) -> None:
+        """
+        新增一筆紀錄
+
+        Args:
+            record: 紀錄
+            key: 排序鍵（sorted() 使用）
+        """
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        self._file.write(b'\n')
+        self._index.append((key, offset))
+
+    def _read_at(self, offset: int) -> Dict:
+        self._file.seek(offset)
+        return json.loads(self._file.readline())
+
+    def records(self) -> Iterator[Dict]:
+        """依加入順序逐筆讀出"""
+        for _, offset in self._index:
+            yield self._read_at(offset)
+
+    def sorted(self, reverse: bool = False, key: Optional[Callable[[Any], Any]] = None) -> Iterator[Dict]:
+        """
+        依排序鍵逐筆讀出（穩定排序，同分維持加入順序，與 list.sort 相同）
+
+        Args:
+            reverse: 由大到小
+            key: 對排序鍵再套用的函式
+        """
+        sort_key = (lambda item: key(item[0])) if key else (lambda item: item[0])
+        for _, offset in sorted(self._index, key=sort_key, reverse=reverse):
+            yield self._read_at(offset)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'RecordSpool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def record_artifact(path: str) -> Dict:
+    """把已寫好的檔案（例如二進位快照）登記到 manifest"""
+    path = Path(path)
+    entry = _entry(file_sha256(path), path.stat().st_size)
+    update_manifest(path.parent, {path.name: entry})
+    return entry
+
+
+def copy_artifact(src: str, dest_dir: str) -> Dict:
+    """
+    原子複製產出檔到另一個目錄，並更新目的地的 manifest
+
+    Args:
+        src: 來源檔案
+        dest_dir: 目的地目錄
+
+    Returns:
+        manifest 紀錄
+    """
+    src = Path(src)
+    dest = Path(dest_dir) / src.name
+
+    hasher = hashlib.sha256()
+    size = 0
+    with open(src, 'rb') as source, atomic_open(dest) as f:
+        for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+
+    entry = _entry(hasher.hexdigest(), size)
+    update_manifest(dest.parent, {dest.name: entry})
+    return entry
+
+
+def read_manifest(directory: str) -> Dict:
+    """
+    讀取目錄的 manifest
+
+    Returns:
+        {'updated_at', 'artifacts': {檔名: 紀錄}}，不存在時 artifacts 為空
+    """
+    path = Path(directory) / MANIFEST_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'updated_at': None, 'artifacts': {}}
+
+
+def artifact_hash(path: str) -> Optional[str]:
+    """manifest 中某檔案的 sha256，沒有紀錄時回傳 None"""
+    path = Path(path)
+    entry = read_manifest(path.parent).get('artifacts', {}).get(path.name)
+    return entry.get('sha256') if entry else None
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    以 path 旁的 .<檔名>.lock 取得獨佔檔案鎖，讓同時執行的腳本依序讀寫 path
+
+    沒有 fcntl 的平台（Windows）不加鎖。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.parent / f'.{path.name}.lock', 'a') as lock:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def update_manifest(directory: str, entries: Dict[str, Dict]) -> None:
+    """
+    合併紀錄到目錄的 manifest（以檔案鎖避免同時執行的腳本互相覆蓋）
+
+    hash 沒變的檔案保留原紀錄；全部沒變時不改寫 manifest，
+    讓 run_all_sync.py 的 git diff 能正確判斷「數據無變更」。
+
+    Args:
+        directory: 目錄
+        entries: {檔名: 紀錄}
+    """
+    directory = Path(directory)
+
+    with file_lock(directory / MANIFEST_FILE):
+        manifest = read_manifest(directory)
+        artifacts = manifest.setdefault('artifacts', {})
+        changed = {
+            name: entry for name, entry in entries.items()
+            if artifacts.get(name, {}).get('sha256') != entry['sha256']
+        }
+        if not changed:
+            return
+        artifacts.update(changed)
+        manifest['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with atomic_open(directory / MANIFEST_FILE) as f:
+            f.write(json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
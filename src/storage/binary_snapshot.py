@@ -0,0 +1,388 @@
+"""
+二進位聯盟快照（memory-map）
+
+full_league_data.json 與 advanced_trade_value.json 每次讀取都要整份
+json.load 並建立 Python 物件。這裡改存成固定寬度的二進位表：
+
+    [header][隊伍表][球員表][字串索引][字串資料]
+
+- 隊伍 / 球員都是 struct 固定寬度紀錄，第 i 筆在固定位移，不需解析
+- 所有文字（名稱、NBA 隊伍、狀態、位置）放在去重的字串表，紀錄只存編號
+- 讀取端以 mmap 開啟，只解碼實際存取到的紀錄與字串
+
+快照只在 generate_advanced_trade_value.py 重算交易價值後寫出一次（供 notebook
+與離線分析使用）；抓取流程與常駐排程的各階段都查詢 LeagueStore，不在每次
+抓取時重寫快照。
+
+用法：
+    snapshot = BinarySnapshot('data/league_snapshot.bin')
+    roster = snapshot.roster(8)              # models.Roster
+    values = snapshot.column('trade_value')  # 整欄數值
+
+效能比較：python -m src.storage.binary_snapshot
+"""
+
+import json
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..models.player import Player
+from ..models.roster import Roster
+from .artifacts import atomic_open, record_artifact
+
+DEFAULT_SNAPSHOT_PATH = 'data/league_snapshot.bin'
+DEFAULT_TRADE_VALUE_PATH = 'data/advanced_trade_value.json'
+
+MAGIC = b'FBSN'
+FORMAT_VERSION = 1
+
+# magic, version, flags, 隊伍數, 球員數, 字串數, 隊伍表位移, 球員表位移, 字串索引位移, 字串資料位移,
+# 當前週次, 總週數, 聯盟名稱, 賽季, 最後更新（字串編號）
+HEADER = struct.Struct('<4sHHIIIIIIIHHIII')
+
+# team_id, 隊名, 經理, 排名, 勝, 敗, 和, 第一名球員索引, 球員數
+TEAM = struct.Struct('<iIIhhhhII')
+TEAM_FIELDS = ('team_id', 'team_name', 'manager', 'rank', 'wins', 'losses', 'ties', 'first_player', 'player_count')
+
+# player_id, 聯盟隊伍, 名稱, NBA 隊伍, 狀態, 位置（逗號分隔）, 位置 bitmask, 交易價值等級, 交易價值
+PLAYER = struct.Struct('<iiIIIIBc2xf')
+PLAYER_FIELDS = (
+    'player_id', 'fantasy_team_id', 'name', 'nba_team', 'status', 'positions',
+    'position_mask', 'tier', 'trade_value'
+)
+STRING_FIELDS = {'name', 'nba_team', 'status', 'positions', 'team_name', 'manager'}
+
+# 位置 bitmask 的位元順序
+POSITION_BITS = ('PG', 'SG', 'G', 'SF', 'PF', 'F', 'C', 'Util')
+
+UNKNOWN_ID = -1
+
+
+class _StringTable:
+    """建立快照時的去重字串表"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def add(self, text: Optional[str]) -> int:
+        text = '' if text is None else str(text)
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = len(self.strings)
+            self._ids[text] = sid
+            self.strings.append(text)
+        return sid
+
+    def pack(self) -> tuple:
+        """回傳 (索引 bytes, 資料 bytes)"""
+        data = bytearray()
+        offsets = [0]
+        for text in self.strings:
+            data += text.encode('utf-8')
+            offsets.append(len(data))
+        return struct.pack(f'<{len(offsets)}I', *offsets), bytes(data)
+
+
+def _position_mask(positions: List[str]) -> int:
+    mask = 0
+    for pos in positions:
+        if pos in POSITION_BITS:
+            mask |= 1 << POSITION_BITS.index(pos)
+    return mask
+
+
+def _int_or_unknown(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return UNKNOWN_ID
+
+
+def write_snapshot(
+    league_data: Dict,
+    trade_value_data: Optional[Dict] = None,
+    path: str = DEFAULT_SNAPSHOT_PATH
+) -> Path:
+    """
+    建立二進位快照
+
+    Args:
+        league_data: full_league_data.json 格式的聯盟數據
+        trade_value_data: advanced_trade_value.json 格式（可選，提供交易價值與等級）
+        path: 輸出路徑
+
+    Returns:
+        輸出路徑
+    """
+    strings = _StringTable()
+    strings.add('')  # 編號 0 固定為空字串
+
+    # 交易價值以 (聯盟隊伍, 球員名稱) 對應
+    trade_values = {}
+    for player in (trade_value_data or {}).get('players', []):
+        key = (str(player.get('fantasy_team_id')), player.get('player_name'))
+        trade_values[key] = (player.get('tier') or '', player.get('scores', {}).get('total'))
+
+    rosters = league_data.get('rosters', {})
+    team_records = []
+    player_records = []
+
+    for team in league_data.get('teams', []):
+        team_id = str(team['team_id'])
+        roster = rosters.get(team_id, [])
+        team_records.append(TEAM.pack(
+            int(team['team_id']), strings.add(team.get('team_name')), strings.add(team.get('manager')),
+            int(team.get('rank') or 0), int(team.get('wins', 0)), int(team.get('losses', 0)),
+            int(team.get('ties', 0)), len(player_records), len(roster)
+        ))
+
+        for player in roster:
+            positions = player.get('positions', [])
+            tier, value = trade_values.get((team_id, player.get('name')), ('', None))
+            player_records.append(PLAYER.pack(
+                _int_or_unknown(player.get('player_id')), int(team['team_id']),
+                strings.add(player.get('name')), strings.add(player.get('team')),
+                strings.add(player.get('status')), strings.add(','.join(positions)),
+                _position_mask(positions), (tier or ' ')[0].encode('ascii'),
+                float(value) if value is not None else math.nan
+            ))
+
+    meta_ids = (
+        strings.add(league_data.get('league_name')),
+        strings.add(league_data.get('season')),
+        strings.add(league_data.get('last_updated'))
+    )
+    string_index, string_data = strings.pack()
+
+    teams_offset = HEADER.size
+    players_offset = teams_offset + TEAM.size * len(team_records)
+    string_index_offset = players_offset + PLAYER.size * len(player_records)
+    string_data_offset = string_index_offset + len(string_index)
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(team_records), len(player_records), len(strings.strings),
+        teams_offset, players_offset, string_index_offset, string_data_offset,
+        int(league_data.get('current_week') or 0), int(league_data.get('total_weeks') or 0),
+        *meta_ids
+    )
+
+    path = Path(path)
+    with atomic_open(path) as f:
+        f.write(header)
+        f.write(b''.join(team_records))
+        f.write(b''.join(player_records))
+        f.write(string_index)
+        f.write(string_data)
+    record_artifact(path)
+    return path
+
+
+def latest_trade_values(path: str = DEFAULT_TRADE_VALUE_PATH) -> Optional[Dict]:
+    """
+    上一次產生的 advanced_trade_value.json
+
+    不存在或無法讀取時回傳 None。
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class BinarySnapshot:
+    """以 mmap 讀取二進位快照，只解碼實際存取到的紀錄"""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        """
+        Args:
+            path: 快照檔案路徑
+
+        Raises:
+            ValueError: 檔案格式不符
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, _flags, self.team_count, self.player_count, self._string_count,
+         self._teams_offset, self._players_offset, self._string_index_offset, self._string_data_offset,
+         self.current_week, self.total_weeks,
+         league_name_id, season_id, last_updated_id) = HEADER.unpack_from(self._view, 0)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"不是有效的聯盟快照: {self.path}")
+
+        self._strings: Dict[int, str] = {}
+        self._team_index: Optional[Dict[int, int]] = None
+
+        self.league_name = self.string(league_name_id)
+        self.season = self.string(season_id)
+        self.last_updated = self.string(last_updated_id)
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def string(self, sid: int) -> str:
+        """解碼字串表中的第 sid 個字串（有快取）"""
+        text = self._strings.get(sid)
+        if text is None:
+            start, end = struct.unpack_from('<II', self._view, self._string_index_offset + sid * 4)
+            base = self._string_data_offset
+            text = str(self._view[base + start:base + end], 'utf-8')
+            self._strings[sid] = text
+        return text
+
+    def _decode(self, fields: tuple, values: tuple) -> Dict:
+        record = {}
+        for name, value in zip(fields, values):
+            if name in STRING_FIELDS:
+                value = self.string(value)
+            record[name] = value
+        return record
+
+    def team(self, index: int) -> Dict:
+        """第 index 支隊伍"""
+        values = TEAM.unpack_from(self._view, self._teams_offset + index * TEAM.size)
+        return self._decode(TEAM_FIELDS, values)
+
+    def teams(self) -> List[Dict]:
+        """所有隊伍（依 standings 順序）"""
+        return [self.team(i) for i in range(self.team_count)]
+
+    def player(self, index: int) -> Dict:
+        """第 index 名球員"""
+        values = PLAYER.unpack_from(self._view, self._players_offset + index * PLAYER.size)
+        player = self._decode(PLAYER_FIELDS, values)
+        player['positions'] = player['positions'].split(',') if player['positions'] else []
+        player['tier'] = player['tier'].decode('ascii').strip()
+        if player['player_id'] == UNKNOWN_ID:
+            player['player_id'] = None
+        if math.isnan(player['trade_value']):
+            player['trade_value'] = None
+        return player
+
+    def _team_position(self, team_id: Any) -> int:
+        if self._team_index is None:
+            self._team_index = {
+                TEAM.unpack_from(self._view, self._teams_offset + i * TEAM.size)[0]: i
+                for i in range(self.team_count)
+            }
+        return self._team_index[int(team_id)]
+
+    def team_players(self, team_id: Any) -> List[Dict]:
+        """
+        單一隊伍的球員
+
+        Raises:
+            KeyError: 找不到隊伍
+        """
+        team = TEAM.unpack_from(self._view, self._teams_offset + self._team_position(team_id) * TEAM.size)
+        first, count = team[7], team[8]
+        return [self.player(i) for i in range(first, first + count)]
+
+    def roster(self, team_id: Any) -> Roster:
+        """
+        單一隊伍的陣容（models.Roster，球員不含統計）
+
+        Raises:
+            KeyError: 找不到隊伍
+        """
+        team = self.team(self._team_position(team_id))
+        players = [
+            Player(
+                player_id=str(p['player_id']) if p['player_id'] is not None else '',
+                name=p['name'],
+                team=p['nba_team'],
+                positions=p['positions'],
+                injury_status=p['status'] or None
+            )
+            for p in self.team_players(team_id)
+        ]
+        return Roster(team_name=team['team_name'], players=players)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        球員表的整欄數值（依球員順序，不建立球員字典）
+
+        Args:
+            name: PLAYER_FIELDS 中的欄位名稱
+        """
+        index = PLAYER_FIELDS.index(name)
+        region = self._view[self._players_offset:self._players_offset + self.player_count * PLAYER.size]
+        values = [row[index] for row in PLAYER.iter_unpack(region)]
+        region.release()
+        if name in STRING_FIELDS:
+            return [self.string(v) for v in values]
+        return values
+
+
+def _benchmark(iterations: int = 20) -> None:
+    """比較 json.load 與二進位快照的冷啟動時間（每次在新行程中量測）"""
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+
+    league_path = Path(DEFAULT_SNAPSHOT_PATH).parent / 'full_league_data.json'
+    trade_path = Path(DEFAULT_TRADE_VALUE_PATH)
+    with open(league_path, 'r', encoding='utf-8') as f:
+        league_data = json.load(f)
+    trade_data = latest_trade_values(trade_path)
+
+    snapshot_path = Path(tempfile.mkdtemp()) / 'league_snapshot.bin'
+    write_snapshot(league_data, trade_data, snapshot_path)
+    team_id = league_data['teams'][0]['team_id']
+
+    # 載入兩份數據並取出一支隊伍的陣容與所有交易價值
+    json_code = f"""
+import json, time
+t = time.perf_counter()
+with open({str(league_path)!r}, encoding='utf-8') as f:
+    league = json.load(f)
+trade = {{'players': []}}
+if {trade_data is not None}:
+    with open({str(trade_path)!r}, encoding='utf-8') as f:
+        trade = json.load(f)
+roster = league['rosters'][{str(team_id)!r}]
+values = [p['scores']['total'] for p in trade['players']]
+print(time.perf_counter() - t)
+"""
+    binary_code = f"""
+import time
+from src.storage.binary_snapshot import BinarySnapshot
+t = time.perf_counter()
+snapshot = BinarySnapshot({str(snapshot_path)!r})
+roster = snapshot.team_players({team_id})
+values = snapshot.column('trade_value')
+print(time.perf_counter() - t)
+"""
+
+    def measure(code: str) -> float:
+        samples = []
+        for _ in range(iterations):
+            out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+            samples.append(float(out.stdout.strip()))
+        return statistics.median(samples) * 1000
+
+    json_size = league_path.stat().st_size + (trade_path.stat().st_size if trade_data else 0)
+    print(f"JSON: {json_size / 1024:.0f} KB, 快照: {snapshot_path.stat().st_size / 1024:.0f} KB")
+    print(f"json.load 冷啟動: {measure(json_code):.2f} ms")
+    print(f"mmap 快照冷啟動: {measure(binary_code):.2f} ms")
+
+
+if __name__ == '__main__':
+    _benchmark()
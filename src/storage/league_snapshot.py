@@ -0,0 +1,164 @@
+"""
+full_league_data.json 的查詢索引
+
+匯出 full_league_data.json 時一併寫入 'indexes'，讀取端不必每次線性搜尋：
+
+    'indexes': {
+        'version': 1,
+        'teams': {team_id: teams 中的位置},
+        'players': {player_id: [team_id, rosters[team_id] 中的位置]},
+        'player_names': {球員名稱: [team_id, 位置]}
+    }
+
+週次 → 對戰已是 matchups_by_week（key 為 'week_N'），隊伍 → 週次 → 對手
+已是 team_schedules，LeagueSnapshot 直接以 key 查詢，不另外重複存一份。
+
+用法：
+    snapshot = LeagueSnapshot.load()
+    team = snapshot.team(8)
+    player = snapshot.player_by_name('Nikola Jokic')
+    opponent = snapshot.opponent(8, 5)
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_JSON_PATH = 'data/full_league_data.json'
+
+INDEX_VERSION = 1
+
+
+def build_indexes(league_data: Dict) -> Dict:
+    """
+    建立查詢索引
+
+    Args:
+        league_data: full_league_data.json 格式的聯盟數據
+
+    Returns:
+        'indexes' 區塊
+    """
+    teams = {str(team['team_id']): row for row, team in enumerate(league_data.get('teams', []))}
+
+    players: Dict[str, List] = {}
+    player_names: Dict[str, List] = {}
+    for team_id, roster in league_data.get('rosters', {}).items():
+        for row, player in enumerate(roster):
+            location = [str(team_id), row]
+            if player.get('player_id') is not None:
+                players.setdefault(str(player['player_id']), location)
+            if player.get('name'):
+                player_names.setdefault(player['name'], location)
+
+    return {
+        'version': INDEX_VERSION,
+        'teams': teams,
+        'players': players,
+        'player_names': player_names
+    }
+
+
+def with_indexes(league_data: Dict) -> Dict:
+    """回傳加上 'indexes' 的聯盟數據（不修改原本的 dict）"""
+    indexed = dict(league_data)
+    indexed['indexes'] = build_indexes(league_data)
+    return indexed
+
+
+class LeagueSnapshot:
+    """以索引查詢 full_league_data.json"""
+
+    def __init__(self, league_data: Dict):
+        """
+        Args:
+            league_data: full_league_data.json 格式的聯盟數據；
+                沒有索引或索引版本不符時在記憶體中重建
+        """
+        self.data = league_data
+        indexes = league_data.get('indexes')
+        if not indexes or indexes.get('version') != INDEX_VERSION:
+            indexes = build_indexes(league_data)
+        self._teams: Dict[str, int] = indexes['teams']
+        self._players: Dict[str, List] = indexes['players']
+        self._player_names: Dict[str, List] = indexes['player_names']
+
+    @classmethod
+    def load(cls, json_path: str = DEFAULT_JSON_PATH) -> 'LeagueSnapshot':
+        """
+        讀取 full_league_data.json
+
+        Raises:
+            FileNotFoundError: 檔案不存在
+        """
+        with open(Path(json_path), 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def current_week(self) -> Optional[int]:
+        return self.data.get('current_week')
+
+    def teams(self) -> List[Dict]:
+        """所有隊伍（依 standings 順序）"""
+        return self.data.get('teams', [])
+
+    def team(self, team_id: Any) -> Optional[Dict]:
+        """單一隊伍，找不到時回傳 None"""
+        row = self._teams.get(str(team_id))
+        return self.data['teams'][row] if row is not None else None
+
+    def roster(self, team_id: Any) -> List[Dict]:
+        """單一隊伍的陣容"""
+        return self.data.get('rosters', {}).get(str(team_id), [])
+
+    def _player_at(self, location: Optional[List]) -> Optional[Tuple[str, Dict]]:
+        if location is None:
+            return None
+        team_id, row = location
+        return team_id, self.data['rosters'][team_id][row]
+
+    def locate(self, player_id: Any) -> Optional[Tuple[str, Dict]]:
+        """
+        依 player_id 找球員
+
+        Returns:
+            (所屬隊伍 team_id, 球員)，找不到時回傳 None
+        """
+        return self._player_at(self._players.get(str(player_id)))
+
+    def player(self, player_id: Any) -> Optional[Dict]:
+        """依 player_id 找球員"""
+        found = self.locate(player_id)
+        return found[1] if found else None
+
+    def player_by_name(self, name: str) -> Optional[Dict]:
+        """依名稱找球員（同名時為第一位）"""
+        found = self._player_at(self._player_names.get(name))
+        return found[1] if found else None
+
+    def team_of(self, player_id: Any) -> Optional[Dict]:
+        """球員所屬的聯盟隊伍"""
+        found = self.locate(player_id)
+        return self.team(found[0]) if found else None
+
+    def matchups(self, week: int) -> List[Dict]:
+        """某週的對戰"""
+        return self.data.get('matchups_by_week', {}).get(f'week_{int(week)}', [])
+
+    def schedule(self, team_id: Any) -> Dict[str, Dict]:
+        """
+        隊伍賽程
+
+        Returns:
+            {週次字串: {'opponent_id', 'opponent_name'}}
+        """
+        return self.data.get('team_schedules', {}).get(str(team_id), {})
+
+    def opponent(self, team_id: Any, week: int) -> Optional[Dict]:
+        """
+        某隊某週的對手
+
+        Returns:
+            {'opponent_id', 'opponent_name'}，沒有對戰時回傳 None
+        """
+        return self.schedule(team_id).get(str(int(week)))
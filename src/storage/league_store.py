@@ -0,0 +1,510 @@
+"""
+聯盟數據儲存（SQLite）
+
+各階段原本都要整份讀取 data/full_league_data.json，抓取流程也整份覆寫。
+改為存在 data/league.db，依 team_id / week / player_id 建索引，
+每個階段只查詢需要的部分；寫入以交易包住，不會留下半份數據。
+
+data/full_league_data.json 仍由 export_json() 產生，供 server.js 與網頁使用。
+每次完整寫入同時在 history（SnapshotHistory）新增一個版本。
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .artifacts import write_json_artifact
+from .league_snapshot import with_indexes
+from .snapshot_history import SnapshotHistory, normalize
+
+DEFAULT_DB_PATH = 'data/league.db'
+DEFAULT_JSON_PATH = 'data/full_league_data.json'
+
+# full_league_data.json 最上層的純量欄位，存在 league_meta
+META_KEYS = (
+    'league_name', 'league_id', 'num_teams', 'current_week', 'total_weeks',
+    'season', 'freshness', 'last_updated'
+)
+
+# league_meta 中記錄 full_league_data.json 上次匯入 / 匯出時的 mtime 與大小；
+# 檔案沒變就不必整份解析（不屬於聯盟數據，to_league_data 不會輸出）
+JSON_SOURCE_KEY = '_json_source'
+
+# 球員欄位中有獨立欄位的部分，其餘存在 extra
+ROSTER_COLUMNS = ('player_id', 'name', 'positions', 'status', 'team')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS league_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    sort_order INTEGER NOT NULL,
+    rank INTEGER,
+    team_name TEXT NOT NULL,
+    manager TEXT,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS rosters (
+    team_id INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    player_id INTEGER,
+    name TEXT NOT NULL,
+    positions TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT '',
+    nba_team TEXT NOT NULL DEFAULT '',
+    extra TEXT,
+    PRIMARY KEY (team_id, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_rosters_player ON rosters (player_id);
+
+CREATE TABLE IF NOT EXISTS player_positions (
+    team_id INTEGER NOT NULL,
+    player_id INTEGER,
+    position TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_player_positions_team ON player_positions (team_id);
+CREATE INDEX IF NOT EXISTS idx_player_positions_position ON player_positions (position);
+
+CREATE TABLE IF NOT EXISTS matchups (
+    week INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    team1_id INTEGER NOT NULL,
+    team1_name TEXT,
+    team2_id INTEGER NOT NULL,
+    team2_name TEXT,
+    PRIMARY KEY (week, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_matchups_team1 ON matchups (team1_id, week);
+CREATE INDEX IF NOT EXISTS idx_matchups_team2 ON matchups (team2_id, week);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    team_id INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    opponent_id INTEGER,
+    opponent_name TEXT,
+    PRIMARY KEY (team_id, week)
+);
+"""
+
+
+class LeagueStore:
+    """聯盟數據 SQLite 儲存"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        開啟（必要時建立）資料庫
+
+        Args:
+            db_path: SQLite 檔案路徑
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        # WAL：同步腳本讀取時，抓取流程仍可寫入
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.history = SnapshotHistory(self.conn)
+
+    @classmethod
+    def open(cls, db_path: str = DEFAULT_DB_PATH, json_path: str = DEFAULT_JSON_PATH) -> 'LeagueStore':
+        """
+        開啟資料庫，並在 JSON 比資料庫新時（或資料庫為空）匯入 JSON
+
+        JSON 自上次匯入 / 匯出後沒有變動（mtime 與大小相同）時不會讀取檔案。
+
+        Args:
+            db_path: SQLite 檔案路徑
+            json_path: full_league_data.json 路徑
+        """
+        store = cls(db_path)
+        store.import_json(json_path, only_if_newer=True)
+        return store
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'LeagueStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 寫入
+    # ------------------------------------------------------------------
+
+    def save_league_data(self, league_data: Dict, record_history: bool = True) -> None:
+        """
+        以單一交易寫入完整聯盟數據（full_league_data.json 格式）
+
+        Args:
+            league_data: 聯盟數據
+            record_history: 是否同時新增一個歷史版本
+        """
+        with self.conn:
+            if record_history:
+                self.history._append(league_data)
+            self._write_meta({key: league_data[key] for key in META_KEYS if key in league_data})
+            self._write_teams(league_data.get('teams', []))
+
+            # 完整快照：先清空，避免殘留已不存在的隊伍或週次
+            self.conn.execute('DELETE FROM rosters')
+            self.conn.execute('DELETE FROM player_positions')
+            self.conn.execute('DELETE FROM matchups')
+            for team_id, players in league_data.get('rosters', {}).items():
+                self._write_roster(team_id, players)
+
+            for week_key, matchups in league_data.get('matchups_by_week', {}).items():
+                self._write_week_matchups(int(week_key.split('_')[1]), matchups)
+
+            self.conn.execute('DELETE FROM schedules')
+            for team_id, weeks in league_data.get('team_schedules', {}).items():
+                self.conn.executemany(
+                    'INSERT INTO schedules (team_id, week, opponent_id, opponent_name) VALUES (?, ?, ?, ?)',
+                    [
+                        (int(team_id), int(week), opponent.get('opponent_id'), opponent.get('opponent_name'))
+                        for week, opponent in weeks.items()
+                    ]
+                )
+
+    def upsert_roster(self, team_id: Any, players: List[Dict]) -> None:
+        """以交易替換單一隊伍的陣容"""
+        with self.conn:
+            self._write_roster(team_id, players)
+
+    def upsert_week_matchups(self, week: int, matchups: List[Dict]) -> None:
+        """以交易替換單一週次的對戰，並同步更新雙方的賽程"""
+        with self.conn:
+            self._write_week_matchups(week, matchups)
+            self.conn.execute('DELETE FROM schedules WHERE week = ?', (int(week),))
+            self.conn.executemany(
+                'INSERT INTO schedules (team_id, week, opponent_id, opponent_name) VALUES (?, ?, ?, ?)',
+                [
+                    row
+                    for m in matchups
+                    for row in (
+                        (m['team1_id'], int(week), m['team2_id'], m['team2_name']),
+                        (m['team2_id'], int(week), m['team1_id'], m['team1_name'])
+                    )
+                ]
+            )
+
+    def set_meta(self, **values: Any) -> None:
+        """更新聯盟資訊欄位"""
+        with self.conn:
+            self._write_meta(values)
+
+    def _write_meta(self, values: Dict) -> None:
+        self.conn.executemany(
+            'INSERT INTO league_meta (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            [(key, json.dumps(value, ensure_ascii=False)) for key, value in values.items()]
+        )
+
+    def _write_teams(self, teams: List[Dict]) -> None:
+        self.conn.execute('DELETE FROM teams')
+        self.conn.executemany(
+            'INSERT INTO teams (team_id, sort_order, rank, team_name, manager, wins, losses, ties) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (
+                    team['team_id'], i, team.get('rank'), team['team_name'], team.get('manager'),
+                    team.get('wins', 0), team.get('losses', 0), team.get('ties', 0)
+                )
+                for i, team in enumerate(teams)
+            ]
+        )
+
+    def _write_roster(self, team_id: Any, players: List[Dict]) -> None:
+        team_id = int(team_id)
+        self.conn.execute('DELETE FROM rosters WHERE team_id = ?', (team_id,))
+        self.conn.execute('DELETE FROM player_positions WHERE team_id = ?', (team_id,))
+
+        roster_rows = []
+        position_rows = []
+        for slot, player in enumerate(players):
+            extra = {k: v for k, v in player.items() if k not in ROSTER_COLUMNS}
+            positions = player.get('positions', [])
+            roster_rows.append((
+                team_id, slot, player.get('player_id'), player['name'],
+                json.dumps(positions, ensure_ascii=False), player.get('status', ''),
+                player.get('team', ''), json.dumps(extra, ensure_ascii=False) if extra else None
+            ))
+            position_rows.extend((team_id, player.get('player_id'), pos) for pos in positions)
+
+        self.conn.executemany(
+            'INSERT INTO rosters (team_id, slot, player_id, name, positions, status, nba_team, extra) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            roster_rows
+        )
+        self.conn.executemany(
+            'INSERT INTO player_positions (team_id, player_id, position) VALUES (?, ?, ?)',
+            position_rows
+        )
+
+    def _write_week_matchups(self, week: int, matchups: List[Dict]) -> None:
+        self.conn.execute('DELETE FROM matchups WHERE week = ?', (int(week),))
+        self.conn.executemany(
+            'INSERT INTO matchups (week, slot, team1_id, team1_name, team2_id, team2_name) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (int(week), i, m['team1_id'], m['team1_name'], m['team2_id'], m['team2_name'])
+                for i, m in enumerate(matchups)
+            ]
+        )
+
+    # ------------------------------------------------------------------
+    # 查詢
+    # ------------------------------------------------------------------
+
+    def get_meta(self) -> Dict:
+        """
+        聯盟資訊
+
+        Returns:
+            {'league_name', 'league_id', 'num_teams', 'current_week', 'total_weeks', 'season', ...}
+        """
+        rows = self.conn.execute('SELECT key, value FROM league_meta').fetchall()
+        return {row['key']: json.loads(row['value']) for row in rows}
+
+    def is_empty(self) -> bool:
+        """資料庫是否還沒有任何聯盟數據"""
+        return self.conn.execute(
+            'SELECT 1 FROM league_meta WHERE key != ? LIMIT 1', (JSON_SOURCE_KEY,)
+        ).fetchone() is None
+
+    def get_teams(self) -> List[Dict]:
+        """所有隊伍（依 standings 順序）"""
+        rows = self.conn.execute(
+            'SELECT rank, team_id, team_name, manager, wins, losses, ties FROM teams ORDER BY sort_order'
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_team(self, team_id: Any) -> Optional[Dict]:
+        """單一隊伍，找不到時回傳 None"""
+        row = self.conn.execute(
+            'SELECT rank, team_id, team_name, manager, wins, losses, ties FROM teams WHERE team_id = ?',
+            (int(team_id),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def count_teams(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM teams').fetchone()[0]
+
+    @staticmethod
+    def _player_from_row(row: sqlite3.Row) -> Dict:
+        player = {
+            'player_id': row['player_id'],
+            'name': row['name'],
+            'positions': json.loads(row['positions']),
+            'status': row['status'],
+            'team': row['nba_team']
+        }
+        if row['extra']:
+            player.update(json.loads(row['extra']))
+        return player
+
+    def get_roster(self, team_id: Any) -> List[Dict]:
+        """單一隊伍的陣容"""
+        rows = self.conn.execute(
+            'SELECT * FROM rosters WHERE team_id = ? ORDER BY slot', (int(team_id),)
+        ).fetchall()
+        return [self._player_from_row(row) for row in rows]
+
+    def get_rosters(self) -> Dict[str, List[Dict]]:
+        """所有隊伍的陣容，key 為字串 team_id（與 JSON 相同）"""
+        rosters: Dict[str, List[Dict]] = {str(team['team_id']): [] for team in self.get_teams()}
+        for row in self.conn.execute('SELECT * FROM rosters ORDER BY team_id, slot'):
+            rosters.setdefault(str(row['team_id']), []).append(self._player_from_row(row))
+        return rosters
+
+    def find_player(self, player_id: int) -> Optional[Dict]:
+        """
+        依 player_id 找球員
+
+        Returns:
+            球員資料（含 fantasy_team_id），找不到時回傳 None
+        """
+        row = self.conn.execute(
+            'SELECT * FROM rosters WHERE player_id = ? LIMIT 1', (int(player_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        player = self._player_from_row(row)
+        player['fantasy_team_id'] = row['team_id']
+        return player
+
+    def count_positions(self, team_id: Any = None) -> Dict[str, int]:
+        """
+        各位置的球員數（多位置球員每個位置各算一次）
+
+        Args:
+            team_id: 只計算某隊，None 為全聯盟
+        """
+        if team_id is None:
+            rows = self.conn.execute(
+                'SELECT position, COUNT(*) AS n FROM player_positions GROUP BY position'
+            )
+        else:
+            rows = self.conn.execute(
+                'SELECT position, COUNT(*) AS n FROM player_positions WHERE team_id = ? GROUP BY position',
+                (int(team_id),)
+            )
+        return {row['position']: row['n'] for row in rows}
+
+    def count_players(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM rosters').fetchone()[0]
+
+    def get_matchups(self, week: int) -> List[Dict]:
+        """單一週次的對戰"""
+        rows = self.conn.execute(
+            'SELECT team1_id, team1_name, team2_id, team2_name FROM matchups WHERE week = ? ORDER BY slot',
+            (int(week),)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_matchups_by_week(self) -> Dict[str, List[Dict]]:
+        """所有週次的對戰，key 為 'week_N'（沒有對戰的週次為空列表）"""
+        total_weeks = self.get_meta().get('total_weeks') or 0
+        by_week: Dict[str, List[Dict]] = {f'week_{w}': [] for w in range(1, int(total_weeks) + 1)}
+        for row in self.conn.execute(
+            'SELECT week, team1_id, team1_name, team2_id, team2_name FROM matchups ORDER BY week, slot'
+        ):
+            matchup = dict(row)
+            by_week.setdefault(f"week_{matchup.pop('week')}", []).append(matchup)
+        return by_week
+
+    def get_active_weeks(self) -> List[int]:
+        """有對戰的週次"""
+        rows = self.conn.execute('SELECT DISTINCT week FROM matchups ORDER BY week')
+        return [row['week'] for row in rows]
+
+    def get_team_schedule(self, team_id: Any) -> Dict[str, Dict]:
+        """
+        單一隊伍的賽程
+
+        Returns:
+            {週次字串: {'opponent_id', 'opponent_name'}}（與 JSON 相同）
+        """
+        rows = self.conn.execute(
+            'SELECT week, opponent_id, opponent_name FROM schedules WHERE team_id = ? ORDER BY week',
+            (int(team_id),)
+        )
+        return {
+            str(row['week']): {'opponent_id': row['opponent_id'], 'opponent_name': row['opponent_name']}
+            for row in rows
+        }
+
+    def get_team_schedules(self) -> Dict[str, Dict[str, Dict]]:
+        """所有隊伍的賽程，key 為字串 team_id"""
+        schedules: Dict[str, Dict[str, Dict]] = {str(team['team_id']): {} for team in self.get_teams()}
+        for row in self.conn.execute(
+            'SELECT team_id, week, opponent_id, opponent_name FROM schedules ORDER BY team_id, week'
+        ):
+            schedules.setdefault(str(row['team_id']), {})[str(row['week'])] = {
+                'opponent_id': row['opponent_id'],
+                'opponent_name': row['opponent_name']
+            }
+        return schedules
+
+    # ------------------------------------------------------------------
+    # JSON 相容
+    # ------------------------------------------------------------------
+
+    def to_league_data(self) -> Optional[Dict]:
+        """
+        組回 full_league_data.json 格式
+
+        Returns:
+            聯盟數據，資料庫為空時回傳 None
+        """
+        if self.is_empty():
+            return None
+
+        meta = self.get_meta()
+        league_data = {key: meta.get(key) for key in META_KEYS[:6]}
+        league_data.update({
+            'teams': self.get_teams(),
+            'matchups_by_week': self.get_matchups_by_week(),
+            'team_schedules': self.get_team_schedules(),
+            'rosters': self.get_rosters()
+        })
+        if 'freshness' in meta:
+            league_data['freshness'] = meta['freshness']
+        league_data['last_updated'] = meta.get('last_updated')
+        return league_data
+
+    def content_hash(self) -> Optional[str]:
+        """
+        聯盟數據內容的 hash（不含 last_updated / freshness），
+        重新抓取但內容沒變時 hash 相同，供同步流程判斷是否需要重跑
+
+        Returns:
+            sha256，資料庫為空時回傳 None
+        """
+        league_data = self.to_league_data()
+        if league_data is None:
+            return None
+        payload = json.dumps(normalize(league_data), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def export_json(self, json_path: str = DEFAULT_JSON_PATH) -> Path:
+        """匯出 full_league_data.json（含查詢索引，供 server.js 與網頁使用，原子寫入並更新 manifest）"""
+        json_path = Path(json_path)
+        write_json_artifact(json_path, with_indexes(self.to_league_data()))
+        self._record_json_source(json_path)
+        return json_path
+
+    def _record_json_source(self, json_path: Path) -> None:
+        """記錄 JSON 目前的 mtime 與大小（內容已與資料庫一致）"""
+        with self.conn:
+            self._write_meta({JSON_SOURCE_KEY: _file_stamp(json_path)})
+
+    def import_json(self, json_path: str = DEFAULT_JSON_PATH, only_if_newer: bool = False) -> bool:
+        """
+        匯入 full_league_data.json
+
+        Args:
+            json_path: JSON 路徑
+            only_if_newer: 只有在 JSON 的 last_updated 比資料庫新時才匯入；
+                檔案自上次匯入 / 匯出後沒有變動時直接略過，不解析
+
+        Returns:
+            是否有匯入
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return False
+
+        if only_if_newer and not self.is_empty():
+            if self.get_meta().get(JSON_SOURCE_KEY) == _file_stamp(json_path):
+                return False
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            league_data = json.load(f)
+
+        imported = True
+        if only_if_newer and not self.is_empty():
+            stored = self.get_meta().get('last_updated') or ''
+            imported = (league_data.get('last_updated') or '') > stored
+
+        if imported:
+            self.save_league_data(league_data)
+        self._record_json_source(json_path)
+        return imported
+
+
+def _file_stamp(path: Path) -> str:
+    """檔案的 mtime（奈秒）與大小，用來判斷檔案是否有變動"""
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
@@ -0,0 +1,348 @@
+"""
+聯盟數據歷史版本
+
+每次同步內容有變化時存成一個版本（append-only），只記錄與上一版的差異：
+陣容的簽入 / 釋出 / 狀態變化、戰績排名變化、對戰與賽程變化。
+每 CHECKPOINT_INTERVAL 個版本存一次完整狀態，重建任一時間點時
+只需從最近的完整狀態往後套用少量差異。
+
+與 LeagueStore 共用 data/league.db。
+"""
+
+import json
+import sqlite3
+import zlib
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    taken_at TEXT NOT NULL,
+    week INTEGER,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_taken_at ON snapshots (taken_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_week ON snapshots (week);
+"""
+
+# 記錄在歷史中的聯盟欄位（last_updated 即版本時間，freshness 每次都變，不記錄）
+HISTORY_META_KEYS = ('league_name', 'league_id', 'num_teams', 'current_week', 'total_weeks', 'season')
+
+# 依 key 比對的區塊
+KEYED_SECTIONS = ('meta', 'teams', 'matchups', 'schedules')
+
+CHECKPOINT = 'checkpoint'
+DELTA = 'delta'
+
+
+def _player_key(player: Dict) -> str:
+    """球員識別（沒有 player_id 的舊資料用名稱）"""
+    if player.get('player_id') is not None:
+        return str(player['player_id'])
+    return f"name:{player['name']}"
+
+
+def normalize(league_data: Dict) -> Dict:
+    """
+    把 full_league_data.json 格式轉成以 key 索引的狀態
+
+    Returns:
+        {'meta', 'teams', 'team_order', 'matchups', 'schedules', 'rosters'}
+    """
+    # 經過一次 JSON 轉換，讓 int / str key 與檔案中的格式一致
+    data = json.loads(json.dumps(league_data, ensure_ascii=False))
+
+    rosters = {}
+    for team_id, players in data.get('rosters', {}).items():
+        rosters[str(team_id)] = {
+            'players': {_player_key(p): p for p in players},
+            'order': [_player_key(p) for p in players]
+        }
+
+    return {
+        'meta': {key: data[key] for key in HISTORY_META_KEYS if key in data},
+        'teams': {str(team['team_id']): team for team in data.get('teams', [])},
+        'team_order': [str(team['team_id']) for team in data.get('teams', [])],
+        'matchups': data.get('matchups_by_week', {}),
+        'schedules': data.get('team_schedules', {}),
+        'rosters': rosters
+    }
+
+
+def denormalize(state: Dict, taken_at: Optional[str] = None) -> Dict:
+    """把狀態組回 full_league_data.json 格式"""
+    league_data = dict(state['meta'])
+    league_data.update({
+        'teams': [state['teams'][team_id] for team_id in state['team_order'] if team_id in state['teams']],
+        'matchups_by_week': state['matchups'],
+        'team_schedules': state['schedules'],
+        'rosters': {
+            team_id: [roster['players'][key] for key in roster['order']]
+            for team_id, roster in state['rosters'].items()
+        },
+        'last_updated': taken_at
+    })
+    return league_data
+
+
+def diff_states(old: Dict, new: Dict) -> Dict:
+    """
+    計算兩個狀態的差異
+
+    Returns:
+        只包含有變化的區塊：
+        {'meta' / 'teams' / 'matchups' / 'schedules': {'set': {...}, 'removed': [...]},
+         'team_order': [...],
+         'rosters': {team_id: {'added': {...}, 'dropped': [...], 'updated': {...}, 'order': [...]}},
+         'rosters_removed': [...]}
+    """
+    delta: Dict[str, Any] = {}
+
+    for section in KEYED_SECTIONS:
+        old_items, new_items = old.get(section, {}), new.get(section, {})
+        changes = {}
+        changed = {k: v for k, v in new_items.items() if k not in old_items or old_items[k] != v}
+        removed = [k for k in old_items if k not in new_items]
+        if changed:
+            changes['set'] = changed
+        if removed:
+            changes['removed'] = removed
+        if changes:
+            delta[section] = changes
+
+    if old.get('team_order') != new.get('team_order'):
+        delta['team_order'] = new.get('team_order', [])
+
+    old_rosters, new_rosters = old.get('rosters', {}), new.get('rosters', {})
+    roster_changes = {}
+    for team_id, roster in new_rosters.items():
+        old_players = old_rosters.get(team_id, {'players': {}, 'order': []})['players']
+        old_order = old_rosters.get(team_id, {'players': {}, 'order': []})['order']
+        players = roster['players']
+
+        team_delta = {}
+        added = {k: p for k, p in players.items() if k not in old_players}
+        dropped = [k for k in old_players if k not in players]
+        updated = {k: p for k, p in players.items() if k in old_players and old_players[k] != p}
+        if added:
+            team_delta['added'] = added
+        if dropped:
+            team_delta['dropped'] = dropped
+        if updated:
+            team_delta['updated'] = updated
+        if roster['order'] != old_order:
+            team_delta['order'] = roster['order']
+        if team_delta:
+            roster_changes[team_id] = team_delta
+
+    if roster_changes:
+        delta['rosters'] = roster_changes
+    rosters_removed = [team_id for team_id in old_rosters if team_id not in new_rosters]
+    if rosters_removed:
+        delta['rosters_removed'] = rosters_removed
+
+    return delta
+
+
+def apply_delta(state: Dict, delta: Dict) -> Dict:
+    """把差異套用到狀態上（原地修改並回傳）"""
+    for section in KEYED_SECTIONS:
+        changes = delta.get(section)
+        if not changes:
+            continue
+        items = state.setdefault(section, {})
+        items.update(changes.get('set', {}))
+        for key in changes.get('removed', []):
+            items.pop(key, None)
+
+    if 'team_order' in delta:
+        state['team_order'] = delta['team_order']
+
+    rosters = state.setdefault('rosters', {})
+    for team_id, team_delta in delta.get('rosters', {}).items():
+        roster = rosters.setdefault(team_id, {'players': {}, 'order': []})
+        for key in team_delta.get('dropped', []):
+            roster['players'].pop(key, None)
+        roster['players'].update(team_delta.get('added', {}))
+        roster['players'].update(team_delta.get('updated', {}))
+        if 'order' in team_delta:
+            roster['order'] = team_delta['order']
+        else:
+            roster['order'] = [k for k in roster['order'] if k in roster['players']]
+    for team_id in delta.get('rosters_removed', []):
+        rosters.pop(team_id, None)
+
+    return state
+
+
+def _pack(obj: Dict) -> bytes:
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack(payload: bytes) -> Dict:
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+class SnapshotHistory:
+    """聯盟數據歷史版本"""
+
+    # 每幾個版本存一次完整狀態
+    CHECKPOINT_INTERVAL = 20
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Args:
+            conn: LeagueStore 的資料庫連線
+        """
+        self.conn = conn
+        self.conn.executescript(SCHEMA)
+        self._latest: Optional[Dict] = None  # (version, state) 快取
+
+    def record(self, league_data: Dict) -> Optional[int]:
+        """
+        以交易新增一個版本
+
+        Returns:
+            新版本號；與最新版本時間相同（重複同步）或內容沒有變化時回傳 None
+        """
+        with self.conn:
+            return self._append(league_data)
+
+    def _append(self, league_data: Dict) -> Optional[int]:
+        """新增一個版本（不自行提交，由呼叫端的交易包住）"""
+        taken_at = league_data.get('last_updated') or ''
+        latest = self.conn.execute(
+            'SELECT version, taken_at FROM snapshots ORDER BY version DESC LIMIT 1'
+        ).fetchone()
+        if latest is not None and latest[1] == taken_at:
+            return None
+
+        state = normalize(league_data)
+        delta = None
+        if latest is not None:
+            delta = diff_states(self.state_at_version(latest[0], as_state=True), state)
+            if not delta:
+                return None  # 只有 last_updated / freshness 變了
+
+        since_checkpoint = self._versions_since_checkpoint()
+        if latest is None or since_checkpoint >= self.CHECKPOINT_INTERVAL - 1:
+            kind, payload = CHECKPOINT, state
+        else:
+            kind, payload = DELTA, delta
+
+        cursor = self.conn.execute(
+            'INSERT INTO snapshots (taken_at, week, kind, payload) VALUES (?, ?, ?, ?)',
+            (taken_at, state['meta'].get('current_week'), kind, _pack(payload))
+        )
+        self._latest = {'version': cursor.lastrowid, 'state': state}
+        return cursor.lastrowid
+
+    def _versions_since_checkpoint(self) -> int:
+        row = self.conn.execute(
+            'SELECT COUNT(*) FROM snapshots WHERE version > '
+            '(SELECT COALESCE(MAX(version), 0) FROM snapshots WHERE kind = ?)',
+            (CHECKPOINT,)
+        ).fetchone()
+        return row[0]
+
+    def versions(self, week: Optional[int] = None) -> List[Dict]:
+        """
+        列出版本
+
+        Args:
+            week: 只列出某週次的版本
+
+        Returns:
+            [{'version', 'taken_at', 'week', 'kind', 'size'}]
+        """
+        query = 'SELECT version, taken_at, week, kind, LENGTH(payload) AS size FROM snapshots'
+        params: tuple = ()
+        if week is not None:
+            query += ' WHERE week = ?'
+            params = (int(week),)
+        rows = self.conn.execute(query + ' ORDER BY version', params).fetchall()
+        return [
+            {'version': r[0], 'taken_at': r[1], 'week': r[2], 'kind': r[3], 'size': r[4]}
+            for r in rows
+        ]
+
+    def version_at(self, timestamp: str) -> Optional[int]:
+        """某時間點（'%Y-%m-%d %H:%M:%S'）當下的最新版本"""
+        row = self.conn.execute(
+            'SELECT MAX(version) FROM snapshots WHERE taken_at <= ?', (timestamp,)
+        ).fetchone()
+        return row[0]
+
+    def state_at_version(self, version: int, as_state: bool = False) -> Dict:
+        """
+        重建某版本的聯盟數據
+
+        Args:
+            version: 版本號
+            as_state: 回傳內部狀態格式而非 full_league_data.json 格式
+
+        Raises:
+            KeyError: 版本不存在
+        """
+        if self._latest is not None and self._latest['version'] == version:
+            state = json.loads(json.dumps(self._latest['state']))
+            taken_at = self._taken_at(version)
+        else:
+            rows = self.conn.execute(
+                'SELECT version, taken_at, kind, payload FROM snapshots '
+                'WHERE version <= ? AND version >= '
+                '(SELECT MAX(version) FROM snapshots WHERE kind = ? AND version <= ?) '
+                'ORDER BY version',
+                (version, CHECKPOINT, version)
+            ).fetchall()
+            if not rows or rows[-1][0] != version:
+                raise KeyError(f"找不到版本: {version}")
+
+            state = _unpack(rows[0][3])
+            for _, _, _, payload in rows[1:]:
+                apply_delta(state, _unpack(payload))
+            taken_at = rows[-1][1]
+
+        return state if as_state else denormalize(state, taken_at)
+
+    def _taken_at(self, version: int) -> Optional[str]:
+        row = self.conn.execute('SELECT taken_at FROM snapshots WHERE version = ?', (version,)).fetchone()
+        return row[0] if row else None
+
+    def state_as_of(self, timestamp: str) -> Optional[Dict]:
+        """
+        重建某時間點的聯盟數據
+
+        Returns:
+            full_league_data.json 格式，該時間點之前沒有版本時回傳 None
+        """
+        version = self.version_at(timestamp)
+        return self.state_at_version(version) if version is not None else None
+
+    def diff(self, from_version: int, to_version: int) -> Dict:
+        """兩個版本之間的差異（格式同 diff_states）"""
+        return diff_states(
+            self.state_at_version(from_version, as_state=True),
+            self.state_at_version(to_version, as_state=True)
+        )
+
+    def roster_moves(self, from_version: int, to_version: int) -> List[Dict]:
+        """
+        兩個版本之間的簽入 / 釋出
+
+        Returns:
+            [{'team_id', 'action': 'add' / 'drop', 'player_key', 'name'}]
+        """
+        old = self.state_at_version(from_version, as_state=True)
+        delta = diff_states(old, self.state_at_version(to_version, as_state=True))
+
+        moves = []
+        for team_id, team_delta in delta.get('rosters', {}).items():
+            for key, player in team_delta.get('added', {}).items():
+                moves.append({'team_id': team_id, 'action': 'add', 'player_key': key, 'name': player['name']})
+            old_players = old['rosters'].get(team_id, {}).get('players', {})
+            for key in team_delta.get('dropped', []):
+                name = old_players.get(key, {}).get('name')
+                moves.append({'team_id': team_id, 'action': 'drop', 'player_key': key, 'name': name})
+        return moves
@@ -0,0 +1,259 @@
+"""
+球員統計歷史（Arrow IPC 欄式資料集）
+
+每次抓取的球員統計寫成一個 Arrow IPC 檔，依賽季 / 週次分區：
+
+    data/exports/player_stats/season=2025/week=05/week.arrow
+    data/exports/player_stats/season=2025/week=05/date=2025-11-20.arrow
+
+同一期間（週或日）重新抓取時依 player_id 合併：這次有抓到的球員取代舊列，
+這次沒抓到的（例如該隊陣容退回快取）保留原本的列，不會重複計算也不會遺失。讀取時以
+memory-map 開啟，不解壓、不複製，整季的球員歷史可直接交給
+CategoryScorer 做整欄運算，不必先載入 JSON 再建立 Python 物件。
+"""
+
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..models.stats import GAMES_PLAYED_UNKNOWN, PlayerStatsColumns
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_DATASET_DIR = 'data/exports/player_stats'
+
+# 加總後需重新計算命中率的計數欄位
+SUM_COLUMNS = (
+    'games_played', 'fgm', 'fga', 'ftm', 'fta', 'three_pm',
+    'pts', 'reb', 'ast', 'st', 'blk', 'to', 'dd'
+)
+
+_PARTITION_RE = re.compile(r'^(\w+)=(.+)$')
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow 未安裝，無法使用球員統計歷史\n執行: pip install pyarrow")
+
+
+def _schema() -> 'pa.Schema':
+    """資料集欄位（PlayerStatsColumns 欄位 + 分區與來源資訊）"""
+    int_columns = set(SUM_COLUMNS)
+    float_columns = {'fg_pct', 'ft_pct'}
+
+    stat_fields = []
+    for name in PlayerStatsColumns.column_names():
+        if name in int_columns:
+            stat_fields.append(pa.field(name, pa.int32()))
+        elif name in float_columns:
+            stat_fields.append(pa.field(name, pa.float64()))
+        else:
+            stat_fields.append(pa.field(name, pa.string()))
+
+    return pa.schema(stat_fields + [
+        pa.field('fantasy_team_id', pa.string()),
+        pa.field('season', pa.string()),
+        pa.field('week', pa.int16()),
+        pa.field('date', pa.string()),
+        pa.field('ingested_at', pa.string())
+    ])
+
+
+class PlayerStatsDataset:
+    """球員統計歷史資料集"""
+
+    def __init__(self, root: str = DEFAULT_DATASET_DIR):
+        """
+        Args:
+            root: 資料集根目錄
+        """
+        _require_pyarrow()
+        self.root = Path(root)
+        self.schema = _schema()
+
+    def _partition_dir(self, season: str, week: int) -> Path:
+        return self.root / f"season={season}" / f"week={int(week):02d}"
+
+    def write(
+        self,
+        columns: PlayerStatsColumns,
+        season: str,
+        week: int,
+        date: Optional[str] = None,
+        fantasy_team_ids: Optional[List[Optional[str]]] = None
+    ) -> Optional[Path]:
+        """
+        寫入一期的球員統計（同一期間已有資料時依 player_id 合併）
+
+        Args:
+            columns: 欄式球員統計
+            season: 賽季
+            week: 週次
+            date: 日期（'%Y-%m-%d'），None 表示整週統計
+            fantasy_team_ids: 每名球員所屬的聯盟隊伍 ID（與 columns 同長度）
+
+        Returns:
+            寫入的檔案路徑，沒有資料時回傳 None
+        """
+        n = len(columns)
+        if n == 0:
+            return None
+
+        arrays = {name: values for name, values in columns.column_lists()}
+        arrays['player_id'] = [str(v) for v in arrays['player_id']]
+        arrays['fantasy_team_id'] = (
+            [str(v) if v is not None else None for v in fantasy_team_ids]
+            if fantasy_team_ids is not None else [None] * n
+        )
+        arrays['season'] = [str(season)] * n
+        arrays['week'] = [int(week)] * n
+        arrays['date'] = [date] * n
+        arrays['ingested_at'] = [datetime.now().strftime('%Y-%m-%d %H:%M:%S')] * n
+
+        table = pa.table(
+            [pa.array(arrays[field.name], type=field.type) for field in self.schema],
+            schema=self.schema
+        )
+
+        partition = self._partition_dir(season, week)
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / (f"date={date}.arrow" if date else "week.arrow")
+        table = self._merge_existing(path, table)
+
+        # 寫入暫存檔再替換，讀取端不會看到寫到一半的檔案
+        tmp_path = path.with_suffix('.arrow.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with ipc.new_file(sink, self.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return path
+
+    def _merge_existing(self, path: Path, table: 'pa.Table') -> 'pa.Table':
+        """保留既有分區檔中這次沒有出現的球員列"""
+        if not path.exists():
+            return table
+
+        import pyarrow.compute as pc
+
+        with pa.memory_map(str(path), 'r') as source:
+            existing = ipc.open_file(source).read_all()
+        if existing.schema != self.schema:
+            return table  # 舊版欄位，直接以新資料取代
+
+        replaced = pc.is_in(existing.column('player_id'), value_set=table.column('player_id'))
+        kept = existing.filter(pc.invert(replaced))
+        if kept.num_rows == 0:
+            return table
+        return pa.concat_tables([kept, table]).combine_chunks()
+
+    def files(self, season: Optional[str] = None, weeks: Optional[Iterable[int]] = None) -> List[Path]:
+        """
+        列出符合條件的分區檔案（依分區目錄名稱篩選，不開啟檔案）
+
+        Args:
+            season: 賽季，None 為全部
+            weeks: 週次，None 為全部
+        """
+        if not self.root.exists():
+            return []
+
+        week_set = {int(w) for w in weeks} if weeks is not None else None
+        result = []
+        for path in sorted(self.root.glob('season=*/week=*/*.arrow')):
+            parts = dict(
+                _PARTITION_RE.match(p).groups()
+                for p in (path.parent.parent.name, path.parent.name)
+            )
+            if season is not None and parts['season'] != str(season):
+                continue
+            if week_set is not None and int(parts['week']) not in week_set:
+                continue
+            result.append(path)
+        return result
+
+    def scan(
+        self,
+        season: Optional[str] = None,
+        weeks: Optional[Iterable[int]] = None,
+        columns: Optional[List[str]] = None
+    ) -> 'pa.Table':
+        """
+        以 memory-map 讀取符合條件的資料
+
+        Args:
+            season: 賽季，None 為全部
+            weeks: 週次，None 為全部
+            columns: 只取部分欄位
+
+        Returns:
+            pyarrow Table（資料仍指向 mmap 的檔案內容）
+        """
+        tables = []
+        for path in self.files(season, weeks):
+            source = pa.memory_map(str(path), 'r')
+            table = ipc.open_file(source).read_all()
+            tables.append(table.select(columns) if columns else table)
+
+        if not tables:
+            schema = self.schema
+            if columns:
+                schema = pa.schema([schema.field(name) for name in columns])
+            return schema.empty_table()
+        return pa.concat_tables(tables)
+
+    def player_totals(self, season: Optional[str] = None, weeks: Optional[Iterable[int]] = None) -> 'pa.Table':
+        """
+        每名球員在期間內的累計統計（重新計算命中率）
+
+        Returns:
+            pyarrow Table，每名球員一列
+        """
+        table = self.scan(season, weeks)
+        if table.num_rows == 0:
+            return table
+
+        import pyarrow.compute as pc
+
+        # 出賽數未知 (GAMES_PLAYED_UNKNOWN) 不能直接相加：只加總已知的場次，
+        # 任一期未知時整體也標為未知
+        games = table.column('games_played')
+        table = table.append_column('games_known', pc.max_element_wise(games, 0))
+
+        totals = table.group_by('player_id').aggregate(
+            [(name, 'sum') for name in SUM_COLUMNS if name != 'games_played']
+            + [('games_known', 'sum'), ('games_played', 'min')]
+            + [('player_name', 'max'), ('team', 'max'), ('position', 'max')]
+        )
+        totals = totals.rename_columns([
+            name.rsplit('_', 1)[0] if name.endswith(('_sum', '_max', '_min')) else name
+            for name in totals.column_names
+        ])
+        games_played = pc.if_else(
+            pc.less(totals.column('games_played'), 0),
+            pa.scalar(GAMES_PLAYED_UNKNOWN, pa.int64()),
+            totals.column('games_known')
+        )
+        totals = totals.drop_columns(['games_known'])
+        totals = totals.set_column(totals.schema.get_field_index('games_played'), 'games_played', games_played)
+
+        def pct(made: str, attempted: str) -> 'pa.Array':
+            attempts = totals.column(attempted)
+            ratio = pc.divide(pc.cast(totals.column(made), pa.float64()), pc.cast(attempts, pa.float64()))
+            return pc.if_else(pc.greater(attempts, 0), ratio, 0.0)
+
+        return totals.append_column('fg_pct', pct('fgm', 'fga')).append_column('ft_pct', pct('ftm', 'fta'))
+
+    def partitions(self) -> List[Dict]:
+        """列出所有分區與檔案數"""
+        summary: Dict[tuple, int] = {}
+        for path in self.files():
+            key = (path.parent.parent.name.split('=', 1)[1], int(path.parent.name.split('=', 1)[1]))
+            summary[key] = summary.get(key, 0) + 1
+        return [{'season': s, 'week': w, 'files': n} for (s, w), n in sorted(summary.items())]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+常駐同步排程（取代 crontab + auto_sync.sh）
+
+    python3 sync_daemon.py                     # 啟動常駐排程
+    python3 sync_daemon.py --once rosters      # 只執行一次指定工作後結束
+    python3 sync_daemon.py --config path.json  # 使用其他設定檔
+
+頻率設定: config/daemon_config.json
+狀態: data/cache/daemon_status.json（各工作結果、斷路器、評分基準 baselines）
+"""
+
+import argparse
+import os
+import signal
+import sys
+
+# 以腳本所在目錄為工作目錄（不依賴固定路徑）
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from run_all_sync import build_stages
+from src.automation.daemon import DEFAULT_CONFIG_FILE, SUCCESS, SyncDaemon, load_config
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='常駐同步排程')
+    parser.add_argument('--config', default=DEFAULT_CONFIG_FILE, help='排程設定檔')
+    parser.add_argument('--once', choices=SyncDaemon.JOBS, help='只執行一次指定工作後結束')
+    parser.add_argument('--no-pipeline', action='store_true', help='抓取後不執行下游流程')
+    parser.add_argument('--no-initial-run', action='store_true', help='啟動時不先執行陣容與賽程更新')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.no_pipeline:
+        config['pipeline']['enabled'] = False
+
+    daemon = SyncDaemon(config, analysis_stages=build_stages(include_fetch=False))
+
+    print("=" * 80)
+    print(" 蛇星刁手 Fantasy Basketball - 常駐同步排程")
+    print("=" * 80)
+    print()
+
+    if args.once:
+        return 0 if daemon.run_job(args.once) == SUCCESS else 1
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    daemon.start(run_now=not args.no_initial_run)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
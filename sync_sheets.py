@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+同步所有 Google Sheets（一次認證、一次載入數據，各 Spreadsheet 同時送出）
+
+    python3 sync_sheets.py                                  # 同步 config/sheets_engine.json 的全部工作表
+    python3 sync_sheets.py --only league_shared,my_team     # 只同步指定群組
+    python3 sync_sheets.py --workers 1                      # 逐一送出
+
+工作表群組: league_shared, league_insights, advanced_trade_value, my_team,
+            roster_summary, league_overview（定義於 src/integrations/sheets_views.py）
+"""
+
+import argparse
+import sys
+
+from src.integrations.sheets_engine import DEFAULT_ENGINE_CONFIG, run_sync
+from src.integrations.sheets_views import VIEW_GROUPS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='同步所有 Google Sheets')
+    parser.add_argument('--only', help=f"逗號分隔的工作表群組（{', '.join(VIEW_GROUPS)}）")
+    parser.add_argument('--workers', type=int, default=None, help='同時送出的 Spreadsheet 數')
+    parser.add_argument('--config', default=DEFAULT_ENGINE_CONFIG, help='引擎設定檔')
+    args = parser.parse_args()
+
+    groups = None
+    if args.only:
+        groups = [group.strip() for group in args.only.split(',') if group.strip()]
+        unknown = [group for group in groups if group not in VIEW_GROUPS]
+        if unknown:
+            parser.error(f"未知的工作表群組: {', '.join(unknown)}")
+
+    return run_sync(groups, banner='Google Sheets 同步', config_path=args.config, max_workers=args.workers)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+欄式排名端對端測試：Yahoo 回應 -> 轉換器 -> (Arrow 資料集) -> CategoryScorer.rank_columnar
+
+執行: python -m pytest -q tests
+"""
+
+import pytest
+
+from src.analysis.category_scorer import CategoryScorer
+from src.api.yahoo_adapter import _build_benchmark_payload, parse_players_payload
+from src.models.stats import GAMES_PLAYED_UNKNOWN
+
+
+def _payload_with_varied_stats(n: int):
+    """基準回應的每位球員統計都相同，改成各不相同才有實際排名"""
+    payload = _build_benchmark_payload(n)
+    players = payload['fantasy_content']['team'][1]['roster']['0']['players']
+    for i in range(n):
+        stats = players[str(i)]['player'][2]['player_stats']['stats']
+        for entry in stats:
+            stat = entry['stat']
+            if stat['stat_id'] == '12':
+                stat['value'] = str(80 + i * 10)
+            elif stat['stat_id'] == '15':
+                stat['value'] = str(50 - i * 2)
+    return payload
+
+
+def test_adapter_marks_games_played_unknown_without_stat_0():
+    _, columns = parse_players_payload(_build_benchmark_payload(3))
+
+    assert columns.games_played == [GAMES_PLAYED_UNKNOWN] * 3
+    assert all(stats.has_played() for stats in columns.to_player_stats())
+
+
+def test_rank_columnar_on_adapter_output():
+    _, columns = parse_players_payload(_payload_with_varied_stats(10))
+
+    rankings = CategoryScorer().rank_columnar(columns)
+
+    assert len(rankings) == 10
+    assert [player['rank'] for player in rankings] == list(range(1, 11))
+    # 逐筆路徑與欄式路徑的結果一致
+    row_rankings = CategoryScorer().rank_players(columns.to_player_stats())
+    assert [p['player_name'] for p in rankings] == [p['player_name'] for p in row_rankings]
+    assert [p['total_value'] for p in rankings] == pytest.approx([p['total_value'] for p in row_rankings])
+
+
+def test_rank_columnar_on_dataset_totals(tmp_path):
+    pytest.importorskip('pyarrow')
+    from src.storage.stats_dataset import PlayerStatsDataset
+
+    _, columns = parse_players_payload(_payload_with_varied_stats(10))
+    dataset = PlayerStatsDataset(str(tmp_path))
+    dataset.write(columns, season='2025', week=1)
+    dataset.write(columns, season='2025', week=2)
+
+    totals = dataset.player_totals(season='2025')
+    assert totals.column('games_played').to_pylist() == [GAMES_PLAYED_UNKNOWN] * 10
+
+    rankings = CategoryScorer().rank_columnar(totals, top=5)
+    assert len(rankings) == 5
+    assert rankings[0]['player_name'] == 'Player 9'
+
+
+def test_dataset_write_merges_by_player_id(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    from src.storage.stats_dataset import PlayerStatsDataset
+
+    _, columns = parse_players_payload(_payload_with_varied_stats(4))
+    dataset = PlayerStatsDataset(str(tmp_path))
+    dataset.write(columns, season='2025', week=3, fantasy_team_ids=['1', '1', '2', '2'])
+
+    # 第二次只抓到隊伍 1（隊伍 2 退回快取），隊伍 2 的列必須保留
+    partial = type(columns)()
+    for i in range(2):
+        row = columns.row(i).__dict__.copy()
+        row['pts'] += 1
+        partial.append(row)
+    path = dataset.write(partial, season='2025', week=3, fantasy_team_ids=['1', '1'])
+
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    rows = {row['player_id']: row for row in table.to_pylist()}
+    assert sorted(rows) == ['1000', '1001', '1002', '1003']
+    assert rows['1000']['pts'] == columns.pts[0] + 1
+    assert rows['1002']['pts'] == columns.pts[2]
+    assert rows['1002']['fantasy_team_id'] == '2'
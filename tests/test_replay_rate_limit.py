@@ -0,0 +1,68 @@
+"""
+重播錯誤注入與排程器：注入的 HTTP 錯誤要帶狀態碼，999 / 429 才會走限流退避
+
+執行: python -m pytest -q tests
+"""
+
+import pytest
+
+from src.api.replay import FixtureStore, InjectedError, ReplayTransport
+from src.api.request_scheduler import Lane, RateLimitError, RequestScheduler, is_rate_limit_error
+
+URL = 'https://fantasysports.yahooapis.com/fantasy/v2/league/454.l.99912/teams'
+
+
+def _transport(tmp_path, **kwargs) -> ReplayTransport:
+    store = FixtureStore(tmp_path)
+    store.save(URL, 200, '{"fantasy_content": {}}')
+    return ReplayTransport(store, seed=1, **kwargs)
+
+
+def _scheduler() -> RequestScheduler:
+    scheduler = RequestScheduler()
+    scheduler.RATE_LIMIT_PENALTY_SECONDS = 0.01
+    return scheduler
+
+
+@pytest.mark.parametrize('status', [999, 429])
+def test_injected_rate_limit_is_throttled_and_retried(tmp_path, status):
+    transport = _transport(tmp_path, error_rate=1.0, error_status=status)
+    scheduler = _scheduler()
+
+    with pytest.raises(RateLimitError):
+        scheduler.submit(transport, URL, lane=Lane.LIVE)
+
+    attempts = scheduler.MAX_RATE_LIMIT_RETRIES + 1
+    assert transport.stats()['injected_errors'] == attempts
+    assert scheduler.metrics.lanes['live'].rate_limited == attempts
+    assert scheduler.bucket._state['blocked_until'] > 0
+
+
+def test_injected_rate_limit_recovers_after_retry(tmp_path):
+    transport = _transport(tmp_path, error_rate=1.0, error_status=999)
+    scheduler = _scheduler()
+
+    def first_call_throttled(url):
+        if transport.requests:
+            transport.error_rate = 0.0
+        return transport(url)
+
+    response = scheduler.submit(first_call_throttled, URL, lane=Lane.ROSTER)
+
+    assert response.json() == {'fantasy_content': {}}
+    assert transport.stats()['requests'] == 2
+    assert scheduler.metrics.lanes['roster'].rate_limited == 1
+    assert scheduler.metrics.lanes['roster'].errors == 0
+
+
+def test_injected_server_error_is_not_rate_limit(tmp_path):
+    transport = _transport(tmp_path, error_rate=1.0, error_status=503)
+    scheduler = _scheduler()
+
+    with pytest.raises(InjectedError) as excinfo:
+        scheduler.submit(transport, URL, lane=Lane.ROSTER)
+
+    assert excinfo.value.response.status_code == 503
+    assert not is_rate_limit_error(excinfo.value)
+    assert transport.stats()['requests'] == 1
+    assert scheduler.metrics.lanes['roster'].rate_limited == 0
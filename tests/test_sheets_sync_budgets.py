@@ -0,0 +1,65 @@
+"""
+Google Sheets 同步門檻：以 Sheets API 替身跑每個同步腳本的工作表群組
+
+檢查冷 / 熱同步請求數不超過 benchmark_sheets_sync.BUDGETS、熱同步不寫入任何儲存格，
+以及刪除影子副本重建時成員備註仍保留。
+
+執行: python -m pytest -q tests
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmark_sheets_sync import (
+    BUDGETS,
+    SCENARIOS,
+    TEST_NOTE,
+    build_engine,
+    leave_notes,
+    measure_sync,
+    run_scenario,
+    verify,
+)
+from src.integrations.fake_sheets import FakeSheetsService
+
+CONFIG = str(Path(__file__).resolve().parents[1] / 'config' / 'sheets_engine.json')
+
+
+@pytest.mark.parametrize('script', list(SCENARIOS))
+def test_sync_within_budget(tmp_path, script):
+    service = FakeSheetsService(seed=42)
+    engine = build_engine(service, tmp_path, CONFIG)
+
+    runs = run_scenario(engine, service, SCENARIOS[script], tmp_path)
+
+    budget = BUDGETS[script]
+    cold, warm = runs['cold'], runs['warm']
+    assert cold['errors'] == warm['errors'] == runs['rebuild']['errors'] == []
+    assert cold['cells'] > 0
+    assert cold['requests'] <= budget['cold_requests']
+    assert warm['requests'] <= budget['warm_requests']
+    assert warm['cells'] == 0
+    assert cold['seconds'] <= budget['seconds']
+    assert runs['mismatches'] == []
+
+
+def test_member_note_survives_rebuild_without_shadow(tmp_path):
+    groups = SCENARIOS['sync_my_team.py']
+    service = FakeSheetsService(seed=42)
+    engine = build_engine(service, tmp_path, CONFIG)
+
+    measure_sync(engine, service, groups)
+    notes = leave_notes(engine, service, groups)
+    assert notes
+    measure_sync(engine, service, groups)
+
+    shutil.rmtree(tmp_path / 'shadow')
+    rebuild = measure_sync(engine, service, groups)
+
+    # 沒有影子副本時整張工作表重寫，備註由讀回快取補回
+    assert rebuild['cells'] > 0
+    for (spreadsheet_id, title, row, col) in notes:
+        assert service.worksheet(spreadsheet_id, title).value(row, col) == TEST_NOTE
+    assert verify(engine, service, groups, notes) == []